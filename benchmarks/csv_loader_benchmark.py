@@ -0,0 +1,72 @@
+"""
+
+Benchmark: loading a TrajectoryTracker CSV file.
+
+Compares row-by-row parsing with the csv module (what analysis scripts typically do) with
+trajtracker.data.load_csv (one numpy pass over the whole file).
+
+Usage: python csv_loader_benchmark.py [n_rows]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time as tm
+
+import numpy as np
+
+from trajtracker.data import CsvTrajectoryWriter, load_csv
+
+
+#--------------------------------------------------------------------------
+def load_with_csv_module(filename):
+
+    trials = {}
+    with open(filename, 'rb') as fh:
+        reader = csv.DictReader(fh)
+        for row in reader:
+            trial = trials.setdefault(int(row['trial']), ([], [], []))
+            trial[0].append(float(row['x']))
+            trial[1].append(float(row['y']))
+            trial[2].append(float(row['time']))
+
+    return trials
+
+
+#--------------------------------------------------------------------------
+def run(n_rows, samples_per_trial=1000):
+
+    out_dir = tempfile.mkdtemp()
+    filename = os.path.join(out_dir, "session.csv")
+
+    try:
+        writer = CsvTrajectoryWriter(filename)
+        for trial_num in range(n_rows // samples_per_trial):
+            writer.write_trial(trial_num,
+                               np.random.randint(-500, 500, samples_per_trial),
+                               np.cumsum(np.random.rand(samples_per_trial)),
+                               np.arange(samples_per_trial) / 1000.0, x_is_int=True)
+        writer.close()
+
+        print("File size: {:.1f} MB".format(os.path.getsize(filename) / 1e6))
+
+        durations = {}
+        for name, func in (("csv module", load_with_csv_module), ("load_csv", load_csv)):
+            start = tm.time()
+            func(filename)
+            durations[name] = tm.time() - start
+            print("{:12s}: {:8.3f} sec".format(name, durations[name]))
+
+        print("Speedup: {:.1f}x".format(durations["csv module"] / durations["load_csv"]))
+
+    finally:
+        shutil.rmtree(out_dir)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
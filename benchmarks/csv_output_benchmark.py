@@ -0,0 +1,84 @@
+"""
+
+Benchmark: writing a TrajectoryTracker CSV file.
+
+Compares the per-row formatting loop used by earlier versions of TrajectoryTracker.save_to_file()
+(file re-opened per trial, one % operation per row) with CsvTrajectoryWriter (persistent file handle,
+one formatting operation per trial).
+
+Usage: python csv_output_benchmark.py [n_trials] [samples_per_trial]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time as tm
+
+import numpy as np
+
+from trajtracker.data import CsvTrajectoryWriter
+
+
+#--------------------------------------------------------------------------
+def write_with_row_loop(filename, trials, xy_precision=5, time_precision=3):
+
+    fh = open(filename, 'w')
+    fh.write('trial,time,x,y\n')
+    fh.close()
+
+    for trial_num, x, y, t in trials:
+        x = x.astype(int).tolist()
+        fh = open(filename, 'a')
+        for xv, yv, tv in zip(x, y.tolist(), t.tolist()):
+            xv = ('%d' % xv) if isinstance(xv, int) else '%.*f' % (xy_precision, xv)
+            yv = ('%d' % yv) if isinstance(yv, int) else '%.*f' % (xy_precision, yv)
+            fh.write("%d,%.*f,%s,%s\n" % (trial_num, time_precision, tv, xv, yv))
+        fh.close()
+
+
+#--------------------------------------------------------------------------
+def write_with_csv_writer(filename, trials, xy_precision=5, time_precision=3):
+
+    writer = CsvTrajectoryWriter(filename, xy_precision, time_precision)
+    for trial_num, x, y, t in trials:
+        writer.write_trial(trial_num, x, y, t, x_is_int=True)
+    writer.close()
+
+
+#--------------------------------------------------------------------------
+def run(n_trials, samples_per_trial):
+
+    trials = []
+    for trial_num in range(n_trials):
+        t = np.arange(samples_per_trial) / 1000.0
+        x = np.random.randint(-500, 500, samples_per_trial).astype(float)
+        y = np.cumsum(np.random.rand(samples_per_trial))
+        trials.append((trial_num, x, y, t))
+
+    n_rows = n_trials * samples_per_trial
+    out_dir = tempfile.mkdtemp()
+
+    try:
+        results = {}
+        for name, func in (("row loop", write_with_row_loop), ("CsvTrajectoryWriter", write_with_csv_writer)):
+            filename = os.path.join(out_dir, name.replace(" ", "_") + ".csv")
+            start = tm.time()
+            func(filename, trials)
+            duration = tm.time() - start
+            results[name] = filename
+            print("{:20s}: {:8.3f} sec, {:10.0f} rows/sec".format(name, duration, n_rows / duration))
+
+        with open(results["row loop"]) as f1, open(results["CsvTrajectoryWriter"]) as f2:
+            print("Identical output: {:}".format(f1.read() == f2.read()))
+
+    finally:
+        shutil.rmtree(out_dir)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,74 @@
+"""
+
+Benchmark: the cost (on the experiment's thread) of logging each tracked sample -
+as a formatted text line written synchronously to a file (like the expyriment event file),
+vs. as an EventLog record (buffered in memory and written to the file by a background thread)
+
+Usage: python event_log_benchmark.py [n_samples]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+from trajtracker.data import EventLog, event_log_to_csv
+
+
+#--------------------------------------------------------------------------
+def measure(log_sample, x, y, t):
+    timer = timeit.default_timer
+    durations = np.zeros(len(t))
+    for i in range(len(t)):
+        start = timer()
+        log_sample(x[i], y[i], t[i])
+        durations[i] = timer() - start
+    return durations
+
+
+def report(name, durations):
+    print("{:30}mean {:6.2f} us, 99th percentile {:6.2f} us, max {:8.1f} us".format(
+        name, durations.mean() * 1e6, np.percentile(durations, 99) * 1e6, durations.max() * 1e6))
+
+
+#--------------------------------------------------------------------------
+def run(n):
+
+    x = np.cumsum(np.random.randint(-1, 2, n)).tolist()
+    y = np.cumsum(np.random.randint(1, 4, n)).tolist()
+    t = (np.arange(n) / 1000.0).tolist()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tmp_dir, "events.txt")
+        with open(filename, 'w') as fh:
+            def log_text(xx, yy, tt):
+                fh.write("{0},Trajectory,Track_xyt,{1},{2},{3}\n".format(timeit.default_timer(), xx, yy, tt))
+                fh.flush()
+            report("Text line per sample:", measure(log_text, x, y, t))
+
+        log = EventLog(os.path.join(tmp_dir, "events.log"))
+        object_id = log.register_object(log)
+        def log_record(xx, yy, tt):
+            log.write(object_id, EventLog.ev_track_xyt, xx, yy, tt)
+        report("EventLog record per sample:", measure(log_record, x, y, t))
+        log.close()
+        print("EventLog: {:} records, {:} dropped, {:.1f} bytes/record".format(
+            log.n_records, log.n_dropped, os.path.getsize(log.filename) / float(log.n_records)))
+
+        start = timeit.default_timer()
+        event_log_to_csv(log.filename, os.path.join(tmp_dir, "events.csv"))
+        print("Decoding to CSV: {:.2f} us/record".format((timeit.default_timer() - start) / log.n_records * 1e6))
+
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
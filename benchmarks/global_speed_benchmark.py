@@ -0,0 +1,69 @@
+"""
+
+Benchmark: the cost of finding the expected coordinate in GlobalSpeedValidator - per sample (with the
+precomputed milestone breakpoints, vs. going over the milestones as in earlier versions), and for a whole
+trial at once
+
+Usage: python global_speed_benchmark.py [n_samples]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import sys
+import time as tm
+
+import numpy as np
+
+from trajtracker.validators import GlobalSpeedValidator
+
+
+#--------------------------------------------------------------------------
+# The earlier implementation of get_expected_coord_at_time()
+#
+def expected_coord_by_milestones(validator, time):
+
+    total_distance = validator.end_coord - validator.origin_coord
+
+    remaining_time = time
+    result = validator.origin_coord
+    for milestone in validator._milestones:
+        ms_duration = milestone.time_percentage * validator.max_trial_duration
+        ms_distance = milestone.distance_percentage * total_distance
+        if remaining_time > ms_duration:
+            remaining_time -= ms_duration
+            result += ms_distance
+        else:
+            result += ms_distance * (remaining_time / ms_duration)
+            break
+
+    return result
+
+
+#--------------------------------------------------------------------------
+def run(n):
+
+    validator = GlobalSpeedValidator(origin_coord=0, end_coord=500, max_trial_duration=2,
+                                     milestones=[(.1, .05), (.2, .1), (.3, .25), (.4, .6)])
+    t = (np.arange(n) * 2.5 / n).tolist()
+
+    start = tm.time()
+    old = [expected_coord_by_milestones(validator, tt) for tt in t]
+    old_time = (tm.time() - start) / n
+
+    start = tm.time()
+    new = [validator.get_expected_coord_at_time(tt) for tt in t]
+    new_time = (tm.time() - start) / n
+
+    start = tm.time()
+    vectorized = validator.get_expected_coords_at_times(t)
+    vectorized_time = (tm.time() - start) / n
+
+    print("Loop over milestones:      {:6.3f} us/sample".format(old_time * 1e6))
+    print("Breakpoints (bisect):      {:6.3f} us/sample".format(new_time * 1e6))
+    print("Vectorized (whole trial):  {:6.3f} us/sample".format(vectorized_time * 1e6))
+    print("Max. difference: {:g}, {:g}".format(np.max(np.abs(np.array(old) - new)), np.max(np.abs(np.array(old) - vectorized))))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
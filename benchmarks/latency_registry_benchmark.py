@@ -0,0 +1,64 @@
+"""
+
+Benchmark: the per-call overhead of latency instrumentation (LatencyRegistry) on validators' check_xyt(),
+and the cost after the instrumentation is removed
+
+Usage: python latency_registry_benchmark.py [n_samples]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import sys
+import time as tm
+
+import numpy as np
+
+from trajtracker.misc import LatencyRegistry
+from trajtracker.validators import InstantaneousSpeedValidator, MovementAngleValidator, ValidationAxis
+
+
+#--------------------------------------------------------------------------
+def create_validators():
+    return [InstantaneousSpeedValidator(2.0, axis=ValidationAxis.y, min_speed=1, calculation_interval=0.05),
+            MovementAngleValidator(2.0, min_angle=-90, max_angle=90, calc_angle_interval=5)]
+
+
+def measure(validators, x, y, t):
+    start = tm.time()
+    for i in range(len(t)):
+        for validator in validators:
+            validator.check_xyt(x[i], y[i], t[i])
+    return (tm.time() - start) / len(t) / len(validators)
+
+
+#--------------------------------------------------------------------------
+def run(n):
+
+    x = np.cumsum(np.random.randint(-1, 2, n)).tolist()
+    y = np.cumsum(np.random.randint(1, 4, n)).tolist()
+    t = (np.arange(n) / 1000.0).tolist()
+
+    plain = measure(create_validators(), x, y, t)
+
+    registry = LatencyRegistry()
+    validators = create_validators()
+    for validator in validators:
+        registry.instrument(validator)
+    instrumented = measure(validators, x, y, t)
+
+    for validator in validators:
+        registry.uninstrument(validator)
+    for validator in validators:
+        validator.reset()
+    uninstrumented = measure(validators, x, y, t)
+
+    print("Not instrumented:   {:6.2f} us/call".format(plain * 1e6))
+    print("Instrumented:       {:6.2f} us/call (overhead {:.2f} us)".format(instrumented * 1e6, (instrumented - plain) * 1e6))
+    print("Uninstrumented:     {:6.2f} us/call".format(uninstrumented * 1e6))
+    print("")
+    registry.dump()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
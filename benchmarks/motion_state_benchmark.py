@@ -0,0 +1,75 @@
+"""
+
+Benchmark: the per-sample cost of 5 validators, when each validator gets the raw (x, y, time) via check_xyt(),
+vs. when the sample is preprocessed once by a MotionState and passed to the validators' check_sample(),
+and when the speed validators also share one SpeedMonitor
+
+Usage: python motion_state_benchmark.py [n_samples]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import sys
+import time as tm
+
+import numpy as np
+
+from trajtracker.movement import MotionState, SpeedMonitor
+from trajtracker.validators import InstantaneousSpeedValidator, MovementAngleValidator, ValidationAxis
+
+
+#--------------------------------------------------------------------------
+def create_validators(units_per_mm, speed_monitor=None):
+    return [InstantaneousSpeedValidator(units_per_mm, axis=ValidationAxis.y, min_speed=1, calculation_interval=0.05,
+                                        movement_monitor=speed_monitor),
+            InstantaneousSpeedValidator(units_per_mm, axis=ValidationAxis.x, max_speed=10000, calculation_interval=0.05,
+                                        movement_monitor=speed_monitor),
+            InstantaneousSpeedValidator(units_per_mm, axis=ValidationAxis.xy, max_speed=10000, calculation_interval=0.05,
+                                        movement_monitor=speed_monitor),
+            MovementAngleValidator(units_per_mm, min_angle=-90, max_angle=90, calc_angle_interval=5),
+            MovementAngleValidator(units_per_mm, min_angle=-120, max_angle=120, calc_angle_interval=10)]
+
+
+#--------------------------------------------------------------------------
+def run(n):
+
+    units_per_mm = 2.0
+    x = np.cumsum(np.random.randint(-1, 2, n)).tolist()
+    y = np.cumsum(np.random.randint(1, 4, n)).tolist()
+    t = (np.arange(n) / 1000.0).tolist()
+
+    validators = create_validators(units_per_mm)
+    start = tm.time()
+    for i in range(n):
+        for validator in validators:
+            validator.check_xyt(x[i], y[i], t[i])
+    raw_duration = tm.time() - start
+
+    validators = create_validators(units_per_mm)
+    motion = MotionState(units_per_mm)
+    start = tm.time()
+    for i in range(n):
+        sample = motion.update_xyt(x[i], y[i], t[i])
+        for validator in validators:
+            validator.check_sample(sample)
+    sample_duration = tm.time() - start
+
+    validators = create_validators(units_per_mm, SpeedMonitor(units_per_mm, 0.05))
+    motion = MotionState(units_per_mm)
+    start = tm.time()
+    for i in range(n):
+        sample = motion.update_xyt(x[i], y[i], t[i])
+        for validator in validators:
+            validator.check_sample(sample)
+    shared_duration = tm.time() - start
+
+    print("check_xyt():                                   {:6.1f} us/sample".format(raw_duration / n * 1e6))
+    print("MotionState + check_sample():                  {:6.1f} us/sample (speedup {:.1f}x)".format(
+        sample_duration / n * 1e6, raw_duration / sample_duration))
+    print("MotionState + check_sample(), shared monitor:  {:6.1f} us/sample (speedup {:.1f}x)".format(
+        shared_duration / n * 1e6, raw_duration / shared_duration))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
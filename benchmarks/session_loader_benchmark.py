@@ -0,0 +1,55 @@
+"""
+
+Benchmark: loading a directory of session files with trajtracker.data.load_sessions,
+with an increasing number of worker processes.
+
+Usage: python session_loader_benchmark.py [n_sessions] [rows_per_session]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time as tm
+
+import numpy as np
+
+from trajtracker.data import CsvTrajectoryWriter, load_sessions
+
+
+#--------------------------------------------------------------------------
+def run(n_sessions, rows_per_session, samples_per_trial=1000):
+
+    out_dir = tempfile.mkdtemp()
+
+    try:
+        for session in range(n_sessions):
+            writer = CsvTrajectoryWriter(os.path.join(out_dir, "subj{:03d}.csv".format(session)))
+            for trial_num in range(rows_per_session // samples_per_trial):
+                writer.write_trial(trial_num,
+                                   np.random.randint(-500, 500, samples_per_trial),
+                                   np.cumsum(np.random.rand(samples_per_trial)),
+                                   np.arange(samples_per_trial) / 1000.0, x_is_int=True)
+            writer.close()
+
+        n_workers = 1
+        baseline = None
+        while n_workers <= multiprocessing.cpu_count():
+            start = tm.time()
+            load_sessions(out_dir, n_workers=n_workers)
+            duration = tm.time() - start
+            baseline = baseline or duration
+            print("{:3d} workers: {:8.3f} sec (speedup {:.1f}x)".format(n_workers, duration, baseline / duration))
+            n_workers *= 2
+
+    finally:
+        shutil.rmtree(out_dir)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 32,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
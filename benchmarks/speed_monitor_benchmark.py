@@ -0,0 +1,43 @@
+"""
+
+Benchmark: the per-sample cost of SpeedMonitor.update_xyt() + xyspeed, for different sampling rates and
+calculation intervals. The cost should not depend on the number of samples in the calculation window.
+
+Usage: python speed_monitor_benchmark.py
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import time as tm
+
+import numpy as np
+
+from trajtracker.movement import SpeedMonitor
+
+
+#--------------------------------------------------------------------------
+def run(sampling_rate, calculation_interval, duration=2.0):
+
+    n = int(sampling_rate * duration)
+    x = np.cumsum(np.random.randint(-3, 4, n)).tolist()
+    y = np.cumsum(np.random.randint(0, 4, n)).tolist()
+    t = (np.arange(n) / float(sampling_rate)).tolist()
+
+    monitor = SpeedMonitor(1, calculation_interval)
+
+    start = tm.time()
+    for i in range(n):
+        monitor.update_xyt(x[i], y[i], t[i])
+        monitor.xyspeed
+    elapsed = tm.time() - start
+
+    window = int(sampling_rate * calculation_interval)
+    print("{:6d} Hz, interval={:.2f} s ({:4d} samples in window): {:6.2f} us/sample".format(
+        sampling_rate, calculation_interval, window, elapsed / n * 1e6))
+
+
+if __name__ == '__main__':
+    for rate in (60, 250, 1000, 4000):
+        for interval in (0.05, 0.2, 1.0):
+            run(rate, interval)
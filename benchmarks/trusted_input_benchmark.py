@@ -0,0 +1,96 @@
+"""
+
+Benchmark: the per-sample cost of the methods called per sample, with and without trusted_input
+(i.e., with and without validating the methods' arguments)
+
+GlobalSpeedGuide.show() is not measured, because it requires an active expyriment experiment.
+
+Usage: python trusted_input_benchmark.py [n_samples]
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import sys
+import time as tm
+
+import numpy as np
+
+from trajtracker.misc import LocationColorMap, shapes
+from trajtracker.movement import CustomTrajectoryGenerator, DirectionMonitor, MotionState, SpeedMonitor, \
+    StartPoint, TrajectoryTracker, TrialSummary
+from trajtracker.validators import InstantaneousSpeedValidator, LocationsValidator, MovementAngleValidator, \
+    NCurvesValidator, ValidationAxis
+
+
+#--------------------------------------------------------------------------
+def create_tracker():
+    tracker = TrajectoryTracker()
+    tracker.reset(True)
+    return tracker
+
+
+def create_generator():
+    gen = CustomTrajectoryGenerator(cyclic=True)
+    gen.set_trajectory(1, [(t / 100.0, t, t * 2) for t in range(100)])
+    gen.active_traj_id = 1
+    return gen
+
+
+image = [[(0, 0, 0) if (i + j) % 7 == 0 else (255, 255, 255) for j in range(200)] for i in range(200)]
+
+
+def create_locations_validator():
+    validator = LocationsValidator(image, default_valid=True)
+    validator.invalid_colors = (0, 0, 0)
+    return validator
+
+
+#-- Per class: (name, a function that creates the object, a function that calls the object with one sample)
+cases = [
+    ("MotionState.update_xyt", lambda: MotionState(2.0), lambda o, x, y, t: o.update_xyt(x, y, t)),
+    ("SpeedMonitor.update_xyt", lambda: SpeedMonitor(2.0, 0.05), lambda o, x, y, t: o.update_xyt(x, y, t)),
+    ("DirectionMonitor.update_xyt", lambda: DirectionMonitor(2.0, min_distance=5), lambda o, x, y, t: o.update_xyt(x, y, t)),
+    ("TrialSummary.update_xyt", lambda: TrialSummary(2.0), lambda o, x, y, t: o.update_xyt(x, y, t)),
+    ("TrajectoryTracker.update_xyt", create_tracker, lambda o, x, y, t: o.update_xyt(x, y, t)),
+    ("InstantaneousSpeedValidator.check_xyt",
+     lambda: InstantaneousSpeedValidator(2.0, axis=ValidationAxis.y, min_speed=1, calculation_interval=0.05),
+     lambda o, x, y, t: o.check_xyt(x, y, t)),
+    ("MovementAngleValidator.check_xyt",
+     lambda: MovementAngleValidator(2.0, min_angle=-90, max_angle=90, calc_angle_interval=5),
+     lambda o, x, y, t: o.check_xyt(x, y, t)),
+    ("NCurvesValidator.check_xyt", lambda: NCurvesValidator(max_curves_per_trial=1000), lambda o, x, y, t: o.check_xyt(x, y, t)),
+    ("LocationsValidator.check_xyt", create_locations_validator, lambda o, x, y, t: o.check_xyt(x % 100, y % 100, t)),
+    ("LocationColorMap.get_color_at", lambda: LocationColorMap(image), lambda o, x, y, t: o.get_color_at(x % 100, y % 100)),
+    ("StartPoint.check_xy", lambda: StartPoint(shapes.Rectangle(0, 0, 100, 50)), lambda o, x, y, t: o.check_xy(x, y)),
+    ("CustomTrajectoryGenerator.get_traj_point", create_generator, lambda o, x, y, t: o.get_traj_point(t)),
+]
+
+
+#--------------------------------------------------------------------------
+def measure(create, call, x, y, t, trusted):
+    obj = create()
+    obj.trusted_input = trusted
+    start = tm.time()
+    for i in range(len(t)):
+        call(obj, x[i], y[i], t[i])
+    return (tm.time() - start) / len(t)
+
+
+#--------------------------------------------------------------------------
+def run(n):
+
+    x = np.cumsum(np.random.randint(-1, 2, n)).tolist()
+    y = np.cumsum(np.random.randint(1, 4, n)).tolist()
+    t = (np.arange(n) / 1000.0).tolist()
+
+    print("{:45}{:>12}{:>12}{:>12}".format("", "validated", "trusted", "saved"))
+    for name, create, call in cases:
+        validated = measure(create, call, x, y, t, False)
+        trusted = measure(create, call, x, y, t, True)
+        print("{:45}{:9.2f} us{:9.2f} us{:9.2f} us ({:.0f}%)".format(
+            name, validated * 1e6, trusted * 1e6, (validated - trusted) * 1e6, (validated - trusted) / validated * 100))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
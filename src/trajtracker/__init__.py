@@ -40,36 +40,115 @@ class _TTrkObject(object):
     log_error = 5
     log_none = 9999
 
+    #-- Per-level gates, precomputed when log_level is set: code that logs per sample checks the gate before
+    #-- preparing the message, so disabled logging costs one attribute check
+    _log_level = log_none
+    _log_trace_on = False
+    _log_debug_on = False
+    _log_info_on = False
+    _log_warn_on = False
+    _log_error_on = False
+
     @property
     def log_level(self):
-        """Getter for logging level."""
+        """
+        The log level of this object: messages of this level and higher levels are written to the
+        experiment's event file. Use the constants _TTrkObject.log_xxxxx (default: log_none)
+        """
         return self._log_level
 
     @log_level.setter
     def log_level(self, level):
+        _utils.validate_attr_numeric(self, "log_level", level)
+        self._log_level = level
+        self._log_trace_on = self.log_trace >= level
+        self._log_debug_on = self.log_debug >= level
+        self._log_info_on = self.log_info >= level
+        self._log_warn_on = self.log_warn >= level
+        self._log_error_on = self.log_error >= level
+
+
+    #--------------------------------------------
+    #-- Trusted input: skip validating the arguments of methods called per sample (update_xyt(), check_xyt() etc.).
+    #-- The class attribute is the package-wide setting (see set_trusted_input()); objects can override it.
+    _trusted_input = False
+
+    @property
+    def trusted_input(self):
         """
-        Set the log level of this object
-        :param level: Use the constants _TTrkObject.log_xxxxx
+        If True, the methods called per sample (update_xyt(), check_xyt(), get_color_at() etc.) do not validate
+        their arguments - the caller is responsible for providing valid values. Property setters always validate
+        their values.
+
+        By default, this follows the package-wide setting (see :func:`~trajtracker.set_trusted_input`).
+        Set to None to follow the package-wide setting again. Objects that were created internally by this
+        object (e.g. the default SpeedMonitor of an InstantaneousSpeedValidator) get the same setting.
         """
-        self._log_level = level
+        return self._trusted_input
+
+    @trusted_input.setter
+    def trusted_input(self, value):
+        if value is None:
+            self.__dict__.pop("_trusted_input", None)
+        else:
+            _utils.validate_attr_type(self, "trusted_input", value, bool)
+            self._trusted_input = value
+
+        for obj in self._internal_objects():
+            obj.trusted_input = value
+
+    #-- Objects that were created by this object for its internal use, and follow its trusted_input setting
+    def _internal_objects(self):
+        return ()
 
 
     #--------------------------------------------
-    #-- Some default logging functions
+    #-- Structured event log (trajtracker.data.EventLog). Code that logs per sample checks _event_log before
+    #-- writing a record, so a disabled event log costs one attribute check
+    _event_log = None
+    _event_log_id = 0
 
-    def _should_log(self, message_level):
-        return message_level >= self._log_level
+    @property
+    def event_log(self):
+        """
+        A :class:`~trajtracker.data.EventLog` to which this object writes its events (e.g. each tracked/validated
+        sample). Unlike log_level, this logs numeric records, so it is cheap enough for logging every sample.
+        None = no event log (default).
+        """
+        return self._event_log
+
+    @event_log.setter
+    def event_log(self, value):
+        _utils.validate_attr_type(self, "event_log", value, data.EventLog, none_allowed=True)
+        self._event_log = value
+        self._event_log_id = 0 if value is None else value.register_object(self)
+
+
+    #--------------------------------------------
+    #-- Logging functions
+
+    def _log(self, message_level, msg_format, *args):
+        """
+        Write a message to the experiment's event file, if the message level is enabled.
+        The message is formatted (msg_format.format(\*args)) only if it is written.
+        """
+        if message_level < self._log_level:
+            return
+
+        self._log_write(msg_format.format(*args) if len(args) > 0 else msg_format)
 
 
     #-------------------------------------------------
     def _log_setter(self, attr_name, value=None):
 
-        if self._log_level > self.log_trace:
+        if not self._log_trace_on:
             return
 
+        #-- The value is converted to string only when logging is enabled
         if value is None:
-            value = str(self.__getattribute__(attr_name))
+            value = self.__getattribute__(attr_name)
 
+        value = str(value)
         if len(value) > 100:
             value = value[:100]
 
@@ -81,8 +160,22 @@ class _TTrkObject(object):
         xpy._active_exp._event_file_log(msg, 1)
 
 
+#--------------------------------------------
+def set_trusted_input(trusted):
+    """
+    Set the package-wide trusted-input mode: if True, the methods called per sample (update_xyt(), check_xyt(),
+    get_color_at() etc.) of all trajtracker objects do not validate their arguments. Objects whose
+    :attr:`trusted_input` was set explicitly keep their own setting.
+
+    :param trusted: bool
+    """
+    _utils.validate_func_arg_type(None, "set_trusted_input", "trusted", trusted, bool)
+    _TTrkObject._trusted_input = trusted
+
+
 import trajtracker._utils as _utils
 
+import trajtracker.data as data
 import trajtracker.misc as misc
 import trajtracker.stimuli as stimuli
 import trajtracker.movement as movement
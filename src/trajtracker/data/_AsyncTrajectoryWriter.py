@@ -0,0 +1,127 @@
+"""
+
+Write trajectories to a file in a background thread
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import Queue
+import threading
+
+import numpy as np
+
+import trajtracker
+
+
+class AsyncTrajectoryWriter(object):
+    """
+    Wrap another trajectory writer (e.g., :class:`~trajtracker.data.CsvTrajectoryWriter`), and call it
+    from a background thread.
+
+    :func:`~trajtracker.data.AsyncTrajectoryWriter.write_trial` copies the trial's data into a bounded queue
+    and returns immediately; the background thread formats the data and writes it to the file.
+    write_trial() blocks only if the queue is full.
+
+    If writing fails in the background thread, the error is raised by the next call to write_trial(),
+    flush() or close(). Trials submitted after the error are not written.
+
+    Make sure to call :func:`~trajtracker.data.AsyncTrajectoryWriter.close` when the session ends,
+    otherwise trials still in the queue would be lost.
+    """
+
+    default_queue_size = 16
+
+
+    #----------------------------------------------------
+    def __init__(self, writer, queue_size=default_queue_size):
+        """
+        Constructor - start the background thread
+
+        :param writer: The writer that actually writes to the file. It must have the methods
+                       write_trial(), flush() and close()
+        :param queue_size: The maximal number of trials waiting to be written
+        """
+        self._writer = writer
+        self._queue = Queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._write_queued_trials, name="AsyncTrajectoryWriter")
+        self._thread.daemon = True
+        self._thread.start()
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The file's full path """
+        return self._writer.filename
+
+
+    #----------------------------------------------------
+    def write_trial(self, trial_num, x, y, time, x_is_int=False, y_is_int=False):
+        """
+        Queue one trial's trajectory for writing. The arrays are copied, so the caller can reuse them.
+
+        :return: The number of samples queued
+        """
+        self._raise_pending_error("write_trial")
+
+        self._queue.put((trial_num, np.array(x), np.array(y), np.array(time), x_is_int, y_is_int))
+        return len(time)
+
+
+    #----------------------------------------------------
+    def flush(self):
+        """ Wait until all queued trials were written, and flush the file """
+        self._raise_pending_error("flush")
+
+        self._queue.join()
+        self._raise_pending_error("flush")
+        self._writer.flush()
+
+
+    #----------------------------------------------------
+    def close(self):
+        """ Write all queued trials, stop the background thread and close the file """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.close()
+
+        self._raise_pending_error("close")
+
+
+    #----------------------------------------------------
+    def _raise_pending_error(self, method_name):
+
+        if self._error is not None:
+            raise self._error
+
+        if self._closed and method_name != "close":
+            raise trajtracker.InvalidStateError("{:}.{:}() was called after the writer was closed".format(type(self).__name__, method_name))
+
+
+    #----------------------------------------------------
+    # The background thread
+    #
+    def _write_queued_trials(self):
+
+        while True:
+            trial = self._queue.get()
+            try:
+                if trial is None:
+                    return
+
+                if self._error is None:
+                    self._writer.write_trial(*trial)
+
+            except Exception as e:
+                self._error = e
+
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,237 @@
+"""
+
+Write/read trajectories to/from a binary file
+
+File format (all numbers are little-endian):
+
+- File header (16 bytes): the magic string "TTRKTRAJ", format version (uint32), 4 unused bytes
+- One block per trial, consisting of:
+
+  - Block header (16 bytes): trial number (int32), number of samples N (uint32), flags (uint8), 7 unused bytes.
+    Flags: bit 0 = x coordinates are integers, bit 1 = y coordinates are integers
+  - N time values (float64), then N x coordinates (float64), then N y coordinates (float64)
+
+All blocks and columns are aligned to 8 bytes, so the file can be memory-mapped and the columns
+can be used as arrays without copying.
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import os
+import struct
+
+import numpy as np
+
+import trajtracker
+
+
+_magic = b'TTRKTRAJ'
+_version = 1
+_file_header = struct.Struct('<8sI4x')
+_block_header = struct.Struct('<iIB7x')
+_value_type = np.dtype('<f8')
+
+_flag_x_int = 1
+_flag_y_int = 2
+
+
+#===========================================================================================
+class BinaryTrajectoryWriter(object):
+    """
+    Write trajectories to a binary file - one block per trial.
+
+    The file remains open until :func:`~trajtracker.data.BinaryTrajectoryWriter.close` is called.
+    Read the file with :class:`~trajtracker.data.BinaryTrajectoryReader`
+    """
+
+    #----------------------------------------------------
+    def __init__(self, filename, open_file=open):
+        """
+        Constructor - create the file and write the file header
+
+        :param filename: Full path
+        :param open_file: A function for opening a file, with the same signature as open()
+        """
+        self._filename = filename
+        self._fh = open_file(filename, 'wb')
+        self._fh.write(_file_header.pack(_magic, _version))
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The file's full path """
+        return self._filename
+
+
+    #----------------------------------------------------
+    def write_trial(self, trial_num, x, y, time, x_is_int=False, y_is_int=False):
+        """
+        Append one trial's trajectory to the file
+
+        :param trial_num: The trial number
+        :param x: Array of x coordinates
+        :param y: Array of y coordinates
+        :param time: Array of time points
+        :param x_is_int: Whether the x coordinates are integers (bool, or an array of bool - one per coordinate)
+        :param y_is_int: Whether the y coordinates are integers (bool, or an array of bool)
+        :return: The number of samples written
+        """
+        if self._fh is None:
+            raise trajtracker.InvalidStateError("{:}.write_trial() was called after the file was closed".format(type(self).__name__))
+
+        x_is_int = bool(np.all(x_is_int))
+        y_is_int = bool(np.all(y_is_int))
+        flags = (_flag_x_int if x_is_int else 0) | (_flag_y_int if y_is_int else 0)
+        n = len(time)
+
+        self._fh.write(_block_header.pack(trial_num, n, flags) +
+                       np.asarray(time, dtype=_value_type).tobytes() +
+                       np.asarray(x, dtype=_value_type).tobytes() +
+                       np.asarray(y, dtype=_value_type).tobytes())
+
+        return n
+
+
+    #----------------------------------------------------
+    def flush(self):
+        """ Make sure all trials written so far are in the file """
+        if self._fh is not None:
+            self._fh.flush()
+
+
+    #----------------------------------------------------
+    def close(self):
+        """ Close the file. Nothing more can be written after this call. """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+#===========================================================================================
+class BinaryTrajectoryReader(object):
+    """
+    Read a file created by :class:`~trajtracker.data.BinaryTrajectoryWriter`.
+
+    The file is memory-mapped: only the block headers are read when the file is opened, and the
+    trajectories are returned as numpy arrays that are views on the file's data.
+    """
+
+    #----------------------------------------------------
+    def __init__(self, filename):
+        """
+        Constructor - open the file and index its trials
+
+        :param filename: Full path
+        """
+        self._filename = filename
+
+        file_size = os.path.getsize(filename)
+        if file_size < _file_header.size:
+            raise trajtracker.BadFormatError("{:} is not a trajectory file (it is too short)".format(filename))
+
+        self._data = np.memmap(filename, dtype=np.uint8, mode='r')
+
+        magic, version = _file_header.unpack_from(self._data, 0)
+        if magic != _magic:
+            raise trajtracker.BadFormatError("{:} is not a trajectory file".format(filename))
+        if version != _version:
+            raise trajtracker.BadFormatError("{:} has an unsupported format version ({:})".format(filename, version))
+
+        self._blocks = []
+        self._block_of_trial = {}
+
+        offset = _file_header.size
+        while offset < file_size:
+            if offset + _block_header.size > file_size:
+                raise trajtracker.BadFormatError("{:}: the last trial in the file is incomplete".format(filename))
+
+            trial_num, n, flags = _block_header.unpack_from(self._data, offset)
+            offset += _block_header.size
+
+            end_offset = offset + 3 * n * _value_type.itemsize
+            if end_offset > file_size:
+                raise trajtracker.BadFormatError("{:}: the last trial in the file (trial #{:}) is incomplete".format(filename, trial_num))
+
+            self._block_of_trial[trial_num] = len(self._blocks)
+            self._blocks.append((trial_num, offset, n, flags))
+            offset = end_offset
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The file's full path """
+        return self._filename
+
+    #----------------------------------------------------
+    @property
+    def trial_nums(self):
+        """ The numbers of all trials in the file, in the order they were written """
+        return [b[0] for b in self._blocks]
+
+    #----------------------------------------------------
+    def __len__(self):
+        return len(self._blocks)
+
+    #----------------------------------------------------
+    def __contains__(self, trial_num):
+        return trial_num in self._block_of_trial
+
+
+    #----------------------------------------------------
+    def get_trial(self, trial_num):
+        """
+        Get the trajectory of one trial. If the trial was written several times, the last one is returned.
+
+        :return: 3 numpy arrays: x, y, time
+        """
+        if trial_num not in self._block_of_trial:
+            raise ValueError("trajtracker error: trial #{:} does not exist in {:}".format(trial_num, self._filename))
+
+        return self._get_block(self._blocks[self._block_of_trial[trial_num]])
+
+
+    #----------------------------------------------------
+    def get_trial_int_flags(self, trial_num):
+        """
+        Get, for one trial, whether its x and y coordinates were integers.
+
+        :return: (x_is_int, y_is_int)
+        """
+        if trial_num not in self._block_of_trial:
+            raise ValueError("trajtracker error: trial #{:} does not exist in {:}".format(trial_num, self._filename))
+
+        flags = self._blocks[self._block_of_trial[trial_num]][3]
+        return bool(flags & _flag_x_int), bool(flags & _flag_y_int)
+
+
+    #----------------------------------------------------
+    def __iter__(self):
+        """
+        Iterate over all trials in the file, in the order they were written
+
+        :return: An iterator of (trial_num, x, y, time) tuples
+        """
+        for block in self._blocks:
+            x, y, time = self._get_block(block)
+            yield block[0], x, y, time
+
+
+    #----------------------------------------------------
+    def _get_block(self, block):
+        trial_num, offset, n, flags = block
+        col_size = n * _value_type.itemsize
+        time = self._data[offset:offset + col_size].view(_value_type)
+        x = self._data[offset + col_size:offset + 2 * col_size].view(_value_type)
+        y = self._data[offset + 2 * col_size:offset + 3 * col_size].view(_value_type)
+        return x, y, time
+
+
+    #----------------------------------------------------
+    def close(self):
+        """
+        Release the memory-mapped file. Arrays previously returned by this object remain valid.
+        """
+        self._data = None
@@ -0,0 +1,289 @@
+"""
+
+Write/read trajectories to/from a compressed file
+
+Time and coordinates are converted to integers (according to the required precision), delta-encoded,
+stored with the smallest integer type that fits, and compressed - one block per trial.
+
+File format (all numbers are little-endian):
+
+- File header (16 bytes): the magic string "TTRKZTRJ", format version (uint16), compression codec (uint8: 1=zlib, 2=bz2),
+  time precision (uint8), x/y precision (uint8), 3 unused bytes
+- One block per trial, consisting of:
+
+  - Block header (16 bytes): trial number (int32), number of samples N (uint32), flags (uint8),
+    integer type of the time, x and y columns (3 * uint8: the number of bytes per value), compressed data size (uint32).
+    Flags: bit 0 = x coordinates are integers, bit 1 = y coordinates are integers
+  - Compressed data: N time deltas, then N x deltas, then N y deltas.
+    The first delta of each column is relative to 0.
+    Integer coordinates are stored as is; other coordinates (and time) are multiplied by 10^precision and rounded.
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+from __future__ import division
+
+import bz2
+import struct
+import zlib
+
+import numpy as np
+
+import trajtracker
+
+
+_magic = b'TTRKZTRJ'
+_version = 1
+_file_header = struct.Struct('<8sHBBB3x')
+_block_header = struct.Struct('<iIB3BI')
+
+_codecs = {'zlib': 1, 'bz2': 2}
+_compress = {1: lambda data: zlib.compress(data, 6), 2: lambda data: bz2.compress(data, 9)}
+_decompress = {1: zlib.decompress, 2: bz2.decompress}
+
+_flag_x_int = 1
+_flag_y_int = 2
+
+_int_types = {1: np.dtype('<i1'), 2: np.dtype('<i2'), 4: np.dtype('<i4'), 8: np.dtype('<i8')}
+
+
+#--------------------------------------------------------------------------
+# Delta-encode an int64 array, using the smallest integer type that can hold the deltas
+#
+def _encode_deltas(values):
+
+    deltas = np.diff(values)
+    if len(values) > 0:
+        deltas = np.concatenate((values[:1], deltas))
+
+    for size in sorted(_int_types):
+        dtype = _int_types[size]
+        info = np.iinfo(dtype)
+        if len(deltas) == 0 or (deltas.min() >= info.min and deltas.max() <= info.max):
+            return size, deltas.astype(dtype).tobytes()
+
+
+#===========================================================================================
+class CompressedTrajectoryWriter(object):
+    """
+    Write trajectories to a compressed file - one block per trial.
+
+    The time and coordinates are stored with the given precision, like in the CSV format
+    (:class:`~trajtracker.data.CsvTrajectoryWriter`). Read the file with :class:`~trajtracker.data.CompressedTrajectoryReader`
+    """
+
+    #----------------------------------------------------
+    def __init__(self, filename, xy_precision=5, time_precision=3, compression='zlib', open_file=open):
+        """
+        Constructor - create the file and write the file header
+
+        :param filename: Full path
+        :param xy_precision: Precision of x,y coordinates (default: 5) - the number of digits after the decimal point
+        :param time_precision: Precision of time (default: 3) - the number of digits after the decimal point
+        :param compression: The compression codec: 'zlib' (faster) or 'bz2' (smaller files)
+        :param open_file: A function for opening a file, with the same signature as open()
+        """
+        if compression not in _codecs:
+            raise ValueError("trajtracker error: invalid compression for {:} ({:}), expecting one of: {:}".format(
+                type(self).__name__, compression, ", ".join(sorted(_codecs))))
+
+        self._filename = filename
+        self._codec = _codecs[compression]
+        self._xy_scale = 10 ** xy_precision
+        self._time_scale = 10 ** time_precision
+
+        self._fh = open_file(filename, 'wb')
+        self._fh.write(_file_header.pack(_magic, _version, self._codec, time_precision, xy_precision))
+        self._fh.flush()
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The file's full path """
+        return self._filename
+
+
+    #----------------------------------------------------
+    def write_trial(self, trial_num, x, y, time, x_is_int=False, y_is_int=False):
+        """
+        Append one trial's trajectory to the file
+
+        :param trial_num: The trial number
+        :param x: Array of x coordinates
+        :param y: Array of y coordinates
+        :param time: Array of time points
+        :param x_is_int: Whether the x coordinates are integers (bool, or an array of bool - one per coordinate)
+        :param y_is_int: Whether the y coordinates are integers (bool, or an array of bool)
+        :return: The number of samples written
+        """
+        if self._fh is None:
+            raise trajtracker.InvalidStateError("{:}.write_trial() was called after the file was closed".format(type(self).__name__))
+
+        n = len(time)
+        x_is_int = bool(np.all(x_is_int))
+        y_is_int = bool(np.all(y_is_int))
+        flags = (_flag_x_int if x_is_int else 0) | (_flag_y_int if y_is_int else 0)
+
+        t_size, t_data = _encode_deltas(self._quantize(time, self._time_scale))
+        x_size, x_data = _encode_deltas(self._quantize(x, 1 if x_is_int else self._xy_scale))
+        y_size, y_data = _encode_deltas(self._quantize(y, 1 if y_is_int else self._xy_scale))
+
+        data = _compress[self._codec](t_data + x_data + y_data)
+
+        self._fh.write(_block_header.pack(trial_num, n, flags, t_size, x_size, y_size, len(data)) + data)
+
+        return n
+
+
+    #----------------------------------------------------
+    @staticmethod
+    def _quantize(values, scale):
+        return np.round(np.asarray(values, dtype=np.float64) * scale).astype(np.int64)
+
+
+    #----------------------------------------------------
+    def flush(self):
+        """ Make sure all trials written so far are in the file """
+        if self._fh is not None:
+            self._fh.flush()
+
+
+    #----------------------------------------------------
+    def close(self):
+        """ Close the file. Nothing more can be written after this call. """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+#===========================================================================================
+class CompressedTrajectoryReader(object):
+    """
+    Read a file created by :class:`~trajtracker.data.CompressedTrajectoryWriter`.
+
+    The file is read sequentially, one trial at a time, so the whole file is never in memory:
+
+    ::
+
+        with CompressedTrajectoryReader(filename) as reader:
+            for trial_num, x, y, time in reader:
+                ...
+
+    Integer coordinates are returned as int64 arrays; other values are returned as float64 arrays.
+    """
+
+    #----------------------------------------------------
+    def __init__(self, filename):
+        """
+        Constructor - open the file and read its header
+
+        :param filename: Full path
+        """
+        self._filename = filename
+        self._fh = open(filename, 'rb')
+
+        header = self._fh.read(_file_header.size)
+        if len(header) < _file_header.size:
+            self.close()
+            raise trajtracker.BadFormatError("{:} is not a compressed trajectory file (it is too short)".format(filename))
+
+        magic, version, self._codec, time_precision, xy_precision = _file_header.unpack(header)
+        if magic != _magic:
+            self.close()
+            raise trajtracker.BadFormatError("{:} is not a compressed trajectory file".format(filename))
+        if version != _version or self._codec not in _decompress:
+            self.close()
+            raise trajtracker.BadFormatError("{:} has an unsupported format version ({:}) or compression ({:})".format(
+                filename, version, self._codec))
+
+        self._time_scale = 10 ** time_precision
+        self._xy_scale = 10 ** xy_precision
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The file's full path """
+        return self._filename
+
+
+    #----------------------------------------------------
+    def __iter__(self):
+        """
+        Iterate over the trials in the file, in the order they were written
+
+        :return: An iterator of (trial_num, x, y, time) tuples
+        """
+        while True:
+            trial = self.read_trial()
+            if trial is None:
+                return
+            yield trial
+
+
+    #----------------------------------------------------
+    def read_trial(self):
+        """
+        Read the next trial from the file
+
+        :return: (trial_num, x, y, time), or None if the end of the file was reached
+        """
+        if self._fh is None:
+            raise trajtracker.InvalidStateError("{:}.read_trial() was called after the file was closed".format(type(self).__name__))
+
+        header = self._fh.read(_block_header.size)
+        if len(header) == 0:
+            return None
+        if len(header) < _block_header.size:
+            raise trajtracker.BadFormatError("{:}: the last trial in the file is incomplete".format(self._filename))
+
+        trial_num, n, flags, t_size, x_size, y_size, data_len = _block_header.unpack(header)
+
+        data = self._fh.read(data_len)
+        if len(data) < data_len:
+            raise trajtracker.BadFormatError("{:}: the last trial in the file (trial #{:}) is incomplete".format(self._filename, trial_num))
+
+        try:
+            data = _decompress[self._codec](data)
+        except (zlib.error, IOError, ValueError, EOFError):
+            raise trajtracker.BadFormatError("{:}: the data of trial #{:} is corrupt".format(self._filename, trial_num))
+
+        if len(data) != n * (t_size + x_size + y_size) or \
+                t_size not in _int_types or x_size not in _int_types or y_size not in _int_types:
+            raise trajtracker.BadFormatError("{:}: the data of trial #{:} is corrupt".format(self._filename, trial_num))
+
+        time = self._decode(data, 0, n, t_size) / self._time_scale
+
+        x_offset = n * t_size
+        x = self._decode(data, x_offset, n, x_size)
+        if not flags & _flag_x_int:
+            x = x / self._xy_scale
+
+        y = self._decode(data, x_offset + n * x_size, n, y_size)
+        if not flags & _flag_y_int:
+            y = y / self._xy_scale
+
+        return trial_num, x, y, time
+
+
+    #----------------------------------------------------
+    @staticmethod
+    def _decode(data, offset, n, size):
+        deltas = np.frombuffer(data, dtype=_int_types[size], count=n, offset=offset)
+        return np.cumsum(deltas, dtype=np.int64)
+
+
+    #----------------------------------------------------
+    def close(self):
+        """ Close the file """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
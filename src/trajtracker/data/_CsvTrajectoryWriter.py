@@ -0,0 +1,153 @@
+"""
+
+Write trajectories to a CSV file
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import numpy as np
+
+import trajtracker
+
+
+class CsvTrajectoryWriter(object):
+    """
+    Write trajectories to a CSV file with the columns trial,time,x,y (one row per tracked point).
+
+    This is the default output format of :class:`~trajtracker.movement.TrajectoryTracker`
+
+    The writer can also maintain an index file (the CSV file name + ".idx"), with one line per trial:
+    trial number, byte offset of the trial's first row in the CSV file, number of bytes, and number of rows.
+    The index allows reading specific trials without parsing the whole file - see
+    :func:`~trajtracker.data.load_trials`
+    """
+
+    header = 'trial,time,x,y\n'
+    index_header = 'trial,offset,n_bytes,n_rows\n'
+    index_file_suffix = '.idx'
+
+
+    #----------------------------------------------------
+    def __init__(self, filename, xy_precision=5, time_precision=3, open_file=open, save_index=False):
+        """
+        Constructor - create the file and write the header line. The file remains open until
+        :func:`~trajtracker.data.CsvTrajectoryWriter.close` is called.
+
+        :param filename: Full path
+        :param xy_precision: Precision of x,y coordinates (default: 5)
+        :param time_precision: Precision of time (default: 3)
+        :param open_file: A function for opening a file, with the same signature as open()
+        :param save_index: Whether to create an index file
+        """
+        self._filename = filename
+        self._xy_precision = xy_precision
+        self._time_precision = time_precision
+
+        self._fh = open_file(filename, 'w')
+        self._fh.write(self.header)
+        self._fh.flush()
+
+        if save_index:
+            self._index_fh = open_file(filename + self.index_file_suffix, 'w')
+            self._index_fh.write(self.index_header)
+            self._index_fh.flush()
+            self._offset = self._fh.tell()
+        else:
+            self._index_fh = None
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The file's full path """
+        return self._filename
+
+
+    #----------------------------------------------------
+    def write_trial(self, trial_num, x, y, time, x_is_int=False, y_is_int=False):
+        """
+        Append one trial's trajectory to the file.
+
+        The whole trial is formatted by a single string-formatting operation and written with a single write().
+        The file is not flushed - call :func:`~trajtracker.data.CsvTrajectoryWriter.flush` to make sure the
+        trials are in the file before the writer is closed.
+
+        :param trial_num: The trial number
+        :param x: Array of x coordinates
+        :param y: Array of y coordinates
+        :param time: Array of time points
+        :param x_is_int: Whether the x coordinates should be formatted as integers: bool, or an array of bool
+                         (one per coordinate)
+        :param y_is_int: Whether the y coordinates should be formatted as integers: bool, or an array of bool
+        :return: The number of rows written
+        """
+        if self._fh is None:
+            raise trajtracker.InvalidStateError("{:}.write_trial() was called after the file was closed".format(type(self).__name__))
+
+        n = len(time)
+
+        if n > 0:
+            #-- Interleave the columns, in the order of the CSV columns
+            values = np.empty((n, 3))
+            values[:, 0] = time
+            values[:, 1] = x
+            values[:, 2] = y
+
+            xy_format = '%%.%df' % self._xy_precision
+            x_formats = _coord_formats(x_is_int, xy_format)
+            y_formats = _coord_formats(y_is_int, xy_format)
+            row_prefix = '%d,%%.%df,' % (trial_num, self._time_precision)
+
+            if isinstance(x_formats, str) and isinstance(y_formats, str):
+                trial_format = (row_prefix + x_formats + ',' + y_formats + '\n') * n
+            else:
+                #-- Some coordinates are integers and some aren't: format each of them accordingly
+                if isinstance(x_formats, str):
+                    x_formats = [x_formats] * n
+                if isinstance(y_formats, str):
+                    y_formats = [y_formats] * n
+                trial_format = ''.join([row_prefix + xf + ',' + yf + '\n' for xf, yf in zip(x_formats, y_formats)])
+
+            self._fh.write(trial_format % tuple(values.ravel().tolist()))
+
+        if self._index_fh is not None:
+            #-- tell() rather than len(): in text mode, the newlines written may be longer than '\n'
+            end_offset = self._fh.tell()
+            self._index_fh.write('%d,%d,%d,%d\n' % (trial_num, self._offset, end_offset - self._offset, n))
+            self._offset = end_offset
+
+        return n
+
+
+    #----------------------------------------------------
+    def flush(self):
+        """ Make sure all trials written so far are in the file """
+        if self._fh is not None:
+            self._fh.flush()
+        if self._index_fh is not None:
+            self._index_fh.flush()
+
+
+    #----------------------------------------------------
+    def close(self):
+        """ Close the file. Nothing more can be written after this call. """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self._index_fh is not None:
+            self._index_fh.close()
+            self._index_fh = None
+
+
+#----------------------------------------------------
+# The format of a column's coordinates: a single format if all of them are integers or all of them aren't;
+# otherwise, a list with one format per coordinate
+#
+def _coord_formats(is_int, xy_format):
+    is_int = np.asarray(is_int, dtype=bool)
+    if is_int.ndim == 0 or is_int.all():
+        return '%d' if is_int.all() else xy_format
+    if not is_int.any():
+        return xy_format
+    return ['%d' if i else xy_format for i in is_int.tolist()]
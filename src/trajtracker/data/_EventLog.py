@@ -0,0 +1,378 @@
+"""
+
+Structured event log: fixed-size event records, buffered in memory and written to a binary file in a background thread
+
+File format (all numbers are little-endian):
+
+- File header (16 bytes): the magic string "TTRKELOG", format version (uint16), record size (uint16), 4 unused bytes
+- A sequence of blocks. Each block starts with an 8-byte header: block type (uint8), and 7 type-specific bytes.
+
+  - Records block: type=1, 3 unused bytes, number of records N (uint32); followed by N records.
+    Each record (48 bytes) is: timestamp (float64), object ID (uint32), event code (uint16), 2 unused bytes,
+    4 values (float64)
+  - Name block: type=2, name kind (uint8: 1=object, 2=event), name length L (uint16), ID (uint32);
+    followed by the name (L bytes, utf-8)
+
+A name block always precedes the records that refer to its ID.
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import numbers
+import struct
+import threading
+import timeit
+
+import numpy as np
+
+import trajtracker
+import trajtracker._utils as _u
+
+
+_magic = b'TTRKELOG'
+_version = 1
+_file_header = struct.Struct('<8sHH4x')
+_block_header = struct.Struct('<B3xI')
+_name_header = struct.Struct('<BBHI')
+_record = struct.Struct('<dIH2xdddd')
+
+_block_records = 1
+_block_name = 2
+_name_object = 1
+_name_event = 2
+
+_record_type = np.dtype([('time', '<f8'), ('object_id', '<u4'), ('event', '<u2'), ('_unused', 'V2'),
+                         ('value1', '<f8'), ('value2', '<f8'), ('value3', '<f8'), ('value4', '<f8')])
+
+
+#===========================================================================================
+class EventLog(object):
+    """
+    A structured log of events (e.g., tracked samples, validation errors), designed for logging many events per
+    second without delaying the experiment's frames.
+
+    Each event is a fixed-size record: a timestamp, the ID of the object that logged the event, an event code,
+    and up to 4 numeric values. :func:`~trajtracker.data.EventLog.write` packs the record into an in-memory
+    ring buffer, and a background thread writes the buffer to a binary file. If the buffer is full (i.e., the
+    background thread does not keep up), new records are dropped - write() never blocks. The number of dropped
+    records is written to the file too (as a "dropped" event).
+
+    To log the events of trajtracker objects, assign the log to their :attr:`event_log` property.
+    Use :func:`~trajtracker.data.read_event_log` or :func:`~trajtracker.data.event_log_to_csv` to read the file.
+
+    Make sure to call :func:`~trajtracker.data.EventLog.close` when the session ends, otherwise the last
+    records would be lost.
+    """
+
+    #-- Event codes of trajtracker objects. Codes from ev_user and on can be used for other events
+    #-- (see define_event())
+    ev_dropped = 0              # value1 = the number of records dropped because the buffer was full
+    ev_reset = 1
+    ev_track_xyt = 2            # values: x, y, time
+    ev_check_xyt = 3            # values: x, y, time
+    ev_validation_failed = 4
+    ev_user = 1000
+
+    _event_names = {ev_dropped: "dropped", ev_reset: "reset", ev_track_xyt: "track_xyt",
+                    ev_check_xyt: "check_xyt", ev_validation_failed: "validation_failed"}
+
+    default_capacity = 65536
+    default_flush_interval = 0.2
+
+
+    #----------------------------------------------------
+    def __init__(self, filename, capacity=default_capacity, flush_interval=default_flush_interval,
+                 clock=timeit.default_timer, open_file=open):
+        """
+        Constructor - create the file, write the file header and start the background thread
+
+        :param filename: Full path
+        :param capacity: The number of records in the ring buffer
+        :param flush_interval: How often (in seconds) the background thread writes the buffer to the file.
+                               The buffer is also written when it is half full.
+        :param clock: The function that returns the timestamp of each record (in seconds)
+        :param open_file: A function for opening a file, with the same signature as open()
+        """
+        _u.validate_func_arg_type(self, "__init__", "capacity", capacity, int)
+        _u.validate_func_arg_positive(self, "__init__", "capacity", capacity)
+        _u.validate_func_arg_type(self, "__init__", "flush_interval", flush_interval, numbers.Number)
+        _u.validate_func_arg_positive(self, "__init__", "flush_interval", flush_interval)
+
+        self._filename = filename
+        self._capacity = capacity
+        self._half_capacity = capacity // 2
+        self._flush_interval = flush_interval
+        self._clock = clock
+
+        self._buffer = bytearray(capacity * _record.size)
+        self._n_written = 0     # Records written to the buffer (ever)
+        self._n_flushed = 0     # Records written to the file (ever)
+        self._n_dropped = 0
+        self._n_dropped_reported = 0
+
+        #-- (kind, id, name) of all names; the names from _n_names_flushed on were not written to the file yet
+        self._names = [(_name_event, code, name) for code, name in sorted(self._event_names.items())]
+        self._n_names_flushed = 0
+        self._n_objects = 0
+
+        self._fh = open_file(filename, 'wb')
+        self._fh.write(_file_header.pack(_magic, _version, _record.size))
+
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._error = None
+
+        self._thread = threading.Thread(target=self._flush_periodically, name="EventLog")
+        self._thread.daemon = True
+        self._thread.start()
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The file's full path """
+        return self._filename
+
+    @property
+    def capacity(self):
+        """ The number of records in the ring buffer """
+        return self._capacity
+
+    @property
+    def n_records(self):
+        """ The number of records written so far (not including dropped records) """
+        return self._n_written
+
+    @property
+    def n_dropped(self):
+        """ The number of records dropped so far because the buffer was full """
+        return self._n_dropped
+
+
+    #----------------------------------------------------
+    def register_object(self, obj, name=None):
+        """
+        Get an ID for an object that writes events to this log. The object's name is saved in the file.
+
+        :param obj: The object
+        :param name: The object's name in the file. Default: the object's class name and its ID (e.g. "TrajectoryTracker#1")
+        :return: The object ID (int)
+        """
+        self._n_objects += 1
+        object_id = self._n_objects
+        if name is None:
+            name = "{:}#{:}".format(type(obj).__name__, object_id)
+        self._names.append((_name_object, object_id, name))
+        return object_id
+
+
+    #----------------------------------------------------
+    def define_event(self, event, name):
+        """
+        Define the name of an event code (the name is saved in the file)
+
+        :param event: The event code (int, ev_user - 65535)
+        :param name: The event name
+        """
+        _u.validate_func_arg_type(self, "define_event", "event", event, int)
+        if not self.ev_user <= event <= 65535:
+            raise ValueError("trajtracker error: invalid event code for {:}.define_event() ({:}) - expecting {:}-65535".format(
+                type(self).__name__, event, self.ev_user))
+        self._names.append((_name_event, event, name))
+
+
+    #----------------------------------------------------
+    def write(self, object_id, event, value1=0, value2=0, value3=0, value4=0):
+        """
+        Write an event record. This method only copies the record to the memory buffer; it does not validate
+        its arguments and never blocks.
+
+        :param object_id: The ID of the object that logged the event (see :func:`~trajtracker.data.EventLog.register_object`)
+        :param event: The event code
+        :param value1: An event-specific numeric value
+        :param value2: An event-specific numeric value
+        :param value3: An event-specific numeric value
+        :param value4: An event-specific numeric value
+        """
+        n = self._n_written
+        n_pending = n - self._n_flushed
+        if n_pending >= self._capacity:
+            self._n_dropped += 1
+            return
+
+        _record.pack_into(self._buffer, (n % self._capacity) * _record.size, self._clock(), object_id, event,
+                          value1, value2, value3, value4)
+        self._n_written = n + 1
+
+        if n_pending == self._half_capacity:
+            self._wakeup.set()
+
+
+    #----------------------------------------------------
+    def flush(self):
+        """ Write all buffered records to the file """
+        self._raise_pending_error("flush")
+        with self._flush_lock:
+            self._flush_buffer()
+            self._fh.flush()
+
+
+    #----------------------------------------------------
+    def close(self):
+        """ Write all buffered records, stop the background thread and close the file """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+
+        if self._error is None:
+            try:
+                self._flush_buffer()
+            except Exception as e:
+                self._error = e
+
+        self._fh.close()
+
+        if self._error is not None:
+            raise self._error
+
+
+    #----------------------------------------------------
+    def _raise_pending_error(self, method_name):
+
+        if self._error is not None:
+            raise self._error
+
+        if self._closed:
+            raise trajtracker.InvalidStateError("{:}.{:}() was called after the log was closed".format(type(self).__name__, method_name))
+
+
+    #----------------------------------------------------
+    # The background thread
+    #
+    def _flush_periodically(self):
+
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                with self._flush_lock:
+                    self._flush_buffer()
+            except Exception as e:
+                self._error = e
+                return
+
+
+    #----------------------------------------------------
+    # Write the names and records that were not written yet.
+    # The records are copied from the buffer before they are marked as flushed, so write() never overwrites them.
+    #
+    def _flush_buffer(self):
+
+        #-- Get the records first: a record's object/event name was added before the record
+        end = self._n_written
+        start = self._n_flushed
+        n_dropped = self._n_dropped
+
+        n_names = len(self._names)
+        for kind, name_id, name in self._names[self._n_names_flushed:n_names]:
+            name = name.encode('utf-8')
+            self._fh.write(_name_header.pack(_block_name, kind, len(name), name_id) + name)
+        self._n_names_flushed = n_names
+
+        if end > start:
+            first = (start % self._capacity) * _record.size
+            last = (end % self._capacity) * _record.size
+            if last > first:
+                data = self._buffer[first:last]
+            else:
+                data = self._buffer[first:] + self._buffer[:last]
+            self._fh.write(_block_header.pack(_block_records, end - start))
+            self._fh.write(data)
+            self._n_flushed = end
+
+        if n_dropped > self._n_dropped_reported:
+            self._fh.write(_block_header.pack(_block_records, 1))
+            self._fh.write(_record.pack(self._clock(), 0, self.ev_dropped, n_dropped - self._n_dropped_reported, 0, 0, 0))
+            self._n_dropped_reported = n_dropped
+
+
+#--------------------------------------------------------------------------
+def read_event_log(filename):
+    """
+    Read a file created by :class:`~trajtracker.data.EventLog`
+
+    :param filename: The file's full path
+    :return: (records, object_names, event_names). records is a numpy structured array with the fields
+             time, object_id, event, value1, value2, value3, value4; object_names and event_names are dicts
+             (ID -> name)
+    """
+    with open(filename, 'rb') as fh:
+        data = fh.read()
+
+    if len(data) < _file_header.size:
+        raise trajtracker.BadFormatError("{:} is not an event log file (it is too short)".format(filename))
+    magic, version, record_size = _file_header.unpack_from(data)
+    if magic != _magic:
+        raise trajtracker.BadFormatError("{:} is not an event log file".format(filename))
+    if version != _version or record_size != _record.size:
+        raise trajtracker.BadFormatError("{:} has an unsupported format version ({:})".format(filename, version))
+
+    names = {_name_object: {}, _name_event: {}}
+    chunks = []
+
+    offset = _file_header.size
+    while offset < len(data):
+        if offset + _block_header.size > len(data):
+            raise trajtracker.BadFormatError("{:}: the last block in the file is incomplete".format(filename))
+
+        block_type = ord(data[offset])
+        if block_type == _block_records:
+            n = _block_header.unpack_from(data, offset)[1]
+            offset += _block_header.size
+            if offset + n * _record.size > len(data):
+                raise trajtracker.BadFormatError("{:}: the last block in the file is incomplete".format(filename))
+            chunks.append(np.frombuffer(data, dtype=_record_type, count=n, offset=offset))
+            offset += n * _record.size
+
+        elif block_type == _block_name:
+            block_type, kind, length, name_id = _name_header.unpack_from(data, offset)
+            offset += _name_header.size
+            if kind not in names or offset + length > len(data):
+                raise trajtracker.BadFormatError("{:}: invalid name block at offset {:}".format(filename, offset - _name_header.size))
+            names[kind][name_id] = data[offset:offset + length].decode('utf-8')
+            offset += length
+
+        else:
+            raise trajtracker.BadFormatError("{:}: invalid block type ({:}) at offset {:}".format(filename, block_type, offset))
+
+    records = np.concatenate(chunks) if len(chunks) > 0 else np.zeros(0, dtype=_record_type)
+    return records, names[_name_object], names[_name_event]
+
+
+#--------------------------------------------------------------------------
+def event_log_to_csv(filename, csv_filename):
+    """
+    Convert a file created by :class:`~trajtracker.data.EventLog` to a CSV file, with the columns
+    time, object_id, object, event, value1, value2, value3, value4 (object and event are names)
+
+    :param filename: The event log file's full path
+    :param csv_filename: The CSV file to create
+    :return: The number of records
+    """
+    records, object_names, event_names = read_event_log(filename)
+
+    with open(csv_filename, 'w') as fh:
+        fh.write("time,object_id,object,event,value1,value2,value3,value4\n")
+        for rec in records:
+            object_id = int(rec['object_id'])
+            event = int(rec['event'])
+            fh.write("{:.6f},{:},{:},{:},{:},{:},{:},{:}\n".format(
+                rec['time'], object_id, object_names.get(object_id, ""), event_names.get(event, event),
+                rec['value1'], rec['value2'], rec['value3'], rec['value4']))
+
+    return len(records)
@@ -0,0 +1,205 @@
+"""
+
+Trajectory journal: keep the trajectory of the current trial in a memory-mapped file, so it can be
+recovered if the experiment process crashes
+
+File format (all numbers are little-endian):
+
+- Header (32 bytes): the magic string "TTRKJRN2", trial sequence number (int64), number of valid samples N (int64),
+  reserved (int64)
+- Samples: x, y, time (float64) and flags (int64; bit 0 = x is an integer, bit 1 = y is an integer).
+  Only the first N samples are valid. The file is preallocated, so it is typically longer than N samples.
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import os
+
+import numpy as np
+
+import trajtracker
+
+
+_magic = np.frombuffer(b'TTRKJRN2', dtype=np.uint8)
+_header_size = 32
+_sample_type = np.dtype([('x', '<f8'), ('y', '<f8'), ('time', '<f8'), ('flags', '<i8')])
+_sample_size = _sample_type.itemsize
+
+_hdr_trial_seq = 0
+_hdr_n_samples = 1
+
+_flag_x_int = 1
+_flag_y_int = 2
+
+
+class TrajectoryJournal(object):
+    """
+    A preallocated, memory-mapped file that holds the trajectory of the current trial.
+
+    Samples are copied to the journal in chunks (see :func:`~trajtracker.data.TrajectoryJournal.write_samples`).
+    Writing to a memory-mapped file does not involve any system call: the data goes to the operating system's
+    page cache, and is written to disk by the operating system even if the process crashes.
+    (It does not survive a crash of the operating system itself.)
+
+    After a crash, use :func:`~trajtracker.data.TrajectoryJournal.recover` to read the journal.
+    """
+
+    default_capacity = 16384
+
+
+    #----------------------------------------------------
+    def __init__(self, filename, capacity=default_capacity, overwrite=False):
+        """
+        Constructor - create the journal file
+
+        :param filename: Full path
+        :param capacity: The number of samples initially allocated in the file. The file grows if needed.
+        :param overwrite: Whether to overwrite an existing file that contains data. If False (default), an
+                          existing file can be overwritten only if it is a journal with no samples - so that
+                          a journal left by a crashed session is not lost before it is recovered.
+        """
+        if not overwrite and os.path.exists(filename) and os.path.getsize(filename) > 0:
+            try:
+                n_existing = len(TrajectoryJournal.recover(filename)['time'])
+            except trajtracker.BadFormatError:
+                raise trajtracker.InvalidStateError("{:}: {:} exists and is not a trajectory journal; use overwrite=True to overwrite it".format(type(self).__name__, filename))
+            if n_existing > 0:
+                raise trajtracker.InvalidStateError("{:}: {:} contains a journal with {:} samples; recover it first, or use overwrite=True to overwrite it".format(type(self).__name__, filename, n_existing))
+
+        self._filename = filename
+        self._trial_seq = 0
+        self._data = None
+
+        with open(filename, 'wb') as fh:
+            fh.truncate(_header_size + capacity * _sample_size)
+
+        self._map_file()
+        self._mmap[:len(_magic)] = _magic
+        self.clear()
+
+
+    #----------------------------------------------------
+    def _map_file(self):
+        self._mmap = np.memmap(self._filename, dtype=np.uint8, mode='r+')
+        self._header = self._mmap[len(_magic):_header_size].view('<i8')
+        self._data = self._mmap[_header_size:].view(_sample_type)
+
+
+    #----------------------------------------------------
+    def _grow(self, min_capacity):
+        capacity = max(min_capacity, 2 * len(self._data))
+
+        self._mmap.flush()
+        self._mmap = self._header = self._data = None
+
+        with open(self._filename, 'r+b') as fh:
+            fh.truncate(_header_size + capacity * _sample_size)
+
+        self._map_file()
+
+
+    #----------------------------------------------------
+    @property
+    def filename(self):
+        """ The journal file's full path """
+        return self._filename
+
+    #----------------------------------------------------
+    @property
+    def n_samples(self):
+        """ The number of samples currently in the journal """
+        return int(self._header[_hdr_n_samples])
+
+
+    #----------------------------------------------------
+    def clear(self):
+        """
+        Start a new trial: forget the samples of the previous trial
+        """
+        if self._data is None:
+            raise trajtracker.InvalidStateError("{:}.clear() was called after the journal was closed".format(type(self).__name__))
+
+        self._trial_seq += 1
+        self._header[_hdr_n_samples] = 0
+        self._header[_hdr_trial_seq] = self._trial_seq
+
+
+    #----------------------------------------------------
+    def write_samples(self, x, y, time, x_is_int=False, y_is_int=False):
+        """
+        Append samples of the current trial to the journal.
+
+        The samples are copied first, and the number of samples in the file header is updated only afterwards,
+        so a crash in the middle of this call loses only the samples of this call.
+
+        :param x: Array of x coordinates
+        :param y: Array of y coordinates
+        :param time: Array of time points
+        :param x_is_int: Whether the x coordinates are integers: bool, or an array of bool (one per coordinate)
+        :param y_is_int: Whether the y coordinates are integers: bool, or an array of bool
+        """
+        if self._data is None:
+            raise trajtracker.InvalidStateError("{:}.write_samples() was called after the journal was closed".format(type(self).__name__))
+
+        start = int(self._header[_hdr_n_samples])
+        end = start + len(time)
+        if end > len(self._data):
+            self._grow(end)
+
+        samples = self._data[start:end]
+        samples['x'] = x
+        samples['y'] = y
+        samples['time'] = time
+        samples['flags'] = np.where(x_is_int, _flag_x_int, 0) | np.where(y_is_int, _flag_y_int, 0)
+
+        self._header[_hdr_n_samples] = end
+
+
+    #----------------------------------------------------
+    def close(self):
+        """
+        Close the journal. The file is not deleted.
+        """
+        if self._data is None:
+            return
+
+        self._mmap.flush()
+        self._mmap = self._header = self._data = None
+
+
+    #----------------------------------------------------
+    @staticmethod
+    def recover(filename):
+        """
+        Read the samples from a journal file (e.g. after a crash)
+
+        :param filename: The journal file's full path
+        :return: A dict with the entries 'x', 'y', 'time' (numpy arrays), 'x_is_int', 'y_is_int' (numpy arrays of
+                 bool: whether each coordinate is an integer), and 'trial_seq' (the number of trials started since
+                 the journal was created)
+        """
+        if os.path.getsize(filename) < _header_size:
+            raise trajtracker.BadFormatError("{:} is not a trajectory journal file (it is too short)".format(filename))
+
+        mmap = np.memmap(filename, dtype=np.uint8, mode='r')
+        if not np.array_equal(mmap[:len(_magic)], _magic):
+            raise trajtracker.BadFormatError("{:} is not a trajectory journal file".format(filename))
+
+        header = mmap[len(_magic):_header_size].view('<i8')
+        capacity = (len(mmap) - _header_size) // _sample_size
+        data = mmap[_header_size:_header_size + capacity * _sample_size].view(_sample_type)
+
+        n = int(header[_hdr_n_samples])
+        if not 0 <= n <= len(data):
+            raise trajtracker.BadFormatError("{:}: invalid number of samples ({:})".format(filename, n))
+
+        samples = data[:n]
+        flags = np.array(samples['flags'])
+
+        return dict(x=np.array(samples['x']),
+                    y=np.array(samples['y']),
+                    time=np.array(samples['time']),
+                    x_is_int=(flags & _flag_x_int) != 0,
+                    y_is_int=(flags & _flag_y_int) != 0,
+                    trial_seq=int(header[_hdr_trial_seq]))
@@ -0,0 +1,117 @@
+"""
+
+A set of trajectories, stored as concatenated columns
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import numpy as np
+
+
+class TrajectorySet(object):
+    """
+    The trajectories of several trials, stored compactly: the samples of all trials are concatenated into
+    3 columns (x, y, time), and the trials are defined by their offsets in these columns.
+
+    The samples of trial #i (i = 0..n_trials-1) are x[offsets[i]:offsets[i+1]] (and the same for y and time).
+    """
+
+    #----------------------------------------------------
+    def __init__(self, trial_nums, offsets, x, y, time, session_ids=None):
+        """
+        Constructor
+
+        :param trial_nums: The trial number of each trial (array of n_trials)
+        :param offsets: The offset of each trial's first sample in the columns (array of n_trials + 1;
+                        the last entry is the total number of samples)
+        :param x: Array of x coordinates
+        :param y: Array of y coordinates
+        :param time: Array of time points
+        :param session_ids: The session of each trial (array of n_trials; optional)
+        """
+        self._trial_nums = np.asarray(trial_nums)
+        self._offsets = np.asarray(offsets)
+        self._x = np.asarray(x)
+        self._y = np.asarray(y)
+        self._time = np.asarray(time)
+        self._session_ids = None if session_ids is None else np.asarray(session_ids)
+
+        if len(self._offsets) != len(self._trial_nums) + 1:
+            raise ValueError("trajtracker error: {:} expects one offset per trial, plus one".format(type(self).__name__))
+        if not (len(self._x) == len(self._y) == len(self._time) == self._offsets[-1]):
+            raise ValueError("trajtracker error: {:} columns must have the same length, and match the offsets".format(type(self).__name__))
+        if self._session_ids is not None and len(self._session_ids) != len(self._trial_nums):
+            raise ValueError("trajtracker error: {:} expects one session ID per trial".format(type(self).__name__))
+
+
+    #----------------------------------------------------
+    @property
+    def trial_nums(self):
+        """ The trial number of each trial """
+        return self._trial_nums
+
+    @property
+    def session_ids(self):
+        """ The session of each trial (None if the trajectories were loaded from a single session) """
+        return self._session_ids
+
+    @property
+    def offsets(self):
+        """ Per trial, the offset of its first sample in the columns. The last entry is the number of samples. """
+        return self._offsets
+
+    @property
+    def x(self):
+        """ The x coordinates of all trials """
+        return self._x
+
+    @property
+    def y(self):
+        """ The y coordinates of all trials """
+        return self._y
+
+    @property
+    def time(self):
+        """ The time points of all trials """
+        return self._time
+
+    @property
+    def n_trials(self):
+        """ The number of trials """
+        return len(self._trial_nums)
+
+    @property
+    def n_samples(self):
+        """ The total number of samples in all trials """
+        return len(self._time)
+
+    def __len__(self):
+        return len(self._trial_nums)
+
+
+    #----------------------------------------------------
+    def get_trial(self, index):
+        """
+        Get the trajectory of one trial
+
+        :param index: The trial's index in this set (0..n_trials-1) - not the trial number
+        :return: 3 numpy arrays (views, not copies): x, y, time
+        """
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        return self._x[start:end], self._y[start:end], self._time[start:end]
+
+
+    #----------------------------------------------------
+    def sample_trial_nums(self):
+        """ Get an array with the trial number of each sample """
+        return np.repeat(self._trial_nums, np.diff(self._offsets))
+
+
+    #----------------------------------------------------
+    def sample_session_ids(self):
+        """ Get an array with the session ID of each sample (None if there are no session IDs) """
+        if self._session_ids is None:
+            return None
+        return np.repeat(self._session_ids, np.diff(self._offsets))
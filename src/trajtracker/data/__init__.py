@@ -0,0 +1,18 @@
+"""
+
+TrajTracker - data package: writing and reading trajectory files
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+
+"""
+
+#  Import the package classes
+from _CsvTrajectoryWriter import CsvTrajectoryWriter
+from _BinaryTrajectoryFile import BinaryTrajectoryWriter, BinaryTrajectoryReader
+from _CompressedTrajectoryFile import CompressedTrajectoryWriter, CompressedTrajectoryReader
+from _AsyncTrajectoryWriter import AsyncTrajectoryWriter
+from _EventLog import EventLog, read_event_log, event_log_to_csv
+from _TrajectoryJournal import TrajectoryJournal
+from _TrajectorySet import TrajectorySet
+from _csv_loaders import load_csv, load_sessions, load_trials
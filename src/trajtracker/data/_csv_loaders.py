@@ -0,0 +1,230 @@
+"""
+
+Load trajectory CSV files (as written by TrajectoryTracker / CsvTrajectoryWriter)
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+from collections import OrderedDict
+import glob
+import multiprocessing
+import os
+
+import numpy as np
+
+import trajtracker
+from trajtracker.data import CsvTrajectoryWriter, TrajectorySet
+
+
+#-- load_csv() parses the file in chunks of this number of bytes (rounded up to whole rows)
+_parse_chunk_size = 4 * 1024 * 1024
+
+
+#--------------------------------------------------------------------------
+def load_csv(filename):
+    """
+    Load all trials from a trajectory CSV file (as created by :class:`~trajtracker.movement.TrajectoryTracker`).
+
+    The file is parsed by numpy in chunks of a few MB, with no per-row Python code; only one chunk of the file's
+    text is in memory at any time.
+
+    :param filename: The CSV file's full path
+    :return: :class:`~trajtracker.data.TrajectorySet`. Consecutive rows with the same trial number are one trial.
+    """
+
+    columns = None
+    n_rows = 0
+
+    with open(filename, 'rb') as fh:
+        header = fh.readline()
+        if header.rstrip('\r\n') != CsvTrajectoryWriter.header.rstrip('\n'):
+            raise trajtracker.BadFormatError("{:} is not a trajectory file: invalid header line".format(filename))
+
+        n_bytes = os.fstat(fh.fileno()).st_size - fh.tell()
+
+        while True:
+            text = fh.read(_parse_chunk_size)
+            if len(text) == 0:
+                break
+            if not text.endswith('\n'):
+                text += fh.readline()
+
+            n_chunk_rows = text.count('\n')
+            if not text.endswith('\n'):
+                n_chunk_rows += 1
+            n_chunk_bytes = len(text)
+            values = _parse_csv_rows(text, n_chunk_rows, filename)
+            del text
+
+            #-- Allocate the columns by the number of rows estimated from the first chunk; grow them if needed
+            if columns is None:
+                capacity = max(int(n_bytes * n_chunk_rows / n_chunk_bytes * 1.1), n_chunk_rows)
+                columns = [np.empty(capacity) for i in range(4)]
+            elif n_rows + n_chunk_rows > len(columns[0]):
+                capacity = max(n_rows + n_chunk_rows, len(columns[0]) * 3 // 2)
+                for i in range(4):
+                    columns[i] = _resized(columns[i], n_rows, capacity)
+
+            for i, column in enumerate(columns):
+                column[n_rows:n_rows + n_chunk_rows] = values[:, i]
+            n_rows += n_chunk_rows
+
+    if columns is None:
+        columns = [np.empty(0) for i in range(4)]
+
+    #-- Release the unused capacity, one column at a time
+    for i in range(4):
+        columns[i] = _resized(columns[i], n_rows, n_rows)
+    trial, time, x, y = columns
+
+    trial_starts = np.flatnonzero(trial[1:] != trial[:-1]) + 1
+    offsets = np.concatenate(([0], trial_starts, [n_rows])) if n_rows > 0 else np.array([0])
+
+    return TrajectorySet(trial_nums=trial[offsets[:-1]].astype(int),
+                         offsets=offsets,
+                         x=x, y=y, time=time)
+
+
+#--------------------------------------------------------------------------
+# A copy of the first n values of an array, with the given capacity (the array itself if it already has it)
+#
+def _resized(values, n, capacity):
+    if len(values) == capacity:
+        return values
+    result = np.empty(capacity, dtype=values.dtype)
+    result[:n] = values[:n]
+    return result
+
+
+#--------------------------------------------------------------------------
+def load_sessions(path, n_workers=None, chunk_size=1):
+    """
+    Load all trials from several trajectory CSV files (e.g., one file per participant).
+    The files are parsed in parallel by worker processes (see :func:`~trajtracker.data.load_csv`).
+
+    :param path: A directory (all \*.csv files in it are loaded) or a glob pattern (e.g., "/data/study1/\*_traj.csv")
+    :param n_workers: The number of worker processes. None = the number of CPUs; 1 = load in the current process.
+    :param chunk_size: The number of files sent to a worker process at once
+    :return: :class:`~trajtracker.data.TrajectorySet`. Each trial's session ID is the name of its file (without
+             the directory and the extension). The sessions are ordered by file name, regardless of the
+             number of workers.
+    """
+
+    if n_workers is not None and n_workers < 1:
+        raise ValueError("trajtracker error: invalid n_workers ({:})".format(n_workers))
+    if chunk_size < 1:
+        raise ValueError("trajtracker error: invalid chunk_size ({:})".format(chunk_size))
+
+    if os.path.isdir(path):
+        path = os.path.join(path, "*.csv")
+    filenames = sorted(glob.glob(path))
+
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    n_workers = min(n_workers, len(filenames))
+
+    if n_workers <= 1:
+        sessions = [load_csv(filename) for filename in filenames]
+    else:
+        pool = multiprocessing.Pool(n_workers)
+        try:
+            sessions = pool.map(load_csv, filenames, chunk_size)
+        finally:
+            pool.close()
+            pool.join()
+
+    return _concat_sessions(sessions, [os.path.splitext(os.path.basename(f))[0] for f in filenames])
+
+
+#--------------------------------------------------------------------------
+# Concatenate several TrajectorySet objects (one per session) into one
+#
+def _concat_sessions(sessions, session_ids):
+
+    if len(sessions) == 0:
+        return TrajectorySet([], [0], [], [], [], session_ids=[])
+
+    offsets = [np.array([0])]
+    total = 0
+    for session in sessions:
+        offsets.append(session.offsets[1:] + total)
+        total += session.n_samples
+
+    return TrajectorySet(trial_nums=np.concatenate([s.trial_nums for s in sessions]),
+                         offsets=np.concatenate(offsets),
+                         x=np.concatenate([s.x for s in sessions]),
+                         y=np.concatenate([s.y for s in sessions]),
+                         time=np.concatenate([s.time for s in sessions]),
+                         session_ids=np.repeat(session_ids, [s.n_trials for s in sessions]))
+
+
+#--------------------------------------------------------------------------
+def load_trials(filename, trials=None):
+    """
+    Load specific trials from a trajectory CSV file, using the file's index (see
+    :class:`~trajtracker.data.CsvTrajectoryWriter`). Only the requested trials are read from the file.
+
+    :param filename: The CSV file's full path. The index file must exist too.
+    :param trials: A list of trial numbers. None = all trials in the file.
+    :return: An OrderedDict with one entry per trial: trial number -> (x, y, time) numpy arrays
+    """
+
+    index = _read_index(filename)
+
+    if trials is None:
+        trials = index.keys()
+
+    result = OrderedDict()
+
+    with open(filename, 'rb') as fh:
+        for trial_num in trials:
+            if trial_num not in index:
+                raise ValueError("trajtracker error: trial #{:} does not exist in {:}".format(trial_num, filename))
+
+            offset, n_bytes, n_rows = index[trial_num]
+            fh.seek(offset)
+            values = _parse_csv_rows(fh.read(n_bytes), n_rows, filename)
+            result[trial_num] = values[:, 2], values[:, 3], values[:, 1]
+
+    return result
+
+
+#--------------------------------------------------------------------------
+# Read the index file of the given CSV file.
+# Returns an OrderedDict: trial number -> (offset, n_bytes, n_rows)
+#
+def _read_index(filename):
+
+    index_filename = filename + CsvTrajectoryWriter.index_file_suffix
+    if not os.path.exists(index_filename):
+        raise ValueError("trajtracker error: the index file of {:} ({:}) does not exist".format(filename, index_filename))
+
+    index = OrderedDict()
+
+    with open(index_filename, 'r') as fh:
+        header = fh.readline()
+        if header != CsvTrajectoryWriter.index_header:
+            raise trajtracker.BadFormatError("{:} is not a valid trajectory index file".format(index_filename))
+
+        for line_num, line in enumerate(fh, 2):
+            try:
+                trial_num, offset, n_bytes, n_rows = [int(v) for v in line.split(",")]
+            except ValueError:
+                raise trajtracker.BadFormatError("{:}, line {:}: invalid format".format(index_filename, line_num))
+
+            index[trial_num] = offset, n_bytes, n_rows
+
+    return index
+
+
+#--------------------------------------------------------------------------
+# Parse CSV rows with 4 numeric columns (trial,time,x,y) into an n_rows*4 array
+#
+def _parse_csv_rows(text, n_rows, filename):
+
+    values = np.fromstring(text.replace('\r', '').replace('\n', ','), sep=',')
+    if len(values) != n_rows * 4:
+        raise trajtracker.BadFormatError("{:} contains invalid data (or does not match its index file)".format(filename))
+
+    return values.reshape((n_rows, 4))
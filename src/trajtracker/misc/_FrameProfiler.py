@@ -0,0 +1,385 @@
+"""
+
+Frame profiler: attribute the time of each frame to the trajtracker objects called during the frame, and report
+frames that exceeded the frame budget
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+from __future__ import division
+
+from collections import OrderedDict
+import functools
+import numbers
+import timeit
+
+import trajtracker
+import trajtracker._utils as _u
+from trajtracker.misc._method_wrappers import select_methods, wrap_methods, unwrap_methods
+
+
+#============================================================================================
+class FrameReport(object):
+    """
+    The frames of one trial, as measured by a :class:`~trajtracker.misc.FrameProfiler`.
+
+    All times are in seconds. "Component time" is the time spent in the watched methods of one object, not including
+    the time spent in other watched objects that it called. The time not spent in any watched object is attributed to
+    the "other" component.
+    """
+
+    #----------------------------------------------------
+    def __init__(self, trial_num, budget):
+        self._trial_num = trial_num
+        self._budget = budget
+        self._n_frames = 0
+        self._n_dropped = 0
+        self._total_time = 0
+        self._max_frame_time = 0
+        self._component_times = OrderedDict()
+        self._late_frames = []
+
+
+    #----------------------------------------------------
+    def _add_frame(self, frame_index, start_time, duration, component_times, n_dropped):
+
+        self._n_frames += 1
+        self._n_dropped += n_dropped
+        self._total_time += duration
+        self._max_frame_time = max(self._max_frame_time, duration)
+
+        for name, t in component_times.items():
+            self._component_times[name] = self._component_times.get(name, 0) + t
+
+        if duration > self._budget:
+            self._late_frames.append((frame_index, start_time, duration, component_times))
+
+
+    #----------------------------------------------------
+    @property
+    def trial_num(self):
+        return self._trial_num
+
+    @property
+    def budget(self):
+        """ The frame budget (the maximal valid duration of a frame) """
+        return self._budget
+
+    @property
+    def n_frames(self):
+        """ The number of frames in the trial """
+        return self._n_frames
+
+    @property
+    def n_late(self):
+        """ The number of frames whose duration exceeded the budget """
+        return len(self._late_frames)
+
+    @property
+    def n_dropped(self):
+        """
+        The estimated number of dropped frames: per interval between the start times of two consecutive frames,
+        the number of whole budget periods in the interval beyond the first one (rounded)
+        """
+        return self._n_dropped
+
+    @property
+    def mean_frame_time(self):
+        """ The mean duration of a frame (None if there were no frames) """
+        return self._total_time / self._n_frames if self._n_frames > 0 else None
+
+    @property
+    def max_frame_time(self):
+        """ The duration of the longest frame (None if there were no frames) """
+        return self._max_frame_time if self._n_frames > 0 else None
+
+    @property
+    def component_times(self):
+        """ The total time of each component in all frames of the trial (an OrderedDict: component name -> time) """
+        return OrderedDict(self._component_times)
+
+    @property
+    def late_frames(self):
+        """
+        The frames that exceeded the budget: a list of (frame_index, start_time, duration, component_times) tuples,
+        where frame_index is the frame's serial number in the trial (0 = the first frame) and component_times is
+        an OrderedDict (component name -> time in this frame)
+        """
+        return list(self._late_frames)
+
+
+    #----------------------------------------------------
+    def summary(self):
+        """
+        Get a human-readable report of the trial's frames: overall statistics, the time per component, and
+        the late frames (with the component that took the longest time in each of them)
+
+        :return: str
+        """
+        lines = ["Trial {:}: {:} frames, {:} late, {:} dropped (budget = {:.1f} ms)".format(
+            self._trial_num, self._n_frames, self.n_late, self._n_dropped, self._budget * 1000)]
+
+        if self._n_frames > 0:
+            lines.append("  Frame time: mean {:.2f} ms, max {:.2f} ms".format(self.mean_frame_time * 1000, self._max_frame_time * 1000))
+            for name, t in self._component_times.items():
+                lines.append("  {:}: {:.2f} ms per frame".format(name, t / self._n_frames * 1000))
+
+        for frame_index, start_time, duration, component_times in self._late_frames:
+            slowest = max(component_times, key=component_times.get)
+            lines.append("  Late frame #{:} (t={:.3f}): {:.2f} ms, mostly {:} ({:.2f} ms)".format(
+                frame_index, start_time, duration * 1000, slowest, component_times[slowest] * 1000))
+
+        return "\n".join(lines)
+
+
+#============================================================================================
+class FrameProfiler(object):
+    """
+    Find out which trajtracker objects make frames exceed their time budget.
+
+    Watch the objects that are called per frame (validators, stimuli, animators, etc.), and wrap each frame
+    with :func:`~trajtracker.misc.FrameProfiler.frame`. The profiler measures the time of each frame and the time
+    spent in each watched object during the frame, and reports - per trial - the frames that exceeded the budget and
+    the frames that were dropped:
+
+    ::
+
+        profiler = FrameProfiler(budget=1/60)
+        profiler.watch(number_line)
+        profiler.watch(validator)
+        ...
+        profiler.start_trial(trial_num)
+        while trial_running:
+            with profiler.frame():
+                validator.check_xyt(x, y, time)
+                number_line.update_xy(x, y)
+                ...
+        report = profiler.end_trial()
+        print(report.summary())
+
+    Calls to watched objects outside frames are not measured.
+    """
+
+    #-- The methods watched by default (the methods that exist in the object)
+    default_methods = ('update', 'update_xy', 'update_xyt', 'update_sample', 'check_xyt', 'check_sample', 'check_xy',
+                       'present', 'show', 'get_color_at', 'get_traj_point')
+
+    #-- The component to which the frame time outside the watched objects is attributed
+    other_component = "other"
+
+
+    #----------------------------------------------------
+    def __init__(self, budget=1/60, clock=timeit.default_timer):
+        """
+        Constructor
+
+        :param budget: See :attr:`~trajtracker.misc.FrameProfiler.budget`
+        :param clock: The function that returns the current time (in seconds)
+        """
+        self.budget = budget
+        self._clock = clock
+
+        self._watched = {}          # id(object) -> (object, wrapped methods)
+        self._n_objects = 0
+        self._reports = []
+        self._report = None
+
+        self._in_frame = False
+        self._child_times = []      # Per active call to a watched method: the time of its nested watched calls
+        self._frame_component_times = None
+        self._frame_start = None
+        self._prev_frame_start = None
+        self._frame_index = 0
+
+
+    #----------------------------------------------------
+    @property
+    def budget(self):
+        """ The maximal valid duration of a frame (in seconds). Default: 1/60 """
+        return self._budget
+
+    @budget.setter
+    def budget(self, value):
+        _u.validate_attr_type(self, "budget", value, numbers.Number)
+        _u.validate_attr_positive(self, "budget", value)
+        self._budget = value
+
+
+    #----------------------------------------------------
+    @property
+    def reports(self):
+        """ The reports of all trials that ended (list of :class:`~trajtracker.misc.FrameReport`) """
+        return list(self._reports)
+
+
+    #====================================================================================
+    #   Watch objects
+    #====================================================================================
+
+    #----------------------------------------------------
+    def watch(self, obj, methods=None, name=None):
+        """
+        Measure the time spent in methods of the given object during frames
+
+        :param obj: A trajtracker object (e.g. a validator, a stimulus)
+        :param methods: A list of method names. Default: the methods in
+                        :attr:`~trajtracker.misc.FrameProfiler.default_methods` that the object has.
+        :param name: The object's component name in the reports. Default: the class name and a serial number
+                     (e.g. "NumberLine#1")
+        """
+        methods = select_methods(self, "watch", obj, methods, self.default_methods)
+        if id(obj) in self._watched:
+            raise trajtracker.InvalidStateError("{:}.watch() was called for an object that is already watched".format(type(self).__name__))
+
+        self._n_objects += 1
+        if name is None:
+            name = "{:}#{:}".format(type(obj).__name__, self._n_objects)
+
+        self._watched[id(obj)] = obj, wrap_methods(obj, methods, lambda method_name, method: self._timed(method, name))
+
+
+    #----------------------------------------------------
+    def unwatch(self, obj):
+        """
+        Stop measuring the object's methods, and restore the methods to what they were before
+        :func:`~trajtracker.misc.FrameProfiler.watch` was called.
+
+        If the object's methods were wrapped again after they were watched (e.g. by a
+        :class:`~trajtracker.misc.LatencyRegistry`), remove the newer wrappers first.
+        """
+        if id(obj) not in self._watched:
+            raise trajtracker.InvalidStateError("{:}.unwatch() was called for an object that is not watched".format(type(self).__name__))
+
+        obj, wrapped = self._watched[id(obj)]
+        unwrap_methods(self, "unwatch", obj, wrapped)
+        del self._watched[id(obj)]
+
+
+    #----------------------------------------------------
+    # Wrap a method of a watched object.
+    # The method's own time (not including nested watched calls) is attributed to the component
+    #
+    def _timed(self, method, component):
+
+        clock = self._clock
+        child_times = self._child_times
+
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            if not self._in_frame:
+                return method(*args, **kwargs)
+
+            child_times.append(0)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                own_time = duration - child_times.pop()
+                if len(child_times) > 0:
+                    child_times[-1] += duration
+                times = self._frame_component_times
+                times[component] = times.get(component, 0) + own_time
+
+        return timed_method
+
+
+    #====================================================================================
+    #   Trials and frames
+    #====================================================================================
+
+    #----------------------------------------------------
+    def start_trial(self, trial_num=None):
+        """
+        Start measuring a trial's frames
+
+        :param trial_num: The trial number (for the report)
+        """
+        if self._in_frame:
+            raise trajtracker.InvalidStateError("{:}.start_trial() was called during a frame".format(type(self).__name__))
+
+        self._report = FrameReport(trial_num, self._budget)
+        self._prev_frame_start = None
+        self._frame_index = 0
+
+
+    #----------------------------------------------------
+    def end_trial(self):
+        """
+        Stop measuring the trial's frames
+
+        :return: The trial's :class:`~trajtracker.misc.FrameReport` (also added to
+                 :attr:`~trajtracker.misc.FrameProfiler.reports`)
+        """
+        if self._report is None:
+            raise trajtracker.InvalidStateError("{:}.end_trial() was called without start_trial()".format(type(self).__name__))
+        if self._in_frame:
+            raise trajtracker.InvalidStateError("{:}.end_trial() was called during a frame".format(type(self).__name__))
+
+        report = self._report
+        self._reports.append(report)
+        self._report = None
+        return report
+
+
+    #----------------------------------------------------
+    def frame(self):
+        """
+        Get a context manager that wraps one frame:
+
+        ::
+
+            with profiler.frame():
+                ...
+        """
+        return _Frame(self)
+
+
+    #----------------------------------------------------
+    def _start_frame(self):
+
+        if self._report is None:
+            raise trajtracker.InvalidStateError("{:}.frame() was used without start_trial()".format(type(self).__name__))
+        if self._in_frame:
+            raise trajtracker.InvalidStateError("{:}.frame() was used within another frame".format(type(self).__name__))
+
+        self._frame_component_times = OrderedDict()
+        del self._child_times[:]
+        self._in_frame = True
+        self._frame_start = self._clock()
+
+
+    #----------------------------------------------------
+    def _end_frame(self):
+
+        end = self._clock()
+        self._in_frame = False
+
+        duration = end - self._frame_start
+        component_times = self._frame_component_times
+        component_times[self.other_component] = max(0, duration - sum(component_times.values()))
+
+        if self._prev_frame_start is None:
+            n_dropped = 0
+        else:
+            n_dropped = max(0, int(round((self._frame_start - self._prev_frame_start) / self._budget)) - 1)
+
+        self._report._add_frame(self._frame_index, self._frame_start, duration, component_times, n_dropped)
+
+        self._prev_frame_start = self._frame_start
+        self._frame_index += 1
+
+
+#--------------------------------------------------------------------------
+class _Frame(object):
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def __enter__(self):
+        self._profiler._start_frame()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler._end_frame()
@@ -0,0 +1,268 @@
+"""
+
+Latency instrumentation: count the calls to methods of trajtracker objects, and measure their duration
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+from __future__ import division
+
+import bisect
+import functools
+import sys
+import timeit
+
+import trajtracker
+from trajtracker.misc._method_wrappers import select_methods, wrap_methods, unwrap_methods
+
+
+#-- The upper edges of the histogram buckets (in seconds): 10 log-spaced buckets per decade, from 0.3 microseconds
+#-- to 1 second. The last bucket (index = len(_bucket_edges)) counts the longer calls.
+_bucket_edges = [10 ** (e / 10) for e in range(-65, 1)]
+
+
+#============================================================================================
+class MethodLatency(object):
+    """
+    The latency statistics of one method of one object: the number of calls, their total duration, and a
+    histogram of the call durations (with fixed, log-spaced buckets), from which percentiles are estimated.
+
+    All times are in seconds.
+    """
+
+    #----------------------------------------------------
+    def __init__(self, object_name, method_name):
+        self._object_name = object_name
+        self._method_name = method_name
+        self.reset()
+
+
+    #----------------------------------------------------
+    def reset(self):
+        """ Clear the statistics """
+        self._n_calls = 0
+        self._total_time = 0
+        self._max_time = 0
+        self._bucket_counts = [0] * (len(_bucket_edges) + 1)
+
+
+    #----------------------------------------------------
+    def add(self, duration):
+        """ Add the duration of one call """
+        self._n_calls += 1
+        self._total_time += duration
+        self._bucket_counts[bisect.bisect_left(_bucket_edges, duration)] += 1
+        if duration > self._max_time:
+            self._max_time = duration
+
+
+    #----------------------------------------------------
+    @property
+    def object_name(self):
+        return self._object_name
+
+    @property
+    def method_name(self):
+        return self._method_name
+
+    @property
+    def n_calls(self):
+        """ The number of calls """
+        return self._n_calls
+
+    @property
+    def total_time(self):
+        """ The total duration of all calls """
+        return self._total_time
+
+    @property
+    def mean_time(self):
+        """ The mean duration of a call (None if there were no calls) """
+        return self._total_time / self._n_calls if self._n_calls > 0 else None
+
+    @property
+    def max_time(self):
+        """ The duration of the longest call (None if there were no calls) """
+        return self._max_time if self._n_calls > 0 else None
+
+    @property
+    def p50(self):
+        """ The median duration of a call (see :func:`~trajtracker.misc.MethodLatency.percentile`) """
+        return self.percentile(50)
+
+    @property
+    def p99(self):
+        """ The 99th percentile of the call durations (see :func:`~trajtracker.misc.MethodLatency.percentile`) """
+        return self.percentile(99)
+
+
+    #----------------------------------------------------
+    def percentile(self, pct):
+        """
+        Estimate a percentile of the call durations, from the histogram: the upper edge of the histogram bucket
+        that contains the percentile (so the estimate may be up to 26% above the actual value), but no more than
+        the maximal duration.
+
+        :param pct: The percentile (0-100)
+        :return: The duration, or None if there were no calls
+        """
+        if self._n_calls == 0:
+            return None
+
+        rank = pct / 100 * self._n_calls
+        cumulative = 0
+        for i, count in enumerate(self._bucket_counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                return min(_bucket_edges[i], self._max_time) if i < len(_bucket_edges) else self._max_time
+
+        return self._max_time
+
+
+#============================================================================================
+class LatencyRegistry(object):
+    """
+    Opt-in instrumentation of trajtracker objects: for selected methods of selected objects, count the calls and
+    measure their duration (see :class:`~trajtracker.misc.MethodLatency`).
+
+    ::
+
+        registry = LatencyRegistry()
+        registry.instrument(validator)     # the per-sample methods: check_xyt(), check_sample(), etc.
+        registry.instrument(tracker, ["update_xyt"])
+        ...
+        registry.dump()                    # at the end of the session
+
+    Instrumenting an object replaces the selected methods of this object only (not of its class), so objects that
+    were not instrumented - or were uninstrumented - run with no extra cost.
+    """
+
+    #-- The methods instrumented by default (the methods that exist in the object)
+    default_methods = ('update_xyt', 'update_sample', 'check_xyt', 'check_sample', 'check_xy',
+                       'get_color_at', 'get_traj_point')
+
+
+    #----------------------------------------------------
+    def __init__(self, timer=timeit.default_timer):
+        """
+        Constructor
+
+        :param timer: The function that returns the current time (in seconds)
+        """
+        self._timer = timer
+        self._stats = []        # MethodLatency objects, in the order they were instrumented
+        self._instrumented = {} # id(object) -> (object, wrapped methods)
+        self._n_objects = 0
+
+
+    #----------------------------------------------------
+    def instrument(self, obj, methods=None, name=None):
+        """
+        Start measuring the calls to methods of the given object
+
+        :param obj: A trajtracker object (e.g. a validator)
+        :param methods: A list of method names. Default: the methods in
+                        :attr:`~trajtracker.misc.LatencyRegistry.default_methods` that the object has.
+        :param name: The object's name in the statistics. Default: the class name and a serial number
+                     (e.g. "LocationsValidator#1")
+        :return: A list of :class:`~trajtracker.misc.MethodLatency` - one per instrumented method
+        """
+        methods = select_methods(self, "instrument", obj, methods, self.default_methods)
+        if id(obj) in self._instrumented:
+            raise trajtracker.InvalidStateError("{:}.instrument() was called for an object that is already instrumented".format(type(self).__name__))
+
+        self._n_objects += 1
+        if name is None:
+            name = "{:}#{:}".format(type(obj).__name__, self._n_objects)
+
+        stats = []
+
+        def create_wrapper(method_name, method):
+            method_stats = MethodLatency(name, method_name)
+            stats.append(method_stats)
+            return self._timed(method, method_stats)
+
+        self._instrumented[id(obj)] = obj, wrap_methods(obj, methods, create_wrapper)
+        self._stats.extend(stats)
+        return stats
+
+
+    #----------------------------------------------------
+    def _timed(self, method, stats):
+
+        timer = self._timer
+        edges = _bucket_edges
+        bisect_left = bisect.bisect_left
+
+        #-- The statistics are updated inline (rather than via stats.add()) to save a method call per call
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            start = timer()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = timer() - start
+                stats._n_calls += 1
+                stats._total_time += duration
+                stats._bucket_counts[bisect_left(edges, duration)] += 1
+                if duration > stats._max_time:
+                    stats._max_time = duration
+
+        return timed_method
+
+
+    #----------------------------------------------------
+    def uninstrument(self, obj):
+        """
+        Stop measuring the calls to the object's methods, and restore the methods to what they were before
+        :func:`~trajtracker.misc.LatencyRegistry.instrument` was called. The statistics collected so far are kept.
+
+        If the object's methods were wrapped again after they were instrumented (e.g. by a
+        :class:`~trajtracker.misc.FrameProfiler`), remove the newer wrappers first.
+        """
+        if id(obj) not in self._instrumented:
+            raise trajtracker.InvalidStateError("{:}.uninstrument() was called for an object that is not instrumented".format(type(self).__name__))
+
+        obj, wrapped = self._instrumented[id(obj)]
+        unwrap_methods(self, "uninstrument", obj, wrapped)
+        del self._instrumented[id(obj)]
+
+
+    #----------------------------------------------------
+    @property
+    def stats(self):
+        """ The statistics of all instrumented methods (list of :class:`~trajtracker.misc.MethodLatency`) """
+        return list(self._stats)
+
+
+    #----------------------------------------------------
+    def reset(self):
+        """ Clear the statistics of all methods """
+        for s in self._stats:
+            s.reset()
+
+
+    #----------------------------------------------------
+    def dump(self, out=None):
+        """
+        Write the statistics of all instrumented methods, in CSV format.
+        The columns are: object, method, n_calls, total_time, mean_time, p50, p99, max_time (times are in microseconds)
+
+        :param out: A file object or a file name (default: sys.stdout)
+        """
+        if isinstance(out, basestring):
+            with open(out, 'w') as fh:
+                self.dump(fh)
+            return
+
+        if out is None:
+            out = sys.stdout
+
+        def us(value):
+            return "" if value is None else "{:.1f}".format(value * 1e6)
+
+        out.write("object,method,n_calls,total_time,mean_time,p50,p99,max_time\n")
+        for s in self._stats:
+            out.write("{:},{:},{:},{:},{:},{:},{:},{:}\n".format(s.object_name, s.method_name, s.n_calls, us(s.total_time),
+                                                                  us(s.mean_time), us(s.p50), us(s.p99), us(s.max_time)))
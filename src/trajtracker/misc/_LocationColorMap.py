@@ -200,9 +200,10 @@ class LocationColorMap(trajtracker._TTrkObject):
         :return: The color in the given place, or None if the coordinate is out of the image range
         """
 
-        _u.validate_func_arg_type(self, "get_color_at", "x_coord", x_coord, int)
-        _u.validate_func_arg_type(self, "get_color_at", "y_coord", y_coord, int)
-        _u.validate_func_arg_type(self, "get_color_at", "use_mapping", use_mapping, numbers.Number, none_allowed=True)
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "get_color_at", "x_coord", x_coord, int)
+            _u.validate_func_arg_type(self, "get_color_at", "y_coord", y_coord, int)
+            _u.validate_func_arg_type(self, "get_color_at", "use_mapping", use_mapping, numbers.Number, none_allowed=True)
 
         if use_mapping is None:
             use_mapping = self._use_mapping
@@ -11,3 +11,5 @@ from _shapes import shapes
 
 from _LocationColorMap import LocationColorMap
 from _PictureSet import PictureSet
+from _LatencyRegistry import LatencyRegistry, MethodLatency
+from _FrameProfiler import FrameProfiler, FrameReport
@@ -0,0 +1,80 @@
+"""
+
+Replace methods of a single object (not of its class) with wrappers, and restore them.
+Used by the profiling tools (LatencyRegistry, FrameProfiler), so that several tools can wrap the same object.
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import trajtracker
+import trajtracker._utils as _u
+
+
+#-- Indicates that a method was not an instance attribute before it was wrapped
+_no_attr = object()
+
+
+#----------------------------------------------------
+def select_methods(tool, func_name, obj, methods, default_methods):
+    """
+    Validate the arguments of a tool's function that wraps methods of an object
+
+    :param tool: The tool that wraps the methods (for error messages)
+    :param func_name: The tool's function name (for error messages)
+    :param obj: The object whose methods are wrapped
+    :param methods: A list of method names, or None = the methods in default_methods that the object has
+    :return: list of method names
+    """
+    _u.validate_func_arg_type(tool, func_name, "obj", obj, trajtracker._TTrkObject)
+
+    if methods is None:
+        return [m for m in default_methods if callable(getattr(obj, m, None))]
+
+    _u.validate_func_arg_anylist(tool, func_name, "methods", methods)
+    for m in methods:
+        if not callable(getattr(obj, m, None)):
+            raise ValueError("trajtracker error: {:}.{:}() - {:} has no method {:}".format(
+                type(tool).__name__, func_name, type(obj).__name__, m))
+
+    return list(methods)
+
+
+#----------------------------------------------------
+def wrap_methods(obj, methods, create_wrapper):
+    """
+    Replace the given methods of the object with wrappers. A method that is already wrapped (e.g. by another tool)
+    is wrapped again, i.e., the new wrapper calls the existing one.
+
+    :param create_wrapper: A function (method_name, method) -> wrapper
+    :return: The information needed for :func:`unwrap_methods`
+    """
+    wrapped = []
+    for method_name in methods:
+        wrapper = create_wrapper(method_name, getattr(obj, method_name))
+        wrapped.append((method_name, wrapper, obj.__dict__.get(method_name, _no_attr)))
+        setattr(obj, method_name, wrapper)
+
+    return wrapped
+
+
+#----------------------------------------------------
+def unwrap_methods(tool, func_name, obj, wrapped):
+    """
+    Restore the methods wrapped by :func:`wrap_methods` to what they were before they were wrapped
+    (including instance attributes that were set before wrapping, and wrappers of other tools).
+
+    If a method was wrapped again after this wrapping, it cannot be restored without removing the newer wrapper
+    too - so nothing is restored, and an InvalidStateError is raised.
+    """
+    for method_name, wrapper, previous in wrapped:
+        if obj.__dict__.get(method_name) is not wrapper:
+            raise trajtracker.InvalidStateError(
+                "{:}.{:}(): {:}.{:}() was replaced after {:} wrapped it (e.g., by another profiling tool). Restore it first.".format(
+                    type(tool).__name__, func_name, type(obj).__name__, method_name, type(tool).__name__))
+
+    for method_name, wrapper, previous in reversed(wrapped):
+        if previous is _no_attr:
+            del obj.__dict__[method_name]
+        else:
+            setattr(obj, method_name, previous)
@@ -56,7 +56,9 @@ class CircularTrajectoryGenerator(trajtracker._TTrkObject):
         :returns: a dict with the coordinates ('x' and 'y' entries).
         """
 
-        _u.validate_func_arg_type(self, "get_xy", "time", time, numbers.Number)
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "get_xy", "time", time, numbers.Number)
+
         if not hasattr(self, "_center"):
             raise trajtracker.InvalidStateError("trajtracker error: {:}.get_xy() was called without setting center".format(type(self).__name__))
         if not hasattr(self, "_degrees_per_sec"):
@@ -67,8 +67,9 @@ class CustomTrajectoryGenerator(trajtracker._TTrkObject):
 
         self.validate()
 
-        _u.validate_func_arg_type(self, "get_traj_point", "time", time, numbers.Number)
-        _u.validate_func_arg_not_negative(self, "get_traj_point", "time", time)
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "get_traj_point", "time", time, numbers.Number)
+            _u.validate_func_arg_not_negative(self, "get_traj_point", "time", time)
 
         if self._active_traj_id is None:
             if len(self._trajectories):
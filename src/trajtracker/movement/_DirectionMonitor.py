@@ -8,6 +8,7 @@ Movement monitor: continuously track the movement direction
 
 from __future__ import division
 
+from collections import deque
 import numbers
 
 import numpy as np
@@ -23,14 +24,22 @@ class DirectionMonitor(trajtracker._TTrkObject):
     Monitor the mouse/finger direction.
 
     This class also maintains some information about curves in the trajectory.
+
+    One monitor can be shared by several objects, each of which updates it with the same samples.
+    Each sample is added only once, according to its sequence number: the MotionSample's index in
+    :func:`~trajtracker.movement.DirectionMonitor.update_sample`, or the sample_num argument of
+    :func:`~trajtracker.movement.DirectionMonitor.update_xyt`.
     """
 
 
     Units = Enum("Units", "Degrees Radians")
 
+    default_max_recent_samples = 200
+
 
     #-------------------------------------------------------------------------
-    def __init__(self, units_per_mm, min_distance=0, angle_units=Units.Degrees, zero_angle=0, min_angle_change_per_curve=0):
+    def __init__(self, units_per_mm, min_distance=0, angle_units=Units.Degrees, zero_angle=0, min_angle_change_per_curve=0,
+                 max_recent_samples=default_max_recent_samples):
         """
         Constructor
 
@@ -38,6 +47,7 @@ class DirectionMonitor(trajtracker._TTrkObject):
         :param min_distance: See :attr:`~trajtracker.movement.DirectionMonitor.min_distance`
         :param angle_units: See :attr:`~trajtracker.movement.DirectionMonitor.angle_units`
         :param min_angle_change_per_curve: See :attr:`~trajtracker.movement.DirectionMonitor.min_angle_change_per_curve`
+        :param max_recent_samples: See :attr:`~trajtracker.movement.DirectionMonitor.max_recent_samples`
         """
         super(DirectionMonitor, self).__init__()
 
@@ -49,6 +59,7 @@ class DirectionMonitor(trajtracker._TTrkObject):
         self.angle_units = angle_units
         self.zero_angle = zero_angle
         self.min_angle_change_per_curve = min_angle_change_per_curve
+        self.max_recent_samples = max_recent_samples
 
         self.reset()
 
@@ -64,57 +75,112 @@ class DirectionMonitor(trajtracker._TTrkObject):
         """
         Called when a trial starts - reset any previous movement
         """
-        self._recent_near_coords = []
+        self._recent_near_coords = deque()
         self._pre_recent_coord = None
+        self._last_sample = None
+        self._last_sample_id = None
+        self._n_samples_added = 0
 
         self._curr_angle = None
 
         #-- "current curve" is a curve that is validated
         self._curr_curve_direction = None
         self._curr_curve_start_angle = None
-        self._curr_curve_start_index = None
+        self._curr_curve_start_xyt = None
 
         #-- "new curve" is when we observe a very small change in angle, but we're not yet sure
         #-- it should count as a curve.
         self._possible_curve_direction = None
         self._possible_curve_start_angle = None
-        self._possible_curve_start_index = None
+        self._possible_curve_start_xyt = None
 
         self._n_curves = 0
 
 
     #-------------------------------------------------------------------------
     # noinspection PyIncorrectDocstring
-    def update_xyt(self, x_coord, y_coord, time):
+    def update_xyt(self, x_coord, y_coord, time, sample_num=None):
         """
         Call this method whenever the finger/mouse moves
+
+        :param sample_num: The sample's sequence number since the trial started (0 = the first sample).
+                           When the monitor is shared by several objects, each of them provides the sequence number,
+                           and a sample that was already added (by another object) is ignored.
+                           None = a new sample.
+        """
+
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
+            _u.validate_func_arg_not_negative(self, "update_xyt", "time", time)
+
+        if sample_num is not None and sample_num < self._n_samples_added:
+            return
+
+        self._last_sample_id = None
+        self._last_sample = None
+        self._update(x_coord, y_coord, time)
+
+
+    #-------------------------------------------------------------------------
+    def update_sample(self, sample):
         """
+        Call this method whenever the finger/mouse moves - instead of
+        :func:`~trajtracker.movement.DirectionMonitor.update_xyt`, when the sample was already preprocessed by
+        a :class:`~trajtracker.movement.MotionState`. This saves validating the sample, and (when
+        :attr:`~trajtracker.movement.DirectionMonitor.min_distance` = 0) computing the direction.
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        """
+        if not self._trusted_input:
+            _u.validate_func_arg_not_negative(self, "update_sample", "time", sample.time)
+
+        sample_id = sample.source, sample.index
+        if sample_id == self._last_sample_id:
+            #-- This sample was already added (by another object that shares this monitor)
+            return
+
+        self._last_sample_id = sample_id
+
+        #-- With min_distance=0, the direction is always computed relatively to the previous sample
+        use_heading = self._min_distance == 0 and sample.follows(self._last_sample)
+
+        self._last_sample = sample
+        self._update(sample.x, sample.y, sample.time, sample.heading if use_heading else None)
+
+
+    #-------------------------------------
+    # angle = the movement direction, in radians (None = compute it here)
+    #
+    def _update(self, x_coord, y_coord, time, angle=None):
 
-        _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
-        _u.validate_func_arg_not_negative(self, "update_xyt", "time", time)
+        sample_num = self._n_samples_added
+        self._n_samples_added += 1
 
+        self._forget_old_coords(sample_num)
         self._remove_far_enough_recent_coords(x_coord, y_coord)
+        self._prune_recent_coords(x_coord, y_coord)
 
         # remember coordinates
-        self._recent_near_coords.append((x_coord, y_coord, time))
+        self._recent_near_coords.append((x_coord, y_coord, time, sample_num))
 
         last_angle = self._curr_angle
-        self._calc_curr_angle()
+        self._calc_curr_angle(angle)
         self._check_if_new_curve(last_angle)
 
 
     #-------------------------------------
     # Calculate the recent movement direction
     #
-    def _calc_curr_angle(self):
+    def _calc_curr_angle(self, angle=None):
 
         if self._pre_recent_coord is None:
             self._curr_angle = None
             return
 
-        angle = u.get_angle(self._pre_recent_coord, self._recent_near_coords[-1])
+        if angle is None:
+            angle = u.get_angle(self._pre_recent_coord, self._recent_near_coords[-1])
 
         if self._angle_units == self.Units.Degrees:
             angle = angle / (np.pi * 2) * 360
@@ -161,7 +227,7 @@ class DirectionMonitor(trajtracker._TTrkObject):
                 #-- Mark the beginning of a possible curve
                 self._possible_curve_direction = curr_curve_direction
                 self._possible_curve_start_angle = self._curr_angle
-                self._possible_curve_start_index = len(self._recent_near_coords) - 1
+                self._possible_curve_start_xyt = self._recent_near_coords[-1][:3]
                 self._last_pre_curve_angle = prev_angle
 
             #-- Check if the finger/mouse changed its direction enough
@@ -175,7 +241,7 @@ class DirectionMonitor(trajtracker._TTrkObject):
 
                 self._curr_curve_direction = curr_curve_direction
                 self._curr_curve_start_angle = self._curr_angle
-                self._curr_curve_start_index = len(self._recent_near_coords) - 1
+                self._curr_curve_start_xyt = self._recent_near_coords[-1][:3]
 
                 self._clear_possible_curve()
 
@@ -185,9 +251,21 @@ class DirectionMonitor(trajtracker._TTrkObject):
     def _clear_possible_curve(self):
         self._possible_curve_direction = None
         self._possible_curve_start_angle = None
-        self._possible_curve_start_index = None
+        self._possible_curve_start_xyt = None
         self._last_pre_curve_angle = None
 
+    #-------------------------------------
+    # Forget the recent coordinates of samples that are more than max_recent_samples before the given sample:
+    # they can no longer be the "pre recent coordinate" of this sample or of any future sample
+    #
+    def _forget_old_coords(self, sample_num):
+
+        coords = self._recent_near_coords
+        min_sample_num = sample_num - self._max_recent_samples
+        while len(coords) > 0 and coords[0][3] < min_sample_num:
+            coords.popleft()
+
+
     #-------------------------------------
     # Remove the first entries in self._prev_locations, as long as the first entry remains far enough
     # for angle computation (i.e., farther than self._calc_angle_interval)
@@ -204,14 +282,48 @@ class DirectionMonitor(trajtracker._TTrkObject):
         self._pre_recent_coord = None
 
         #-- Find the latest coordinate that is far enough
-        for i in range(len(self._recent_near_coords)-1, -1, -1):
-            x, y, t = self._recent_near_coords[i]
+        for x, y, t, n in reversed(self._recent_near_coords):
             if (x - x_coord) ** 2 + (y - y_coord) ** 2 >= sq_min_distance:
                 #-- This coordinate is far enough
                 self._pre_recent_coord = (x, y)
                 break
 
 
+    #-------------------------------------
+    # Forget the recent coordinates that can no longer be the "pre recent coordinate" of any future point
+    # (called before the given coordinate is appended to self._recent_near_coords).
+    #
+    # - A future point is within min_distance of two points only if they are less than 2*min_distance apart.
+    #   So if the second-oldest point is 2*min_distance away from the current point, the oldest point will never
+    #   again be the latest far-enough point: one of these newer points will always be farther.
+    # - When the current point is at the same location as an older point, the older point is redundant: the newer
+    #   point will always be found first. (Unless min_distance = 0, where the previous point is the "pre recent
+    #   coordinate" of the current point; but then only one point is kept anyway.)
+    #
+    # This keeps the memory and the per-sample cost proportional to the number of distinct locations within
+    # 2*min_distance (which is small when the finger moves, or jitters between a few pixels), and does not change
+    # any result. When the finger hovers with sub-pixel (float) jitter, the number of distinct locations grows
+    # with each sample - so _forget_old_coords() bounds it by max_recent_samples.
+    #
+    def _prune_recent_coords(self, x_coord, y_coord):
+
+        coords = self._recent_near_coords
+        sq_prune_distance = (2 * self._min_distance * self._units_per_mm) ** 2
+
+        while len(coords) > 1:
+            x, y, t, n = coords[1]
+            if (x - x_coord) ** 2 + (y - y_coord) ** 2 < sq_prune_distance:
+                break
+            coords.popleft()
+
+        if self._min_distance > 0:
+            #-- There is at most one older point at the same location (because of this pruning)
+            for i, (x, y, t, n) in enumerate(coords):
+                if x == x_coord and y == y_coord:
+                    del coords[i]
+                    break
+
+
     #====================================================================================
     #   Runtime API - get info
     #====================================================================================
@@ -245,10 +357,7 @@ class DirectionMonitor(trajtracker._TTrkObject):
         """
         The coordinates and time at the beginning of the current curve
         """
-        if self._curr_curve_start_index is None:
-            return None
-        else:
-            return self._recent_near_coords[self._curr_curve_start_index]
+        return self._curr_curve_start_xyt
 
     #-------------------------------------
     @property
@@ -259,6 +368,162 @@ class DirectionMonitor(trajtracker._TTrkObject):
         return self._n_curves
 
 
+    #====================================================================================
+    #   Offline API
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    def compute_profile(self, x, y, t):
+        """
+        Compute the direction and curves at each sample of a whole trajectory (e.g., of a saved trial).
+
+        The result is identical to calling :func:`~trajtracker.movement.DirectionMonitor.update_xyt` for each sample
+        (after :func:`~trajtracker.movement.DirectionMonitor.reset`) and reading the direction after each call.
+        The angles are computed in a vectorized way; only the detection of curves runs sample by sample.
+        This object's state is not changed.
+
+        :param x: Array of x coordinates
+        :param y: Array of y coordinates
+        :param t: Array of time points
+        :return: 3 numpy arrays, with one value per sample: curr_angle (NaN where the online API returns None),
+                 curr_curve_direction (0 where the online API returns None), and n_curves
+        """
+
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        t = np.asarray(t)
+
+        if not (x.ndim == y.ndim == t.ndim == 1) or not (len(x) == len(y) == len(t)):
+            raise ValueError("trajtracker error: {:}.compute_profile() expects 3 one-dimensional arrays of the same length".format(type(self).__name__))
+
+        n = len(x)
+        angles = np.full(n, np.nan)
+
+        #-- Compute the angle between each sample and its "pre recent coordinate"
+        pre_index = self._find_pre_recent_indices(x, y)
+        curr = np.flatnonzero(pre_index >= 0)
+        if len(curr) > 0:
+            pre = pre_index[curr]
+            dx = x[curr] - x[pre]
+            dy = y[curr] - y[pre]
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                angle = np.arctan(- dy / dx) + np.where(dx > 0, np.pi / 2, np.pi * 3 / 2)
+            angle[dx == 0] = np.where(dy[dx == 0] > 0, 0, np.pi)
+
+            if self._angle_units == self.Units.Degrees:
+                angle = angle / (np.pi * 2) * 360
+
+            if self._zero_angle != 0:
+                angle -= self._zero_angle
+
+            max_angle = self._max_angle()
+            angle %= max_angle
+            angle[angle > max_angle / 2] -= max_angle
+
+            angles[curr] = angle
+
+        curve_direction, n_curves = self._detect_curves(angles)
+
+        return angles, curve_direction, n_curves
+
+
+    #-------------------------------------------------------------------------
+    # For each sample, find the index of its "pre recent coordinate" (see _remove_far_enough_recent_coords):
+    # the latest earlier sample that is at least min_distance away, among the max_recent_samples previous samples.
+    # -1 = no such sample.
+    #
+    def _find_pre_recent_indices(self, x, y):
+
+        n = len(x)
+        if n == 0 or self._min_distance == 0:
+            return np.arange(n) - 1
+
+        sq_min_distance = (self._min_distance * self._units_per_mm) ** 2
+
+        #-- Consecutive samples at the same location are merged into one run. Only a run's last sample
+        #-- can be the "pre recent coordinate" (its earlier samples are at the same place, and older)
+        run_starts = np.concatenate(([True], (x[1:] != x[:-1]) | (y[1:] != y[:-1])))
+        run_of_sample = np.cumsum(run_starts) - 1
+        run_x = x[run_starts]
+        run_y = y[run_starts]
+        run_last_sample = np.concatenate((np.flatnonzero(run_starts)[1:] - 1, [n - 1]))
+
+        #-- For each run, search backwards for a far-enough run. All runs are searched in parallel,
+        #-- one step backwards in each iteration. A run more than max_recent_samples runs back is also
+        #-- more than max_recent_samples samples back.
+        pre_run = np.full(len(run_x), -1)
+        searching = np.arange(1, len(run_x))
+        lag = 1
+        while len(searching) > 0 and lag <= self._max_recent_samples:
+            candidates = searching - lag
+            in_range = candidates >= 0
+            searching = searching[in_range]
+            candidates = candidates[in_range]
+
+            far = (run_x[candidates] - run_x[searching]) ** 2 + (run_y[candidates] - run_y[searching]) ** 2 >= sq_min_distance
+            pre_run[searching[far]] = candidates[far]
+            searching = searching[~far]
+            lag += 1
+
+        pre_run = pre_run[run_of_sample]
+        pre_sample = np.where(pre_run >= 0, run_last_sample[pre_run], -1)
+        pre_sample[pre_sample < np.arange(n) - self._max_recent_samples] = -1
+        return pre_sample
+
+
+    #-------------------------------------------------------------------------
+    # Run the curve detection of _check_if_new_curve() over a sequence of angles
+    #
+    def _detect_curves(self, angles):
+
+        curve_directions = np.zeros(len(angles), dtype=int)
+        n_curves = np.zeros(len(angles), dtype=int)
+
+        max_angle = self._max_angle()
+        half_max_angle = max_angle / 2
+        min_angle_change_per_curve = self._min_angle_change_per_curve
+
+        curr_curve_direction = None
+        possible_curve_direction = None
+        last_pre_curve_angle = None
+        n_curves_so_far = 0
+
+        prev_angle = None
+        for i, angle in enumerate(angles.tolist()):
+            if angle != angle:
+                angle = None   # NaN
+
+            if angle is not None and prev_angle is not None:
+                change_in_angle = (angle - prev_angle) % max_angle
+                if change_in_angle != 0:
+                    direction = 1 if change_in_angle <= half_max_angle else -1
+
+                    if direction == curr_curve_direction:
+                        possible_curve_direction = None
+                        last_pre_curve_angle = None
+
+                    else:
+                        if possible_curve_direction is None:
+                            possible_curve_direction = direction
+                            last_pre_curve_angle = prev_angle
+
+                        change_in_angle_along_curve = (angle - last_pre_curve_angle) % max_angle
+                        change_in_angle_along_curve = min(change_in_angle_along_curve, max_angle - change_in_angle_along_curve)
+
+                        if change_in_angle_along_curve >= min_angle_change_per_curve:
+                            n_curves_so_far += 1
+                            curr_curve_direction = direction
+                            possible_curve_direction = None
+                            last_pre_curve_angle = None
+
+            curve_directions[i] = curr_curve_direction or 0
+            n_curves[i] = n_curves_so_far
+            prev_angle = angle
+
+        return curve_directions, n_curves
+
+
     #====================================================================================
     #   Configure
     #====================================================================================
@@ -334,3 +599,24 @@ class DirectionMonitor(trajtracker._TTrkObject):
         _u.validate_attr_not_negative(self, "min_angle_change_per_curve", value)
         self._min_angle_change_per_curve = value
         self._log_setter("min_angle_change_per_curve")
+
+
+    #-------------------------------------
+    @property
+    def max_recent_samples(self):
+        """
+        The direction is computed relatively to a sample among the last max_recent_samples samples (int,
+        default: 200). If all of them are within :attr:`~trajtracker.movement.DirectionMonitor.min_distance`
+        of the current sample (e.g., when the finger hovers in place for a long time),
+        :attr:`~trajtracker.movement.DirectionMonitor.curr_angle` is None.
+
+        This limits the memory and the per-sample time of the monitor.
+        """
+        return self._max_recent_samples
+
+    @max_recent_samples.setter
+    def max_recent_samples(self, value):
+        _u.validate_attr_type(self, "max_recent_samples", value, int)
+        _u.validate_attr_positive(self, "max_recent_samples", value)
+        self._max_recent_samples = value
+        self._log_setter("max_recent_samples")
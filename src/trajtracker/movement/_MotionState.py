@@ -0,0 +1,170 @@
+"""
+
+Motion state: preprocess each sample of the finger/mouse movement once, for all monitors and validators
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+from __future__ import division
+
+import math
+import numbers
+
+import trajtracker
+import trajtracker._utils as _u
+import trajtracker.utils as u
+
+
+#============================================================================================
+class MotionSample(object):
+    """
+    One sample of the finger/mouse movement, with values derived from it and from the previous sample.
+
+    Samples are created by :func:`~trajtracker.movement.MotionState.update_xyt` and should not be modified.
+    They have the following attributes:
+
+    - **source**: The :class:`~trajtracker.movement.MotionState` that created the sample
+    - **index**: The sample's sequence number since the last reset of the source (0 = the first sample)
+    - **x**, **y**, **time**: The sample, as provided to update_xyt()
+    - **units_per_mm**: The source's units_per_mm
+    - **x_mm**, **y_mm**: The coordinates in mm
+    - **dt**: The time elapsed since the previous sample (None for the first sample)
+    - **distance**: The distance (in mm) from the previous sample (0 for the first sample)
+    - **heading**: The direction of movement from the previous sample (in radians, see :func:`~trajtracker.utils.get_angle`;
+      None for the first sample). This is computed only when first used.
+    """
+
+    __slots__ = ('source', 'index', 'x', 'y', 'time', 'units_per_mm', 'x_mm', 'y_mm', 'dt', 'distance',
+                 '_prev_xy', '_heading')
+
+    _not_computed = object()
+
+    def __init__(self, source, index, x, y, time, units_per_mm, prev_sample):
+        self.source = source
+        self.index = index
+        self.x = x
+        self.y = y
+        self.time = time
+        self.units_per_mm = units_per_mm
+        self.x_mm = x / units_per_mm
+        self.y_mm = y / units_per_mm
+
+        if prev_sample is None:
+            self.dt = None
+            self.distance = 0
+            self._prev_xy = None
+        else:
+            self.dt = time - prev_sample.time
+            self.distance = math.sqrt((self.x_mm - prev_sample.x_mm) ** 2 + (self.y_mm - prev_sample.y_mm) ** 2)
+            self._prev_xy = prev_sample.x, prev_sample.y
+
+        self._heading = self._not_computed
+
+
+    #----------------------------------------------------
+    @property
+    def heading(self):
+        if self._heading is self._not_computed:
+            self._heading = None if self._prev_xy is None else u.get_angle(self._prev_xy, (self.x, self.y))
+        return self._heading
+
+
+    #----------------------------------------------------
+    def follows(self, sample):
+        """
+        Check whether this sample immediately follows the given sample (i.e., they were created by the same
+        :class:`~trajtracker.movement.MotionState` and there were no samples between them)
+        """
+        return sample is not None and sample.source is self.source and sample.index == self.index - 1
+
+
+#============================================================================================
+class MotionState(trajtracker._TTrkObject):
+    """
+    Preprocess the finger/mouse movement once per sample: validate the sample, and compute the coordinates in mm,
+    the time and distance from the previous sample, and the movement direction.
+
+    The resulting :class:`~trajtracker.movement.MotionSample` can be passed to several monitors and validators
+    (e.g. :func:`~trajtracker.movement.SpeedMonitor.update_sample`,
+    :func:`~trajtracker.validators.InstantaneousSpeedValidator.check_sample`), so each of them does not need to
+    validate and preprocess the sample again:
+
+    ::
+
+        motion = MotionState(units_per_mm)
+        ...
+        sample = motion.update_xyt(x, y, time)
+        for validator in validators:
+            err = validator.check_sample(sample)
+    """
+
+    #-------------------------------------------------------------------------
+    def __init__(self, units_per_mm=1):
+        """
+        Constructor
+
+        :param units_per_mm: See :attr:`~trajtracker.movement.MotionState.units_per_mm`
+        """
+        super(MotionState, self).__init__()
+        self.units_per_mm = units_per_mm
+        self.reset()
+
+
+    #-------------------------------------------------------------------------
+    def reset(self):
+        """
+        Called when a trial starts - forget the previous samples
+        """
+        self._last_sample = None
+        self._n_samples = 0
+
+
+    #-------------------------------------------------------------------------
+    # noinspection PyIncorrectDocstring
+    def update_xyt(self, x_coord, y_coord, time):
+        """
+        Call this method whenever the finger/mouse moves
+
+        :return: :class:`~trajtracker.movement.MotionSample`
+        """
+
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
+
+        if self._last_sample is not None and self._last_sample.time > time:
+            raise trajtracker.InvalidStateError("{0}.update_xyt() was called with time={1} after it was previously called with time={2}".format(
+                type(self).__name__, time, self._last_sample.time))
+
+        sample = MotionSample(self, self._n_samples, x_coord, y_coord, time, self._units_per_mm, self._last_sample)
+
+        self._last_sample = sample
+        self._n_samples += 1
+
+        return sample
+
+
+    #-------------------------------------------------------------------------
+    @property
+    def last_sample(self):
+        """ The last :class:`~trajtracker.movement.MotionSample` (None if there was none since the last reset) """
+        return self._last_sample
+
+
+    #-------------------------------------------------------------------------
+    @property
+    def units_per_mm(self):
+        """
+        The ratio of units (provided in the call to :func:`~trajtracker.movement.MotionState.update_xyt`) per mm
+        """
+        return self._units_per_mm
+
+
+    @units_per_mm.setter
+    def units_per_mm(self, value):
+        _u.validate_attr_type(self, "units_per_mm", value, numbers.Number)
+        _u.validate_attr_positive(self, "units_per_mm", value)
+        self._units_per_mm = value
+        self._log_setter("units_per_mm")
@@ -0,0 +1,165 @@
+"""
+
+Sample buffer: a growable, column-oriented buffer of numeric samples
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+import bisect
+import numbers
+
+import numpy as np
+
+
+#-- Checked before numbers.Integral, which is much slower to check
+_int_types = (int, long)
+
+
+class SampleBuffer(object):
+    """
+    A buffer of samples, each sample consisting of a fixed number of numeric values (columns).
+
+    The samples are stored in a preallocated 2-dimensional array (one row per column), so appending a
+    sample does not create any Python objects. When the buffer is full, its capacity is doubled.
+    Calling :func:`clear` forgets the samples but keeps the allocated memory, so a buffer that is reused
+    across trials stops allocating once it has reached the size of the longest trial.
+
+    The buffer also remembers which of the values appended to it were integers (so they can be formatted as
+    integers): per column, it keeps the indices where the values changed from integers to non-integers or back.
+    """
+
+    default_capacity = 1024
+
+    #----------------------------------------------------
+    def __init__(self, n_columns, capacity=default_capacity, dtype=np.float64):
+        """
+        Constructor
+
+        :param n_columns: The number of values in each sample
+        :param capacity: The number of samples initially allocated
+        :param dtype: The numpy data type of the values
+        """
+        self._n_columns = n_columns
+        self._data = np.empty((n_columns, max(capacity, 1)), dtype=dtype)
+        self._columns = list(self._data)
+        self.clear()
+
+
+    #----------------------------------------------------
+    def clear(self):
+        """
+        Forget all samples. The allocated memory is retained.
+        """
+        self._length = 0
+        self._last_is_int = [True] * self._n_columns
+        self._int_changes = [[] for i in range(self._n_columns)]
+
+
+    #----------------------------------------------------
+    def append(self, *values):
+        """
+        Add one sample to the buffer
+
+        :param values: One value per column
+        """
+        n = self._length
+        if n == self._data.shape[1]:
+            self._grow(n * 2)
+
+        for i, value in enumerate(values):
+            self._columns[i][n] = value
+            is_int = isinstance(value, _int_types) or (not isinstance(value, float) and isinstance(value, numbers.Integral))
+            if is_int != self._last_is_int[i]:
+                self._last_is_int[i] = is_int
+                self._int_changes[i].append(n)
+
+        self._length = n + 1
+
+
+    #----------------------------------------------------
+    def _grow(self, capacity):
+        data = np.empty((self._n_columns, capacity), dtype=self._data.dtype)
+        data[:, :self._length] = self._data[:, :self._length]
+        self._data = data
+        self._columns = list(data)
+
+
+    #----------------------------------------------------
+    def __len__(self):
+        return self._length
+
+    #----------------------------------------------------
+    @property
+    def capacity(self):
+        """ The number of samples that can be stored before the buffer has to grow """
+        return self._data.shape[1]
+
+    #----------------------------------------------------
+    def column(self, col_num):
+        """
+        Get the values of one column, as a numpy array.
+
+        The array is a view on the buffer (not a copy). It remains valid only until the buffer is
+        cleared or grows.
+        """
+        return self._columns[col_num][:self._length]
+
+    #----------------------------------------------------
+    def column_is_int(self, col_num):
+        """ Whether all values appended to the given column (since the last clear()) were integers """
+        return len(self._int_changes[col_num]) == 0
+
+    #----------------------------------------------------
+    def column_int_mask(self, col_num, start=0, end=None):
+        """
+        Get, for each value in one column, whether it was appended as an integer (numpy array of bool)
+
+        :param start: Get only the values from this index on
+        :param end: Get only the values before this index (default: all values)
+        """
+        if end is None:
+            end = self._length
+        changes = self._int_changes[col_num]
+
+        #-- The column starts as integer, and each change toggles it
+        i = bisect.bisect_right(changes, start)
+        is_int = i % 2 == 0
+
+        mask = np.empty(end - start, dtype=bool)
+        pos = start
+        for change in changes[i:]:
+            if change >= end:
+                break
+            mask[pos - start:change - start] = is_int
+            is_int = not is_int
+            pos = change
+        mask[pos - start:] = is_int
+        return mask
+
+    #----------------------------------------------------
+    def column_int_flags(self, col_num):
+        """
+        Get whether the values of one column are integers, in the format expected by the trajectory writers
+        in :mod:`trajtracker.data`: True if all of them are, False if none of them is, or (if the column has
+        both integer and non-integer values) the :func:`column_int_mask`
+        """
+        changes = self._int_changes[col_num]
+        if len(changes) == 0:
+            return True
+        if changes == [0]:
+            return False
+        return self.column_int_mask(col_num)
+
+    #----------------------------------------------------
+    def column_as_list(self, col_num):
+        """
+        Get the values of one column as a list. Values that were appended as integers are returned as int.
+        """
+        values = self.column(col_num)
+        flags = self.column_int_flags(col_num)
+        if flags is True:
+            return values.astype(int).tolist()
+        if flags is False:
+            return values.tolist()
+        return [int(v) if is_int else v for v, is_int in zip(values.tolist(), flags.tolist())]
@@ -8,7 +8,9 @@ Movement monitor: continuously track the movement speed
 
 from __future__ import division
 
+import math
 import numbers
+
 import numpy as np
 
 import trajtracker
@@ -18,8 +20,19 @@ import trajtracker._utils as _u
 class SpeedMonitor(trajtracker._TTrkObject):
     """
     Monitor the mouse/finger instantaneous speed
+
+    One monitor can be shared by several objects (e.g., an x-axis and a y-axis
+    :class:`~trajtracker.validators.InstantaneousSpeedValidator`), each of which updates it with the same samples.
+    Each sample is added only once, according to its sequence number: the MotionSample's index in
+    :func:`~trajtracker.movement.SpeedMonitor.update_sample`, or the sample_num argument of
+    :func:`~trajtracker.movement.SpeedMonitor.update_xyt`.
+
+    The speed can be computed over several time intervals at once
+    (see :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`), all from the same recent samples.
     """
 
+    _initial_buffer_capacity = 64
+
 
     #-------------------------------------------------------------------------
     def __init__(self, units_per_mm, calculation_interval):
@@ -27,12 +40,20 @@ class SpeedMonitor(trajtracker._TTrkObject):
         Constructor
 
         :param units_per_mm: See :attr:`~trajtracker.movement.SpeedMonitor.units_per_mm`
-        :param calculation_interval: See :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`
+        :param calculation_interval: See :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`.
+                                     This can also be a list of intervals
+                                     (see :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`)
         """
         super(SpeedMonitor, self).__init__()
 
+        self._head = 0
+        self._buf_pre_point = None
+
         self.units_per_mm = units_per_mm
-        self.calculation_interval = calculation_interval
+        if isinstance(calculation_interval, (list, tuple)):
+            self.calculation_intervals = calculation_interval
+        else:
+            self.calculation_interval = calculation_interval
 
         self.reset()
 
@@ -53,65 +74,205 @@ class SpeedMonitor(trajtracker._TTrkObject):
         if time is not None and not isinstance(time, (int, float)):
             raise ValueError(_u.ErrMsg.invalid_method_arg_type(self.__class__, "reset", "numeric", "time", time))
 
-        self._recent_points = []
-        self._pre_recent_point = None
         self._time0 = time
 
+        #-- The recent points are kept in a ring buffer: parallel lists of x, y, time, and the cumulative distance
+        #-- traveled since the trial started. Points are appended at _tail and removed from _head; both are
+        #-- ever-increasing counters (the buffer index is counter % capacity).
+        self._buf_capacity = self._initial_buffer_capacity
+        self._buf_x = [0] * self._buf_capacity
+        self._buf_y = [0] * self._buf_capacity
+        self._buf_t = [0] * self._buf_capacity
+        self._buf_dist = [0] * self._buf_capacity
+        self._head = 0
+        self._tail = 0
+
+        #-- The last point (x, y, time, cumulative distance), or None
+        self._last_point = None
+
+        #-- The newest point that was removed from the buffer, or None
+        self._buf_pre_point = None
+
+        #-- Per calculation interval: the oldest point in the interval (a counter, like _head), and
+        #-- the newest point that is older than the interval (x, y, time, cumulative distance; or None)
+        self._init_interval_heads()
+
+        #-- The last MotionSample provided to update_sample(); the (source, index) of the last MotionSample
+        #-- added; and the number of samples added since the reset
+        self._last_sample = None
+        self._last_sample_id = None
+        self._n_samples_added = 0
+
 
     #-------------------------------------------------------------------------
     # noinspection PyIncorrectDocstring
-    def update_xyt(self, x_coord, y_coord, time):
+    def update_xyt(self, x_coord, y_coord, time, sample_num=None):
         """
         Call this method whenever the finger/mouse moves
 
         :param time: use the same time scale provided to reset()
+        :param sample_num: The sample's sequence number since the trial started (0 = the first sample).
+                           When the monitor is shared by several objects, each of them provides the sequence number,
+                           and a sample that was already added (by another object) is ignored.
+                           None = a new sample.
         """
 
-        _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
+
+        if sample_num is not None and sample_num < self._n_samples_added:
+            return
+
         self._validate_time(time)
 
+        self._n_samples_added += 1
+        self._last_sample_id = None
+        self._last_sample = None
+        self._add_point(x_coord / self._units_per_mm, y_coord / self._units_per_mm, time)
+
+
+    #-------------------------------------------------------------------------
+    def update_sample(self, sample):
+        """
+        Call this method whenever the finger/mouse moves - instead of
+        :func:`~trajtracker.movement.SpeedMonitor.update_xyt`, when the sample was already preprocessed by
+        a :class:`~trajtracker.movement.MotionState`. This saves validating the sample and computing the distance
+        from the previous sample.
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        """
+
+        sample_id = sample.source, sample.index
+        if sample_id == self._last_sample_id:
+            #-- This sample was already added (by another object that shares this monitor)
+            return
+
+        self._validate_time(sample.time)
+        self._last_sample_id = sample_id
+        self._n_samples_added += 1
+
+        if sample.units_per_mm != self._units_per_mm:
+            #-- Can't use the sample's coordinates in mm
+            self._last_sample = None
+            self._add_point(sample.x / self._units_per_mm, sample.y / self._units_per_mm, sample.time)
+
+        elif sample.follows(self._last_sample):
+            self._last_sample = sample
+            self._add_point(sample.x_mm, sample.y_mm, sample.time, sample.distance)
+
+        else:
+            self._last_sample = sample
+            self._add_point(sample.x_mm, sample.y_mm, sample.time)
+
+
+    #--------------------------------------
+    # Add a point (in mm) to the recent points.
+    # distance = the distance from the last point (None = compute it here)
+    #
+    def _add_point(self, x_coord, y_coord, time, distance=None):
+
         if self._time0 is None:
             self._time0 = time
 
-        #-- Set coordinate space
-        x_coord /= self._units_per_mm
-        y_coord /= self._units_per_mm
-
         #-- Find distance to recent coordinate
-        if len(self._recent_points) > 0:
-            last_loc = self._recent_points[-1]
-            distance = np.sqrt((x_coord-last_loc[0]) ** 2 + (y_coord-last_loc[1]) ** 2)
+        if self._last_point is None:
+            cum_distance = 0
         else:
-            distance = 0
+            last_x, last_y, last_t, last_cum_distance = self._last_point
+            if distance is None:
+                distance = math.sqrt((x_coord - last_x) ** 2 + (y_coord - last_y) ** 2)
+            cum_distance = last_cum_distance + distance
 
-        self._remove_recent_points_older_than(time - self._calculation_interval)
+        self._remove_recent_points_older_than(time)
 
         #-- Remember current coords & time
-        self._recent_points.append((x_coord, y_coord, time, distance))
+        if self._tail - self._head == self._buf_capacity:
+            self._grow_buffer()
+
+        i = self._tail % self._buf_capacity
+        self._buf_x[i] = x_coord
+        self._buf_y[i] = y_coord
+        self._buf_t[i] = time
+        self._buf_dist[i] = cum_distance
+        self._tail += 1
+
+        self._last_point = x_coord, y_coord, time, cum_distance
 
 
     #--------------------------------------
     def _validate_time(self, time):
 
         #-- Validate that times are provided in increasing order
-        prev_time = self._recent_points[-1][2] if len(self._recent_points) > 0 else self._time0
+        prev_time = self._last_point[2] if self._last_point is not None else self._time0
         if prev_time is not None and prev_time > time:
             raise trajtracker.InvalidStateError("{0}.update_xyt() was called with time={1} after it was previously called with time={2}".format(self.__class__, time, prev_time))
 
 
     #--------------------------------------
-    # Remove all _recent_points that are older than the given threshold.
-    # Remember the newest removed point.
+    # For each calculation interval, remove the recent points that are older than the interval (relatively to
+    # the given time), and remember the newest removed point.
+    # Points are removed from the buffer when they are older than all intervals.
     #
-    def _remove_recent_points_older_than(self, latest_good_time):
+    # Each point is removed once per interval, so the amortized cost per update_xyt() call is
+    # O(number of intervals)
+    #
+    def _remove_recent_points_older_than(self, time):
+
+        capacity = self._buf_capacity
+        tail = self._tail
+        buf_t = self._buf_t
+        heads = self._heads
+
+        for k, interval in enumerate(self._calculation_intervals):
+            latest_good_time = time - interval
+            head = heads[k]
+
+            while head < tail and buf_t[head % capacity] <= latest_good_time:
+                head += 1
+
+            if head > heads[k]:
+                self._pre_recent_points[k] = self._get_buffer_point(head - 1)
+                heads[k] = head
+
+        head = min(heads)
+        if head > self._head:
+            self._buf_pre_point = self._get_buffer_point(head - 1)
+            self._head = head
+
+
+    #--------------------------------------
+    def _get_buffer_point(self, counter):
+        i = counter % self._buf_capacity
+        return self._buf_x[i], self._buf_y[i], self._buf_t[i], self._buf_dist[i]
+
+
+    #--------------------------------------
+    # Start tracking all calculation intervals from the beginning of the buffer
+    #
+    def _init_interval_heads(self):
+        self._heads = [self._head] * len(self._calculation_intervals)
+        self._pre_recent_points = [self._buf_pre_point] * len(self._calculation_intervals)
+
+
+    #--------------------------------------
+    # Double the ring buffer's capacity
+    #
+    def _grow_buffer(self):
+
+        order = [i % self._buf_capacity for i in range(self._head, self._tail)]
+        padding = [0] * self._buf_capacity
 
-        older_than_threshold = np.where([p[2] <= latest_good_time for p in self._recent_points])
-        older_than_threshold = older_than_threshold[0]
-        if len(older_than_threshold) >= 1:
-            self._pre_recent_point = self._recent_points[older_than_threshold[-1]]
-            self._recent_points = self._recent_points[older_than_threshold[-1]+1:]
+        self._buf_x = [self._buf_x[i] for i in order] + padding
+        self._buf_y = [self._buf_y[i] for i in order] + padding
+        self._buf_t = [self._buf_t[i] for i in order] + padding
+        self._buf_dist = [self._buf_dist[i] for i in order] + padding
+
+        self._buf_capacity *= 2
+        self._tail -= self._head
+        self._heads = [head - self._head for head in self._heads]
+        self._head = 0
 
 
     #====================================================================================
@@ -123,36 +284,24 @@ class SpeedMonitor(trajtracker._TTrkObject):
     def time_in_trial(self):
         """ Time elapsed since trial started (sec) """
 
-        if self._time0 is None or len(self._recent_points) == 0:
+        if self._time0 is None or self._last_point is None:
             return None
 
-        return self._recent_points[-1][2] - self._time0
+        return self._last_point[2] - self._time0
 
 
     #-------------------------------------------------------------------------
     @property
     def xspeed(self):
         """ The instantaneous X speed (mm/sec) """
-
-        if self._pre_recent_point is None:
-            return None
-
-        y1 = self._pre_recent_point[0]
-        y2 = self._recent_points[-1][0]
-        return (y2-y1) / self.last_calculation_interval
+        return self.get_xspeed()
 
 
     #-------------------------------------------------------------------------
     @property
     def yspeed(self):
         """ The instantaneous Y speed (mm/sec) """
-
-        if self._pre_recent_point is None:
-            return None
-
-        y1 = self._pre_recent_point[1]
-        y2 = self._recent_points[-1][1]
-        return (y2-y1) / self.last_calculation_interval
+        return self.get_yspeed()
 
 
     #-------------------------------------------------------------------------
@@ -161,23 +310,144 @@ class SpeedMonitor(trajtracker._TTrkObject):
         """
         The instantaneous speed (mm/sec) - for this calculation we consider the full distance traveled by the mouse/finger
         """
-
-        if self._pre_recent_point is None:
-            return None
-
-        distance = sum([loc[3] for loc in self._recent_points])
-        return distance / self.last_calculation_interval
+        return self.get_xyspeed()
 
 
     #-------------------------------------------------------------------------
     @property
     def last_calculation_interval(self):
         """ The time interval (sec) used for the last calculation of speed & direction """
+        return self.get_last_calculation_interval()
+
+
+    #-------------------------------------------------------------------------
+    def get_xspeed(self, interval=None):
+        """
+        The instantaneous X speed (mm/sec)
 
-        if self._pre_recent_point is None:
+        :param interval: One of the :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`
+                         (None = :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`)
+        """
+        pre_point = self._pre_recent_points[self._interval_index(interval, "get_xspeed")]
+        if pre_point is None:
             return None
-        else:
-            return self._recent_points[-1][2] - self._pre_recent_point[2]
+
+        return (self._last_point[0] - pre_point[0]) / (self._last_point[2] - pre_point[2])
+
+
+    #-------------------------------------------------------------------------
+    def get_yspeed(self, interval=None):
+        """
+        The instantaneous Y speed (mm/sec)
+
+        :param interval: One of the :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`
+                         (None = :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`)
+        """
+        pre_point = self._pre_recent_points[self._interval_index(interval, "get_yspeed")]
+        if pre_point is None:
+            return None
+
+        return (self._last_point[1] - pre_point[1]) / (self._last_point[2] - pre_point[2])
+
+
+    #-------------------------------------------------------------------------
+    def get_xyspeed(self, interval=None):
+        """
+        The instantaneous speed (mm/sec) - for this calculation we consider the full distance traveled by the mouse/finger
+
+        :param interval: One of the :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`
+                         (None = :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`)
+        """
+        pre_point = self._pre_recent_points[self._interval_index(interval, "get_xyspeed")]
+        if pre_point is None:
+            return None
+
+        return (self._last_point[3] - pre_point[3]) / (self._last_point[2] - pre_point[2])
+
+
+    #-------------------------------------------------------------------------
+    def get_last_calculation_interval(self, interval=None):
+        """
+        The time interval (sec) used for the last calculation of speed & direction
+
+        :param interval: One of the :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`
+                         (None = :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`)
+        """
+        pre_point = self._pre_recent_points[self._interval_index(interval, "get_last_calculation_interval")]
+        if pre_point is None:
+            return None
+
+        return self._last_point[2] - pre_point[2]
+
+
+    #-------------------------------------------------------------------------
+    def _interval_index(self, interval, func_name):
+
+        if interval is None:
+            return 0
+
+        try:
+            return self._calculation_intervals.index(interval)
+        except ValueError:
+            raise ValueError("trajtracker error: {:}.{:}() was called with interval={:}, which is not one of the calculation_intervals ({:})".format(
+                type(self).__name__, func_name, interval, ", ".join(str(i) for i in self._calculation_intervals)))
+
+
+    #====================================================================================
+    #   Offline API
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    def compute_profile(self, x, y, t, interval=None):
+        """
+        Compute the speed at each sample of a whole trajectory (e.g., of a saved trial).
+
+        The result is identical to calling :func:`~trajtracker.movement.SpeedMonitor.update_xyt` for each sample
+        (after :func:`~trajtracker.movement.SpeedMonitor.reset`) and reading the speed after each call,
+        but the calculation is vectorized. This object's state is not changed.
+
+        :param x: Array of x coordinates
+        :param y: Array of y coordinates
+        :param t: Array of time points (in increasing order)
+        :param interval: One of the :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`
+                         (None = :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`)
+        :return: 4 numpy arrays, with one value per sample: xspeed, yspeed, xyspeed, last_calculation_interval.
+                 Samples for which the speed is not available yet (None in the online API) are NaN.
+        """
+
+        interval = self._calculation_intervals[self._interval_index(interval, "compute_profile")]
+
+        x = np.asarray(x, dtype=float) / self._units_per_mm
+        y = np.asarray(y, dtype=float) / self._units_per_mm
+        t = np.asarray(t, dtype=float)
+
+        if not (x.ndim == y.ndim == t.ndim == 1) or not (len(x) == len(y) == len(t)):
+            raise ValueError("trajtracker error: {:}.compute_profile() expects 3 one-dimensional arrays of the same length".format(type(self).__name__))
+        if np.any(np.diff(t) < 0):
+            raise ValueError("trajtracker error: {:}.compute_profile() was called with time points that are not in increasing order".format(type(self).__name__))
+
+        n = len(t)
+
+        #-- The cumulative distance traveled up to each sample
+        cum_distance = np.zeros(n)
+        if n > 1:
+            np.cumsum(np.sqrt(np.diff(x) ** 2 + np.diff(y) ** 2), out=cum_distance[1:])
+
+        #-- For each sample, the newest earlier sample that is at least calculation_interval older
+        pre_index = np.minimum(np.searchsorted(t, t - interval, side='right'), np.arange(n)) - 1
+        has_pre = pre_index >= 0
+        curr = np.flatnonzero(has_pre)
+        pre = pre_index[has_pre]
+
+        xspeed, yspeed, xyspeed, calc_interval = np.full((4, n), np.nan)
+
+        calc_interval[curr] = t[curr] - t[pre]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xspeed[curr] = (x[curr] - x[pre]) / calc_interval[curr]
+            yspeed[curr] = (y[curr] - y[pre]) / calc_interval[curr]
+            xyspeed[curr] = (cum_distance[curr] - cum_distance[pre]) / calc_interval[curr]
+
+        return xspeed, yspeed, xyspeed, calc_interval
 
 
     #====================================================================================
@@ -207,13 +477,48 @@ class SpeedMonitor(trajtracker._TTrkObject):
         """
         The time interval (in seconds) over which calculations are performed.
         Use shorter time period if available
+
+        This is the first of the :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals`
         """
-        return self._calculation_interval
+        return self._calculation_intervals[0]
 
 
     @calculation_interval.setter
     def calculation_interval(self, value):
         _u.validate_attr_type(self, "calculation_interval", value, numbers.Number)
         _u.validate_attr_not_negative(self, "calculation_interval", value)
-        self._calculation_interval = value
+        intervals = getattr(self, "_calculation_intervals", ())
+        self._set_calculation_intervals((value,) + intervals[1:])
         self._log_setter("calculation_interval")
+
+
+    #-------------------------------------------------------------------------
+    @property
+    def calculation_intervals(self):
+        """
+        The time intervals (in seconds) over which calculations are performed (a tuple).
+        The speed over each interval can be obtained with :func:`~trajtracker.movement.SpeedMonitor.get_xspeed` etc.
+        The first interval is the default one (:attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`).
+
+        All intervals are computed from the same recent samples. The monitor keeps the samples of the longest
+        interval, and each update costs O(1) (amortized) per interval.
+        """
+        return self._calculation_intervals
+
+
+    @calculation_intervals.setter
+    def calculation_intervals(self, value):
+        _u.validate_attr_anylist(self, "calculation_intervals", value, min_length=1)
+        for interval in value:
+            _u.validate_attr_type(self, "calculation_intervals", interval, numbers.Number)
+            _u.validate_attr_not_negative(self, "calculation_intervals", interval)
+        self._set_calculation_intervals(tuple(value))
+        self._log_setter("calculation_intervals")
+
+
+    #-------------------------------------------------------------------------
+    # If the intervals change in the middle of a trial, they all start from the oldest sample still remembered
+    #
+    def _set_calculation_intervals(self, intervals):
+        self._calculation_intervals = intervals
+        self._init_interval_heads()
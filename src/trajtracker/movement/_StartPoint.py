@@ -118,8 +118,9 @@ class StartPoint(trajtracker._TTrkObject):
                  None - if the finger/mouse didn't cause any change in the "start" state
         """
 
-        _u.validate_func_arg_type(self, "check_xy", "x_coord", x_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "check_xy", "y_coord", y_coord, numbers.Number)
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "check_xy", "x_coord", x_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "check_xy", "y_coord", y_coord, numbers.Number)
 
         if self._state == self.State.reset:
             #-- Trial not initialized yet: waiting for a touch inside start_area
@@ -6,18 +6,21 @@ Trajectory Tracker: track mouse/finger movement
 @copyright: Copyright (c) 2017, Dror Dotan
 """
 
-import numbers
+from __future__ import division
 
-import expyriment
+import numbers
+from enum import Enum
 
 import trajtracker
 import trajtracker._utils as _u
+import trajtracker.data
+from trajtracker.movement._SampleBuffer import SampleBuffer
 
 
 # noinspection PyAttributeOutsideInit
 class TrajectoryTracker(trajtracker._TTrkObject):
     """
-    Track mouse/finger trajectory and save results to a CSV file.
+    Track mouse/finger trajectory and save results to a file (CSV, binary, or compressed).
 
      **How to use this class:**
 
@@ -27,8 +30,11 @@ class TrajectoryTracker(trajtracker._TTrkObject):
       enable/disable tracking during a trial
     - Call :func:`~trajtracker.movement.TrajectoryTracker.update_xyt` whenever the finger/mouse moves
     - Call :func:`~trajtracker.movement.TrajectoryTracker.save_to_file` when the trial ends
+    - Call :func:`~trajtracker.movement.TrajectoryTracker.close_output_file` when the experiment ends
     """
 
+    FileFormat = Enum("FileFormat", "CSV Binary Compressed")
+
 
     #----------------------------------------------------
     def __init__(self, filename=None):
@@ -38,6 +44,13 @@ class TrajectoryTracker(trajtracker._TTrkObject):
         :param filename: See :attr:`~trajtracker.movement.TrajectoryTracker.filename` (default=None).
         """
         super(TrajectoryTracker, self).__init__()
+        self._trajectory = SampleBuffer(3)
+        self._writer = None
+        self._journal = None
+        self._resampling_interval = None
+        self._min_distance = 0
+        self._drop_duplicates = False
+        self._trial_summary = None
         self.reset(False)
         self._filename = filename
         self.tracking_active = False
@@ -59,6 +72,81 @@ class TrajectoryTracker(trajtracker._TTrkObject):
         self._log_setter("tracking_active")
 
 
+    #----------------------------------------------------
+    @property
+    def resampling_interval(self):
+        """
+        If set (to a positive number), the trajectory is resampled to a fixed rate while it is being tracked:
+        a point is saved every resampling_interval seconds (starting from the first tracked point). The
+        coordinates in each of these time points are linearly interpolated between the tracked points
+        before and after it.
+
+        None (default) = save the tracked points as they are.
+        """
+        return self._resampling_interval
+
+    @resampling_interval.setter
+    def resampling_interval(self, value):
+        _u.validate_attr_numeric(self, "resampling_interval", value, none_value=_u.NoneValues.Valid)
+        _u.validate_attr_positive(self, "resampling_interval", value)
+        self._resampling_interval = value
+        self._log_setter("resampling_interval")
+
+
+    #----------------------------------------------------
+    @property
+    def min_distance(self):
+        """
+        Points whose distance from the last saved point is smaller than this value (in the units of
+        :func:`~trajtracker.movement.TrajectoryTracker.update_xyt`) are not saved.
+        This filter is applied after resampling (see :attr:`~trajtracker.movement.TrajectoryTracker.resampling_interval`).
+
+        Default: 0 (no filtering)
+        """
+        return self._min_distance
+
+    @min_distance.setter
+    def min_distance(self, value):
+        _u.validate_attr_numeric(self, "min_distance", value)
+        _u.validate_attr_not_negative(self, "min_distance", value)
+        self._min_distance = value
+        self._log_setter("min_distance")
+
+
+    #----------------------------------------------------
+    @property
+    def drop_duplicates(self):
+        """
+        Whether points with exactly the same coordinates as the last saved point are not saved (bool).
+        This filter is applied after resampling (see :attr:`~trajtracker.movement.TrajectoryTracker.resampling_interval`).
+
+        Default: False
+        """
+        return self._drop_duplicates
+
+    @drop_duplicates.setter
+    def drop_duplicates(self, value):
+        _u.validate_attr_type(self, "drop_duplicates", value, bool)
+        self._drop_duplicates = value
+        self._log_setter("drop_duplicates")
+
+
+    #----------------------------------------------------
+    @property
+    def trial_summary(self):
+        """
+        A :class:`~trajtracker.movement.TrialSummary` that is updated with each saved point, and reset
+        in :func:`~trajtracker.movement.TrajectoryTracker.reset`. None (default) = no summary.
+        """
+        return self._trial_summary
+
+    @trial_summary.setter
+    def trial_summary(self, value):
+        _u.validate_attr_type(self, "trial_summary", value, trajtracker.movement.TrialSummary, none_allowed=True)
+        self._trial_summary = value
+        self._log_setter("trial_summary")
+
+
     #----------------------------------------------------
     def reset(self, tracking_active=None):
         """
@@ -69,10 +157,30 @@ class TrajectoryTracker(trajtracker._TTrkObject):
         if tracking_active is not None:
             self.tracking_active = tracking_active
 
-        self._trajectory = {'x' : [], 'y' : [], 'time' : []}
+        self._clear_trajectory()
+
+        if self._trial_summary is not None:
+            self._trial_summary.reset()
 
-        if self._log_level:
-            expyriment._active_exp._event_file_log("Trajectory,Reset", 1)
+        if self._log_debug_on:
+            self._log(self.log_debug, "Trajectory,Reset")
+
+    #----------------------------------------------------
+    # Forget the tracked points, and the state that refers to them (resampling, duplicate filtering, journal)
+    #
+    def _clear_trajectory(self):
+        self._trajectory.clear()
+        self._prev_tracked_point = None
+        self._next_resampling_time = None
+        self._last_saved_x = None
+        self._last_saved_y = None
+
+        if self._journal is not None:
+            self._journal.clear()
+            self._n_journaled = 0
+            self._journal_chunk_start_time = None
+        if self._event_log is not None:
+            self._event_log.write(self._event_log_id, trajtracker.data.EventLog.ev_reset)
 
     #----------------------------------------------------
     def update_xyt(self, x_coord, y_coord, time):
@@ -84,17 +192,74 @@ class TrajectoryTracker(trajtracker._TTrkObject):
         if not self._tracking_active:
             return
 
-        _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
-        _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
-        _u.validate_func_arg_not_negative(self, "update_xyt", "time", time)
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
+            _u.validate_func_arg_not_negative(self, "update_xyt", "time", time)
+
+        if self._resampling_interval is None:
+            self._save_point(x_coord, y_coord, time)
+        else:
+            self._resample(x_coord, y_coord, time)
+
+        if self._log_trace_on:
+            self._log(self.log_trace, "Trajectory,Track_xyt,{0},{1},{2}", x_coord, y_coord, time)
+        if self._event_log is not None:
+            self._event_log.write(self._event_log_id, trajtracker.data.EventLog.ev_track_xyt, x_coord, y_coord, time)
+
+    #----------------------------------------------------
+    # Save the points in the fixed-rate time points between the previous tracked point and this one.
+    # The coordinates are interpolated linearly.
+    #
+    def _resample(self, x_coord, y_coord, time):
+
+        prev_point = self._prev_tracked_point
+        self._prev_tracked_point = x_coord, y_coord, time
+
+        if prev_point is None:
+            self._save_point(x_coord, y_coord, time)
+            self._resampling_time0 = time
+            self._n_resampled_points = 1
+            self._next_resampling_time = time + self._resampling_interval
+            return
+
+        prev_x, prev_y, prev_time = prev_point
 
-        self._trajectory['x'].append(x_coord)
-        self._trajectory['y'].append(y_coord)
-        self._trajectory['time'].append(time)
+        #-- _next_resampling_time is always later than prev_time, so there is no division by 0
+        while self._next_resampling_time <= time:
+            t = self._next_resampling_time
+            weight = (t - prev_time) / (time - prev_time)
+            self._save_point(prev_x + weight * (x_coord - prev_x), prev_y + weight * (y_coord - prev_y), t)
 
-        if self._log_level:
-            expyriment._active_exp._event_file_log("Trajectory,Track_xyt,{0},{1},{2}".format(x_coord, y_coord, time), 2)
+            #-- Multiply rather than accumulate, to avoid accumulating rounding errors
+            self._n_resampled_points += 1
+            self._next_resampling_time = self._resampling_time0 + self._n_resampled_points * self._resampling_interval
+
+    #----------------------------------------------------
+    def _save_point(self, x_coord, y_coord, time):
+
+        if self._last_saved_x is not None:
+            dx = x_coord - self._last_saved_x
+            dy = y_coord - self._last_saved_y
+            if self._drop_duplicates and dx == 0 and dy == 0:
+                return
+            if self._min_distance > 0 and dx ** 2 + dy ** 2 < self._min_distance ** 2:
+                return
+
+        self._last_saved_x = x_coord
+        self._last_saved_y = y_coord
+        self._trajectory.append(x_coord, y_coord, time)
+
+        if self._trial_summary is not None:
+            self._trial_summary.update_xyt(x_coord, y_coord, time)
+
+        if self._journal is not None:
+            if self._journal_chunk_start_time is None:
+                self._journal_chunk_start_time = time
+            if len(self._trajectory) - self._n_journaled >= self._journal_chunk_size or \
+                    time - self._journal_chunk_start_time >= self._journal_chunk_interval:
+                self._write_journal_chunk()
 
     #----------------------------------------------------
     def get_xyt(self):
@@ -102,58 +267,203 @@ class TrajectoryTracker(trajtracker._TTrkObject):
         Get a list of (x,y,time) tuples - one per tracked point
         """
         trj = self._trajectory
-        return zip(trj['x'], trj['y'], trj['time'])
+        return zip(trj.column_as_list(0), trj.column_as_list(1), trj.column_as_list(2))
+
+    #----------------------------------------------------
+    def get_arrays(self):
+        """
+        Get the tracked points as 3 numpy arrays: x, y, time.
+
+        The arrays are views on the tracker's internal buffer, not copies. They remain valid only
+        until the next call to :func:`~trajtracker.movement.TrajectoryTracker.reset` or
+        :func:`~trajtracker.movement.TrajectoryTracker.update_xyt` - copy them if you need them longer.
+        """
+        trj = self._trajectory
+        return trj.column(0), trj.column(1), trj.column(2)
 
     #----------------------------------------------------
-    def init_output_file(self, filename, xy_precision=5, time_precision=3):
+    def init_output_file(self, filename, xy_precision=5, time_precision=3, file_format=FileFormat.CSV,
+                         async_save=False, async_queue_size=trajtracker.data.AsyncTrajectoryWriter.default_queue_size,
+                         save_index=False, compression='zlib'):
         """
-        Initialize a new CSV output file for saving the results
+        Initialize a new output file for saving the results. If another output file was open, it is closed.
 
         :param filename: Full path
-        :param xy_precision: Precision of x,y coordinates (default: 5)
-        :param time_precision: Precision of time (default: 3)
+        :param xy_precision: Precision of x,y coordinates (default: 5). Relevant only for CSV and compressed files.
+        :param time_precision: Precision of time (default: 3). Relevant only for CSV and compressed files.
+        :param file_format: TrajectoryTracker.FileFormat.CSV (a text file, see :class:`~trajtracker.data.CsvTrajectoryWriter`),
+                            TrajectoryTracker.FileFormat.Binary (see :class:`~trajtracker.data.BinaryTrajectoryWriter`),
+                            or TrajectoryTracker.FileFormat.Compressed (see :class:`~trajtracker.data.CompressedTrajectoryWriter`)
+        :param async_save: If True, :func:`~trajtracker.movement.TrajectoryTracker.save_to_file` will only queue the
+                           trial, and the file will be written by a background thread
+                           (see :class:`~trajtracker.data.AsyncTrajectoryWriter`). Errors in writing are raised by the
+                           next call to save_to_file(), flush_output_file() or close_output_file().
+        :param async_queue_size: The maximal number of trials waiting to be written (relevant only when async_save=True).
+                                 When the queue is full, save_to_file() waits.
+        :param save_index: Whether to create an index file, for fast loading of specific trials with
+                           :func:`~trajtracker.data.load_trials`. Relevant only for CSV files.
+        :param compression: 'zlib' or 'bz2'. Relevant only for compressed files.
         """
+        _u.validate_func_arg_type(self, "init_output_file", "file_format", file_format, self.FileFormat)
+
+        self.close_output_file()
+
         self._filename = filename
         self._xy_precision = xy_precision
         self._time_precision = time_precision
 
-        fh = self._open_file(filename, 'w')
-        fh.write('trial,time,x,y\n')
-        fh.close()
+        if file_format == self.FileFormat.CSV:
+            self._writer = trajtracker.data.CsvTrajectoryWriter(filename, xy_precision, time_precision,
+                                                                open_file=self._open_file, save_index=save_index)
+        elif file_format == self.FileFormat.Binary:
+            self._writer = trajtracker.data.BinaryTrajectoryWriter(filename, open_file=self._open_file)
+        else:
+            self._writer = trajtracker.data.CompressedTrajectoryWriter(filename, xy_precision, time_precision,
+                                                                       compression=compression, open_file=self._open_file)
+
+        if async_save:
+            self._writer = trajtracker.data.AsyncTrajectoryWriter(self._writer, async_queue_size)
 
-        if self._log_level:
-            expyriment._active_exp._event_file_log(
-                "Trajectory,InitOutputFile,%s" % self._filename, 2)
+        if self._log_info_on:
+            self._log(self.log_info, "Trajectory,InitOutputFile,{0}", self._filename)
 
     #----------------------------------------------------
     def save_to_file(self, trial_num):
         """
-        Save the tracked trajectory (ever since the last reset() call) to a CSV file
+        Save the tracked trajectory (ever since the last reset() call) to the output file
 
         :param trial_num:
         :return: The number of rows printed to the file
         """
-        if self._filename is None:
+        if self._writer is None:
             raise trajtracker.InvalidStateError('TrajectoryTracker.save_to_file() was called before calling init_output_file()')
 
-        fh = self._open_file(self._filename, 'a')
+        trj = self._trajectory
+        x, y, t = self.get_arrays()
+        n_rows = self._writer.write_trial(trial_num, x, y, t, trj.column_int_flags(0), trj.column_int_flags(1))
+
+        if self._log_debug_on:
+            self._log(self.log_debug, "Trajectory,SavedTrial,{0},{1},{2}", self._filename, trial_num, n_rows)
+
+        return n_rows
+
+    #----------------------------------------------------
+    def flush_output_file(self):
+        """
+        Make sure that all trials saved so far were written to the output file.
+        When saving asynchronously, this waits until the background thread has written all queued trials.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    #----------------------------------------------------
+    def close_output_file(self):
+        """
+        Close the output file (if one is open). Call this when the experiment ends.
+        When saving asynchronously, this first waits until all queued trials were written.
+        """
+        if self._writer is None:
+            return
+
+        writer = self._writer
+        self._writer = None
+        writer.close()
+
+    #----------------------------------------------------
+    def init_journal(self, filename, chunk_size=256, chunk_interval=0.1, overwrite=False):
+        """
+        Start journaling: the points tracked in the current trial are copied, in chunks, to a memory-mapped
+        journal file (see :class:`~trajtracker.data.TrajectoryJournal`). If the experiment process crashes,
+        you lose at most the last chunk; use :func:`~trajtracker.movement.TrajectoryTracker.recover_journal`
+        to read the trial from the journal.
+
+        Journaling involves no system calls during the trial (except when the journal file has to grow).
+
+        :param filename: The journal file's full path
+        :param chunk_size: Copy the points to the journal whenever this number of points was accumulated
+        :param chunk_interval: Copy the points to the journal whenever this time (in seconds, in the time units
+                               of :func:`~trajtracker.movement.TrajectoryTracker.update_xyt`) has passed
+                               since the first point that was not copied yet
+        :param overwrite: Whether to overwrite an existing journal file that contains points. By default, this
+                          raises an InvalidStateError, so that the journal of a crashed session is not lost:
+                          call :func:`~trajtracker.movement.TrajectoryTracker.recover_journal` first.
+        """
+        _u.validate_func_arg_type(self, "init_journal", "chunk_size", chunk_size, int)
+        _u.validate_func_arg_positive(self, "init_journal", "chunk_size", chunk_size)
+        _u.validate_func_arg_type(self, "init_journal", "chunk_interval", chunk_interval, numbers.Number)
+        _u.validate_func_arg_not_negative(self, "init_journal", "chunk_interval", chunk_interval)
+
+        self.close_journal()
 
-        rows = self.get_xyt()
-        for x, y, t in rows:
-            x = ('%d' % x) if isinstance(x, int) else '%.*f' % (self._xy_precision, x)
-            y = ('%d' % y) if isinstance(y, int) else '%.*f' % (self._xy_precision, y)
-            fh.write("%d,%.*f,%s,%s\n" % (trial_num, self._time_precision, t, x, y))
+        self._journal = trajtracker.data.TrajectoryJournal(filename, overwrite=overwrite)
+        self._journal_chunk_size = chunk_size
+        self._journal_chunk_interval = chunk_interval
 
-        fh.close()
+        #-- Points tracked before journaling started are written too
+        self._n_journaled = 0
+        self._journal_chunk_start_time = None
+        if len(self._trajectory) > 0:
+            self._write_journal_chunk()
 
-        if self._log_level:
-            expyriment._active_exp._event_file_log(
-                "Trajectory,SavedTrial,%s,%d,%d" % (self._filename, trial_num, len(rows)), 2)
+    #----------------------------------------------------
+    def close_journal(self):
+        """
+        Stop journaling (if it was initialized). The journal file is not deleted.
+        """
+        if self._journal is None:
+            return
 
-        return len(rows)
+        self._write_journal_chunk()
+        self._journal.close()
+        self._journal = None
+
+    #----------------------------------------------------
+    def _write_journal_chunk(self):
+        trj = self._trajectory
+        start = self._n_journaled
+        end = len(trj)
+        if end > start:
+            self._journal.write_samples(trj.column(0)[start:end], trj.column(1)[start:end], trj.column(2)[start:end],
+                                        trj.column_is_int(0) or trj.column_int_mask(0, start, end),
+                                        trj.column_is_int(1) or trj.column_int_mask(1, start, end))
+        self._n_journaled = end
+        self._journal_chunk_start_time = None
+
+    #----------------------------------------------------
+    def recover_journal(self, filename):
+        """
+        Load the points saved in a journal file (e.g., after a crash) as the current trial's trajectory.
+        Any points tracked so far are discarded. Afterwards, you can call
+        :func:`~trajtracker.movement.TrajectoryTracker.save_to_file` to save the recovered trial.
+        If journaling is active, the journal is restarted with the recovered points.
+
+        :param filename: The journal file's full path
+        :return: The number of points recovered
+        """
+        journal_data = trajtracker.data.TrajectoryJournal.recover(filename)
+
+        self._clear_trajectory()
+        x = _values_as_list(journal_data['x'], journal_data['x_is_int'])
+        y = _values_as_list(journal_data['y'], journal_data['y_is_int'])
+        for xyt in zip(x, y, journal_data['time'].tolist()):
+            self._trajectory.append(*xyt)
+
+        if self._journal is not None:
+            self._write_journal_chunk()
+
+        return len(self._trajectory)
 
     #----------------------------------------------------
     # Default implementation for opening an output file
     #
     def _open_file(self, filename, mode):
         return open(filename, mode)
+
+
+#----------------------------------------------------
+# Values read from a file, as a list; the values flagged as integers are converted to int
+#
+def _values_as_list(values, is_int):
+    if is_int.all():
+        return values.astype(int).tolist()
+    return [int(v) if i else v for v, i in zip(values.tolist(), is_int.tolist())]
@@ -0,0 +1,302 @@
+"""
+
+Trial summary: statistics of the trial's trajectory, updated as the trajectory is tracked
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+from __future__ import division
+
+from collections import OrderedDict
+import math
+import numbers
+
+import trajtracker
+import trajtracker._utils as _u
+from trajtracker.movement import SpeedMonitor
+
+
+class TrialSummary(trajtracker._TTrkObject):
+    """
+    Summary statistics of a trial's trajectory: path length, peak speed (and when it happened),
+    maximal lateral deviation from the start-end line, and movement onset time.
+
+    The statistics are updated with each sample, so they are available as soon as the trial ends -
+    without going over the trajectory again. Call :func:`~trajtracker.movement.TrialSummary.update_xyt` for each
+    sample yourself, or attach the summary to a :class:`~trajtracker.movement.TrajectoryTracker`
+    (see :attr:`~trajtracker.movement.TrajectoryTracker.trial_summary`), which updates it with each saved point.
+
+    All distances are in mm, and speeds are in mm/sec.
+    """
+
+    #-- The number of points accumulated before the convex hull of the trajectory is recomputed
+    _min_pending_points = 64
+
+
+    #-------------------------------------------------------------------------
+    def __init__(self, units_per_mm=1, calculation_interval=0, onset_distance=0, speed_monitor=None):
+        """
+        Constructor
+
+        :param units_per_mm: The ratio of units (provided in the call to :func:`~trajtracker.movement.TrialSummary.update_xyt`) per mm
+        :param calculation_interval: The time interval for computing the speed (see
+                                     :attr:`~trajtracker.movement.SpeedMonitor.calculation_interval`).
+                                     Ignored if speed_monitor is provided.
+        :param onset_distance: See :attr:`~trajtracker.movement.TrialSummary.onset_distance`
+        :param speed_monitor: A :class:`~trajtracker.movement.SpeedMonitor` for computing the speed (optional).
+                              The monitor can be shared with other objects (e.g. validators).
+        """
+        super(TrialSummary, self).__init__()
+
+        _u.validate_func_arg_type(self, "__init__", "units_per_mm", units_per_mm, numbers.Number)
+        _u.validate_func_arg_positive(self, "__init__", "units_per_mm", units_per_mm)
+        self._units_per_mm = units_per_mm
+
+        self._owns_monitor = speed_monitor is None
+        if speed_monitor is None:
+            speed_monitor = SpeedMonitor(units_per_mm, calculation_interval)
+        else:
+            _u.validate_func_arg_type(self, "__init__", "speed_monitor", speed_monitor, SpeedMonitor)
+        self._speed_monitor = speed_monitor
+
+        self.onset_distance = onset_distance
+
+        self.reset()
+
+
+    #-------------------------------------------------------------------------
+    def _internal_objects(self):
+        return (self._speed_monitor,) if self._owns_monitor else ()
+
+
+    #====================================================================================
+    #   Runtime API - update movement
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    def reset(self):
+        """
+        Called when a trial starts - forget the previous trial.
+        A speed monitor that was provided to the constructor is not reset (its owner resets it).
+        """
+        if self._owns_monitor:
+            self._speed_monitor.reset()
+
+        self._n_samples = 0
+        self._start = None
+        self._last = None
+        self._path_length = 0
+        self._peak_speed = None
+        self._peak_speed_time = None
+        self._onset_time = None
+
+        #-- The convex hull of the trajectory (for computing the maximal deviation), and points not yet in the hull
+        self._hull = []
+        self._pending_points = []
+
+
+    #-------------------------------------------------------------------------
+    # noinspection PyIncorrectDocstring
+    def update_xyt(self, x_coord, y_coord, time):
+        """
+        Call this method for each sample in the trajectory
+        """
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "update_xyt", "x_coord", x_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "y_coord", y_coord, numbers.Number)
+            _u.validate_func_arg_type(self, "update_xyt", "time", time, numbers.Number)
+
+        #-- _n_samples is the sample's sequence number, in case the monitor is shared
+        self._speed_monitor.update_xyt(x_coord, y_coord, time, self._n_samples)
+        self._update(x_coord / self._units_per_mm, y_coord / self._units_per_mm, time)
+
+
+    #-------------------------------------------------------------------------
+    def update_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.movement.TrialSummary.update_xyt`, for a sample that was already preprocessed
+        by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        """
+        self._speed_monitor.update_sample(sample)
+        if sample.units_per_mm == self._units_per_mm:
+            self._update(sample.x_mm, sample.y_mm, sample.time)
+        else:
+            self._update(sample.x / self._units_per_mm, sample.y / self._units_per_mm, sample.time)
+
+
+    #-------------------------------------------------------------------------
+    # Update the statistics with a sample (in mm)
+    #
+    def _update(self, x, y, time):
+
+        if self._start is None:
+            self._start = x, y, time
+        else:
+            last_x, last_y, last_time = self._last
+            self._path_length += math.sqrt((x - last_x) ** 2 + (y - last_y) ** 2)
+
+        self._last = x, y, time
+        self._n_samples += 1
+
+        #-- Movement onset
+        if self._onset_time is None:
+            start_x, start_y, start_time = self._start
+            if (x - start_x) ** 2 + (y - start_y) ** 2 > self._onset_distance ** 2:
+                self._onset_time = time
+
+        #-- Peak speed
+        speed = self._speed_monitor.xyspeed
+        if speed is not None and (self._peak_speed is None or speed > self._peak_speed):
+            self._peak_speed = speed
+            self._peak_speed_time = time
+
+        #-- Points for the convex hull. The hull is updated once in a while, so the amortized cost per sample
+        #-- is small, and only the hull's vertices are kept.
+        self._pending_points.append((x, y))
+        if len(self._pending_points) >= max(self._min_pending_points, len(self._hull)):
+            self._update_hull()
+
+
+    #-------------------------------------------------------------------------
+    def _update_hull(self):
+        if len(self._pending_points) > 0:
+            self._hull = _convex_hull(self._hull + self._pending_points)
+            self._pending_points = []
+
+
+    #====================================================================================
+    #   Runtime API - get info
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    @property
+    def n_samples(self):
+        """ The number of samples since the last reset """
+        return self._n_samples
+
+    #-------------------------------------------------------------------------
+    @property
+    def path_length(self):
+        """ The total distance traveled (mm) """
+        return self._path_length
+
+    #-------------------------------------------------------------------------
+    @property
+    def peak_speed(self):
+        """ The maximal speed (mm/sec) - see :attr:`~trajtracker.movement.SpeedMonitor.xyspeed`. None if unknown. """
+        return self._peak_speed
+
+    #-------------------------------------------------------------------------
+    @property
+    def peak_speed_time(self):
+        """ The time of the sample where the maximal speed was observed (None if unknown) """
+        return self._peak_speed_time
+
+    #-------------------------------------------------------------------------
+    @property
+    def onset_time(self):
+        """
+        The time of the first sample that is more than :attr:`~trajtracker.movement.TrialSummary.onset_distance` away
+        from the trial's first sample (None if there was no such sample)
+        """
+        return self._onset_time
+
+    #-------------------------------------------------------------------------
+    @property
+    def max_deviation(self):
+        """
+        The maximal distance (mm) of the trajectory from the straight line between its first and last samples
+        (None if there were no samples). If the first and last samples are at the same place, this is the maximal
+        distance from that place.
+        """
+        if self._start is None:
+            return None
+
+        self._update_hull()
+
+        start_x, start_y, start_time = self._start
+        dx = self._last[0] - start_x
+        dy = self._last[1] - start_y
+        line_length = math.sqrt(dx ** 2 + dy ** 2)
+
+        #-- The maximal distance from a line (or a point) is obtained at a vertex of the convex hull
+        if line_length == 0:
+            return max(math.sqrt((x - start_x) ** 2 + (y - start_y) ** 2) for x, y in self._hull)
+        else:
+            return max(abs(dx * (y - start_y) - dy * (x - start_x)) for x, y in self._hull) / line_length
+
+
+    #-------------------------------------------------------------------------
+    def get_summary(self):
+        """
+        Get all statistics, e.g. for saving a summary row per trial
+
+        :return: An OrderedDict with the entries n_samples, path_length, peak_speed, peak_speed_time,
+                 max_deviation, onset_time
+        """
+        return OrderedDict([('n_samples', self.n_samples),
+                            ('path_length', self.path_length),
+                            ('peak_speed', self.peak_speed),
+                            ('peak_speed_time', self.peak_speed_time),
+                            ('max_deviation', self.max_deviation),
+                            ('onset_time', self.onset_time)])
+
+
+    #====================================================================================
+    #   Configure
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    @property
+    def units_per_mm(self):
+        """
+        The ratio of units (provided in the call to :func:`~trajtracker.movement.TrialSummary.update_xyt`) per mm
+        """
+        return self._units_per_mm
+
+    #-------------------------------------------------------------------------
+    @property
+    def onset_distance(self):
+        """
+        The movement onset is when the finger/mouse moves more than this distance (in mm) from its position in the
+        trial's first sample. Default: 0 (any movement)
+        """
+        return self._onset_distance
+
+    @onset_distance.setter
+    def onset_distance(self, value):
+        _u.validate_attr_numeric(self, "onset_distance", value)
+        _u.validate_attr_not_negative(self, "onset_distance", value)
+        self._onset_distance = value
+        self._log_setter("onset_distance")
+
+
+#--------------------------------------------------------------------------
+# The convex hull of a list of (x, y) points (Andrew's monotone chain algorithm).
+# Returns the hull's vertices
+#
+def _convex_hull(points):
+
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+
+    return lower[:-1] + upper[:-1]
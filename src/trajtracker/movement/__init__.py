@@ -12,7 +12,9 @@ TrajTracker - movement package
 from _CircularTrajectoryGenerator import CircularTrajectoryGenerator
 from _CustomTrajectoryGenerator import CustomTrajectoryGenerator
 from _DirectionMonitor import DirectionMonitor
+from _MotionState import MotionState, MotionSample
 from _SpeedMonitor import SpeedMonitor
 from _StartPoint import StartPoint
 from _StimulusAnimator import StimulusAnimator
 from _TrajectoryTracker import TrajectoryTracker
+from _TrialSummary import TrialSummary
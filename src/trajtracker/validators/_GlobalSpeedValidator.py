@@ -8,6 +8,7 @@ Validator for minimal/maximal global speed
 
 from __future__ import division
 
+import bisect
 from enum import Enum
 import numbers
 import numpy as np
@@ -78,20 +79,21 @@ class GlobalSpeedValidator(_BaseValidator):
         self.axis = axis
         self.grace_period = grace_period
 
+        self._max_trial_duration = None
+        self._origin_coord = None
+        self._end_coord = None
+
         if milestones is None:
             self.milestones = [self.Milestone(1, 1)]
         else:
             self.milestones = milestones
 
-        self._max_trial_duration = None
         if max_trial_duration is not None:
             self.max_trial_duration = max_trial_duration
 
-        self._origin_coord = None
         if origin_coord is not None:
             self.origin_coord = origin_coord
 
-        self._end_coord = None
         if end_coord is not None:
             self.end_coord = end_coord
 
@@ -135,6 +137,25 @@ class GlobalSpeedValidator(_BaseValidator):
         """
 
         self._check_xyt_validate_and_log(x_coord, y_coord, time)
+        return self._check_progress(x_coord, y_coord, time)
+
+
+    #----------------------------------------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.validators.GlobalSpeedValidator.check_xyt`, for a sample that was
+        already preprocessed by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, ValidationFailed if error
+        """
+        self._check_sample_log(sample)
+        return self._check_progress(sample.x, sample.y, sample.time)
+
+
+    #----------------------------------------------------------------------------------
+    def _check_progress(self, x_coord, y_coord, time):
+
         self._assert_initialized(self._origin_coord, "origin_coord")
         self._assert_initialized(self._end_coord, "end_coord")
         self._assert_initialized(self._max_trial_duration, "max_trial_duration")
@@ -190,23 +211,90 @@ class GlobalSpeedValidator(_BaseValidator):
     def get_expected_coord_at_time(self, time):
         """
         Return the minimnal coordinate (x or y, depending on axis) that should be obtained in a given time
+
+        :param time: Time from start of trial. Times before 0 are treated as 0, and times after
+                     :attr:`~trajtracker.validators.GlobalSpeedValidator.max_trial_duration` as the trial's end.
         """
 
+        times = self._breakpoint_times
+        if times is None:
+            self._assert_breakpoints_initialized("get_expected_coord_at_time")
+
+        if time >= times[-1]:
+            return self._breakpoint_coords[-1]
+
+        i = bisect.bisect_left(times, time)
+        if i == 0:
+            return self._origin_coord
+
+        i -= 1
+        return self._breakpoint_coords[i] + self._section_distances[i] * ((time - times[i]) / self._section_durations[i])
+
+
+    #----------------------------------------------------------------------------------
+    def get_expected_coords_at_times(self, times):
+        """
+        Same as :func:`~trajtracker.validators.GlobalSpeedValidator.get_expected_coord_at_time`, for several
+        time points at once - e.g., to precompute the expected coordinate in each frame of a trial.
+
+        :param times: Times from start of trial (list or array of numbers)
+        :return: numpy array of coordinates (one per time point)
+        """
+
+        if self._breakpoint_times is None:
+            self._assert_breakpoints_initialized("get_expected_coords_at_times")
+
+        times = np.asarray(times, dtype=float)
+        bp_times = np.array(self._breakpoint_times)
+
+        #-- The section of each time point: the section ends at the first breakpoint >= time
+        sections = np.clip(np.searchsorted(bp_times, times, side='left') - 1, 0, len(self._section_durations) - 1)
+
+        result = np.array(self._breakpoint_coords)[sections] + \
+                 np.array(self._section_distances)[sections] * ((times - bp_times[sections]) / np.array(self._section_durations)[sections])
+
+        result[times <= 0] = self._origin_coord
+        result[times >= bp_times[-1]] = self._breakpoint_coords[-1]
+
+        return result
+
+
+    #----------------------------------------------------------------------------------
+    # Calculate the time and coordinate at the start of each milestone section (and at the end of the last one),
+    # so that finding the expected coordinate at a given time doesn't need to go over the milestones.
+    # Called whenever one of the parameters changes.
+    #
+    def _update_breakpoints(self):
+
+        if self._origin_coord is None or self._end_coord is None or self._max_trial_duration is None:
+            self._breakpoint_times = None
+            return
+
         total_distance = self._end_coord - self._origin_coord
 
-        remaining_time = time
-        result = self._origin_coord
+        times = [0]
+        coords = [self._origin_coord]
+        durations = []
+        distances = []
+
         for milestone in self._milestones:
             ms_duration = milestone.time_percentage * self._max_trial_duration
             ms_distance = milestone.distance_percentage * total_distance
-            if remaining_time > ms_duration:
-                remaining_time -= ms_duration
-                result += ms_distance
-            else:
-                result += ms_distance * (remaining_time / ms_duration)
-                break
+            durations.append(ms_duration)
+            distances.append(ms_distance)
+            times.append(times[-1] + ms_duration)
+            coords.append(coords[-1] + ms_distance)
 
-        return result
+        self._section_durations = durations
+        self._section_distances = distances
+        self._breakpoint_coords = coords
+        self._breakpoint_times = times
+
+
+    def _assert_breakpoints_initialized(self, method_name):
+        for attr_name in "origin_coord", "end_coord", "max_trial_duration":
+            if getattr(self, attr_name) is None:
+                raise trajtracker.InvalidStateError("{:}.{:}() was called before {:} was initalized".format(type(self).__name__, method_name, attr_name))
 
     #========================================================================
     #      Configure
@@ -245,6 +333,7 @@ class GlobalSpeedValidator(_BaseValidator):
     def origin_coord(self, value):
         _u.validate_attr_numeric(self, "origin_coord", value, _u.NoneValues.Invalid)
         self._origin_coord = value
+        self._update_breakpoints()
         self._log_setter("origin_coord")
 
     #-----------------------------------------------------------------------------------
@@ -260,6 +349,7 @@ class GlobalSpeedValidator(_BaseValidator):
     def end_coord(self, value):
         _u.validate_attr_numeric(self, "end_coord", value, _u.NoneValues.Invalid)
         self._end_coord = value
+        self._update_breakpoints()
         self._log_setter("end_coord")
 
 
@@ -287,6 +377,7 @@ class GlobalSpeedValidator(_BaseValidator):
         value = _u.validate_attr_numeric(self, "max_trial_duration", value, _u.NoneValues.ChangeTo0)
         _u.validate_attr_positive(self, "max_trial_duration", value)
         self._max_trial_duration = value
+        self._update_breakpoints()
         self._log_setter("max_trial_duration")
 
     #-----------------------------------------------------------------------------------
@@ -366,6 +457,7 @@ class GlobalSpeedValidator(_BaseValidator):
                     type(self).__name__, total_distance))
 
         self._milestones = np.array(milestones)
+        self._update_breakpoints()
 
 
     #-------------------------------------------------------------
@@ -509,8 +601,9 @@ class GlobalSpeedGuide(trajtracker._TTrkObject):
             if self._guide_line is None:
                 raise trajtracker.InvalidStateError("The visual guide for {:} cannot be created because the experiment is inactive".format(GlobalSpeedValidator.__name__))
 
-        _u.validate_func_arg_type(self, "show", "coord", coord, int)
-        _u.validate_func_arg_type(self, "show", "line_mode", line_mode, self.LineMode)
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "show", "coord", coord, int)
+            _u.validate_func_arg_type(self, "show", "line_mode", line_mode, self.LineMode)
 
         self._guide_line.activate(line_mode)
 
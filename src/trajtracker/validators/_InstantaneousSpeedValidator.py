@@ -31,7 +31,7 @@ class InstantaneousSpeedValidator(_BaseValidator):
 
     #-----------------------------------------------------------------------------------
     def __init__(self, units_per_mm, axis=ValidationAxis.y, enabled=True, min_speed=None, max_speed=None,
-                 grace_period=0, calculation_interval=0, movement_monitor=None):
+                 grace_period=0, calculation_interval=None, movement_monitor=None):
         """
         Constructor
 
@@ -41,7 +41,12 @@ class InstantaneousSpeedValidator(_BaseValidator):
         :param min_speed: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.min_speed`
         :param max_speed: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.max_speed`
         :param grace_period: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.grace_period`
-        :param calculation_interval: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.calculation_interval`
+        :param calculation_interval: See :attr:`~trajtracker.validators.InstantaneousSpeedValidator.calculation_interval`.
+                                     None = 0, or the movement_monitor's calculation_interval
+        :param movement_monitor: A :class:`~trajtracker.movement.SpeedMonitor` for computing the speed (optional).
+                                 One monitor can be shared by several validators (e.g., x-axis and y-axis validators):
+                                 each sample is added to the monitor only once. The validators can use different
+                                 calculation intervals of the same monitor.
         """
 
         super(InstantaneousSpeedValidator, self).__init__(enabled=enabled)
@@ -49,8 +54,11 @@ class InstantaneousSpeedValidator(_BaseValidator):
         if not isinstance(units_per_mm, numbers.Number):
             raise ValueError(_u.ErrMsg.attr_invalid_type(self.__class__, "units_per_mm", "numeric", units_per_mm))
 
+        self._owns_monitor = movement_monitor is None
+        self._calculation_interval = None
+
         if movement_monitor is None:
-            self._speed_monitor = SpeedMonitor(units_per_mm, calculation_interval)
+            self._speed_monitor = SpeedMonitor(units_per_mm, calculation_interval or 0)
         elif isinstance(movement_monitor, SpeedMonitor):
             self._speed_monitor = movement_monitor
         else:
@@ -60,11 +68,17 @@ class InstantaneousSpeedValidator(_BaseValidator):
         self.min_speed = min_speed
         self.max_speed = max_speed
         self.grace_period = grace_period
-        self.calculation_interval = calculation_interval
+        if calculation_interval is not None:
+            self.calculation_interval = calculation_interval
 
         self.reset()
 
 
+    #-----------------------------------------------------------------------------------
+    def _internal_objects(self):
+        return (self._speed_monitor,) if self._owns_monitor else ()
+
+
     #========================================================================
     #      Validation API
     #========================================================================
@@ -78,6 +92,7 @@ class InstantaneousSpeedValidator(_BaseValidator):
         :param time0: The time when the trial starts. The grace period will be determined according to this time.
         """
         self._speed_monitor.reset(time0)
+        self._n_samples = 0
 
 
     #-----------------------------------------------------------------------------------
@@ -91,27 +106,58 @@ class InstantaneousSpeedValidator(_BaseValidator):
         :return: None if all OK, ValidationFailed if error
         """
 
+        #-- The sample's sequence number, in case the monitor is shared (counted even when disabled)
+        sample_num = self._n_samples
+        self._n_samples += 1
+
         if not self._enabled:
             return None
 
         self._check_xyt_validate_and_log(x_coord, y_coord, time)
 
-        self._speed_monitor.update_xyt(x_coord, y_coord, time)
+        self._speed_monitor.update_xyt(x_coord, y_coord, time, sample_num)
+
+        return self._check_speed()
+
 
+    #-----------------------------------------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.validators.InstantaneousSpeedValidator.check_xyt`, for a sample that was
+        already preprocessed by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, ValidationFailed if error
+        """
+
+        if not self._enabled:
+            return None
+
+        self._check_sample_log(sample)
+
+        self._speed_monitor.update_sample(sample)
+
+        return self._check_speed()
+
+
+    #-----------------------------------------------------------------------------------
+    def _check_speed(self):
+
+        interval = self._calculation_interval
 
         #-- Calculate speed, if possible
         if self._speed_monitor.time_in_trial is not None and \
             self._speed_monitor.time_in_trial > self._grace_period and \
-                self._speed_monitor.last_calculation_interval is not None:
+                self._speed_monitor.get_last_calculation_interval(interval) is not None:
 
             if self._axis == ValidationAxis.x:
-                speed = self._speed_monitor.xspeed
+                speed = self._speed_monitor.get_xspeed(interval)
 
             elif self._axis == ValidationAxis.y:
-                speed = self._speed_monitor.yspeed
+                speed = self._speed_monitor.get_yspeed(interval)
 
             elif self._axis == ValidationAxis.xy:
-                speed = self._speed_monitor.xyspeed
+                speed = self._speed_monitor.get_xyspeed(interval)
 
             else:
                 return None
@@ -197,10 +243,26 @@ class InstantaneousSpeedValidator(_BaseValidator):
         """
         Time interval (in seconds) for testing speed: the speed is calculated according to the difference in
         (x,y) coordinates over a time interval at least this long.
+
+        When the validator uses an external movement_monitor (see the constructor), this selects one of the monitor's
+        :attr:`~trajtracker.movement.SpeedMonitor.calculation_intervals` (the interval is added to the monitor
+        if needed). Otherwise, this sets the interval of the validator's own monitor.
         """
-        return self._speed_monitor.calculation_interval
+        if self._calculation_interval is None:
+            return self._speed_monitor.calculation_interval
+        else:
+            return self._calculation_interval
 
     @calculation_interval.setter
     def calculation_interval(self, value):
-        self._speed_monitor.calculation_interval = value
+        if self._owns_monitor:
+            self._speed_monitor.calculation_interval = value
+
+        else:
+            _u.validate_attr_numeric(self, "calculation_interval", value)
+            _u.validate_attr_not_negative(self, "calculation_interval", value)
+            if value not in self._speed_monitor.calculation_intervals:
+                self._speed_monitor.calculation_intervals = self._speed_monitor.calculation_intervals + (value,)
+            self._calculation_interval = value
+
         self._log_setter("calculation_interval")
@@ -43,6 +43,11 @@ class LocationsValidator(_BaseValidator):
         self.invalid_colors = set()
 
 
+    #-----------------------------------------------------------------------------------
+    def _internal_objects(self):
+        return self._lcm,
+
+
     #======================================================================
     #   Properties
     #======================================================================
@@ -134,6 +139,24 @@ class LocationsValidator(_BaseValidator):
         :return: None if all OK, ValidationFailed if error
         """
         self._check_xyt_validate_and_log(x_coord, y_coord, time, False)
+        return self._check_location(x_coord, y_coord)
+
+
+    #-----------------------------------------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.validators.LocationsValidator.check_xyt`, for a sample that was
+        already preprocessed by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, ValidationFailed if error
+        """
+        self._check_sample_log(sample)
+        return self._check_location(sample.x, sample.y)
+
+
+    #-----------------------------------------------------------------------------------
+    def _check_location(self, x_coord, y_coord):
 
         if not self._enabled:
             return None
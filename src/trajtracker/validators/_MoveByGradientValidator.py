@@ -43,6 +43,11 @@ class MoveByGradientValidator(_BaseValidator):
         self.reset()
 
 
+    #-----------------------------------------------------------------------------------
+    def _internal_objects(self):
+        return self._lcm,
+
+
     #======================================================================
     #   Properties
     #======================================================================
@@ -144,6 +149,24 @@ class MoveByGradientValidator(_BaseValidator):
         """
 
         self._check_xyt_validate_and_log(x_coord, y_coord, time, False)
+        return self._check_gradient(x_coord, y_coord)
+
+
+    #-----------------------------------------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.validators.MoveByGradientValidator.check_xyt`, for a sample that was
+        already preprocessed by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, ValidationFailed if error
+        """
+        self._check_sample_log(sample)
+        return self._check_gradient(sample.x, sample.y)
+
+
+    #-----------------------------------------------------------------------------------
+    def _check_gradient(self, x_coord, y_coord):
 
         if not self._enabled:
             return None
@@ -10,7 +10,6 @@ from __future__ import division
 
 import numbers
 
-import expyriment
 import numpy as np
 
 import trajtracker
@@ -85,8 +84,36 @@ class MovementAngleValidator(_BaseValidator):
         self._check_xyt_validate_and_log(x_coord, y_coord, time)
         self._validate_time(time)
 
-        x_coord /= self._units_per_mm
-        y_coord /= self._units_per_mm
+        return self._check_angle(x_coord / self._units_per_mm, y_coord / self._units_per_mm, time)
+
+
+    #-----------------------------------------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.validators.MovementAngleValidator.check_xyt`, for a sample that was
+        already preprocessed by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, ValidationFailed if error
+        """
+
+        if not self._enabled or self._min_angle == self._max_angle or self._min_angle is None or self._max_angle is None:
+            return None
+
+        self._check_sample_log(sample)
+
+        self._validate_time(sample.time)
+
+        if sample.units_per_mm == self._units_per_mm:
+            return self._check_angle(sample.x_mm, sample.y_mm, sample.time)
+        else:
+            return self._check_angle(sample.x / self._units_per_mm, sample.y / self._units_per_mm, sample.time)
+
+
+    #-----------------------------------------------------------------------------------
+    # Check the angle. The coordinates are in mm.
+    #
+    def _check_angle(self, x_coord, y_coord, time):
 
         curr_xyt = (x_coord, y_coord, time)
 
@@ -112,9 +139,8 @@ class MovementAngleValidator(_BaseValidator):
                 #-- Error
                 angle_deg = angle / (np.pi * 2) * 360
 
-                if self._log_level:
-                    # noinspection PyProtectedMember
-                    expyriment._active_exp._event_file_log("%s,InvalidAngle,%.1f" % (str(self.__class__), angle_deg), 1)
+                if self._log_info_on:
+                    self._log(self.log_info, "{0},InvalidAngle,{1:.1f}", type(self).__name__, angle_deg)
 
                 return self._create_validation_error(self.err_invalid_angle, "You moved in an incorrect direction",
                                                      {self.arg_angle: angle_deg})
@@ -45,13 +45,20 @@ class NCurvesValidator(_BaseValidator):
 
         super(NCurvesValidator, self).__init__(enabled=enabled)
 
+        self._owns_monitor = direction_monitor is None
         if direction_monitor is None:
             direction_monitor = trajtracker.movement.DirectionMonitor(1)
 
         self._direction_monitor = direction_monitor
+        self._n_samples = 0
         self.max_curves_per_trial = max_curves_per_trial
 
 
+    #-----------------------------------------------------------
+    def _internal_objects(self):
+        return (self._direction_monitor,) if self._owns_monitor else ()
+
+
 
     #=================================================================
     #    Validate
@@ -64,6 +71,7 @@ class NCurvesValidator(_BaseValidator):
         Called when a trial starts - reset any previous curves
         """
         self._direction_monitor.reset()
+        self._n_samples = 0
 
 
     #-----------------------------------------------------------
@@ -77,7 +85,29 @@ class NCurvesValidator(_BaseValidator):
         :return: None if all OK, ValidationFailed if error
         """
 
-        self._direction_monitor.update_xyt(x_coord, y_coord, time)
+        #-- The sample's sequence number, in case the monitor is shared
+        sample_num = self._n_samples
+        self._n_samples += 1
+
+        self._direction_monitor.update_xyt(x_coord, y_coord, time, sample_num)
+        return self._check_n_curves()
+
+
+    #----------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.validators.NCurvesValidator.check_xyt`, for a sample that was
+        already preprocessed by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, ValidationFailed if error
+        """
+        self._direction_monitor.update_sample(sample)
+        return self._check_n_curves()
+
+
+    #----------------------------------------------------
+    def _check_n_curves(self):
 
         if not self.enabled:
             return None
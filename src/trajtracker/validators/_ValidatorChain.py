@@ -0,0 +1,206 @@
+"""
+
+Validator chain: run several validators on each sample
+
+@author: Dror Dotan
+@copyright: Copyright (c) 2017, Dror Dotan
+"""
+
+from __future__ import division
+
+import timeit
+
+import trajtracker
+import trajtracker._utils as _u
+from trajtracker.movement import MotionState
+from trajtracker.validators import _BaseValidator
+
+
+# noinspection PyAttributeOutsideInit
+class ValidatorChain(trajtracker._TTrkObject):
+    """
+    Run several validators on each sample of the finger/mouse movement.
+
+    The sample is validated and preprocessed once (by a :class:`~trajtracker.movement.MotionState`), and then
+    the validators check it, in the order of :attr:`~trajtracker.validators.ValidatorChain.validators`.
+    The chain returns the error of the first validator that failed.
+
+    By default, all validators get all samples - including disabled validators (which handle their
+    :attr:`enabled` flag themselves), and validators after a failure. So validators that track the movement
+    (e.g. :class:`~trajtracker.validators.NCurvesValidator`, or validators that share a
+    :class:`~trajtracker.movement.SpeedMonitor`) get the same results as when they are called directly.
+    To save time, you can set :attr:`~trajtracker.validators.ValidatorChain.stop_on_failure`.
+
+    The chain keeps, per validator, the number of calls and the total time spent in these calls
+    (see :func:`~trajtracker.validators.ValidatorChain.get_stats`).
+    """
+
+    #-------------------------------------------------------------------------
+    def __init__(self, validators=(), units_per_mm=1, stop_on_failure=False):
+        """
+        Constructor
+
+        :param validators: See :attr:`~trajtracker.validators.ValidatorChain.validators`
+        :param stop_on_failure: See :attr:`~trajtracker.validators.ValidatorChain.stop_on_failure`
+        :param units_per_mm: The ratio of units (provided in the call to
+                             :func:`~trajtracker.validators.ValidatorChain.check_xyt`) per mm.
+                             This should be the same as the validators' units_per_mm.
+        """
+        super(ValidatorChain, self).__init__()
+
+        self._motion_state = MotionState(units_per_mm)
+        self.validators = validators
+        self.stop_on_failure = stop_on_failure
+
+
+    #====================================================================================
+    #   Configure
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    @property
+    def validators(self):
+        """
+        The validators in the chain (a list), in the order they are called.
+        Changing this list resets the statistics.
+        """
+        return list(self._validators)
+
+    @validators.setter
+    def validators(self, value):
+        _u.validate_attr_anylist(self, "validators", value)
+        for i, validator in enumerate(value):
+            if not isinstance(validator, _BaseValidator):
+                raise TypeError("trajtracker error: {0}.validators[{1}] is not a validator (it is {2})".format(
+                    type(self).__name__, i, type(validator).__name__))
+
+        self._validators = list(value)
+        self.reset_stats()
+        self._log_setter("validators")
+
+
+    #-------------------------------------------------------------------------
+    def add(self, validator):
+        """
+        Add a validator to the end of the chain
+
+        :param validator: A validator object (e.g. :class:`~trajtracker.validators.LocationsValidator`)
+        """
+        self.validators = self._validators + [validator]
+
+
+    #-------------------------------------------------------------------------
+    @property
+    def stop_on_failure(self):
+        """
+        Whether to stop checking a sample at the first validator that fails (bool, default: False).
+        This saves calling the remaining validators - so cheap validators, and validators that fail often, should
+        be put first. But the remaining validators do not see this sample, so validators that track the movement
+        (e.g. :class:`~trajtracker.validators.NCurvesValidator`) may then give different results than when
+        they are called directly.
+        """
+        return self._stop_on_failure
+
+    @stop_on_failure.setter
+    def stop_on_failure(self, value):
+        _u.validate_attr_type(self, "stop_on_failure", value, bool)
+        self._stop_on_failure = value
+        self._log_setter("stop_on_failure")
+
+
+    #-------------------------------------------------------------------------
+    @property
+    def units_per_mm(self):
+        """
+        The ratio of units (provided in the call to :func:`~trajtracker.validators.ValidatorChain.check_xyt`) per mm
+        """
+        return self._motion_state.units_per_mm
+
+    @units_per_mm.setter
+    def units_per_mm(self, value):
+        self._motion_state.units_per_mm = value
+        self._log_setter("units_per_mm")
+
+
+    #====================================================================================
+    #   Validate
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    def reset(self, time0=None):
+        """
+        Called when a trial starts - reset all validators in the chain
+
+        :param time0: The trial's start time, passed to each validator's reset() (if None, the validators'
+                      default is used)
+        """
+        self._motion_state.reset()
+        for validator in self._validators:
+            if time0 is None:
+                validator.reset()
+            else:
+                validator.reset(time0)
+
+
+    #-------------------------------------------------------------------------
+    # noinspection PyIncorrectDocstring
+    def check_xyt(self, x_coord, y_coord, time):
+        """
+        Check a sample with all enabled validators
+
+        :return: None if all OK, or the ValidationFailed of the first validator that failed
+        """
+        return self.check_sample(self._motion_state.update_xyt(x_coord, y_coord, time))
+
+
+    #-------------------------------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Same as :func:`~trajtracker.validators.ValidatorChain.check_xyt`, for a sample that was already preprocessed
+        by a :class:`~trajtracker.movement.MotionState`
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, or the ValidationFailed of the first validator that failed
+        """
+        timer = timeit.default_timer
+        n_calls = self._n_calls
+        total_time = self._total_time
+        first_err = None
+
+        for i, validator in enumerate(self._validators):
+            start = timer()
+            err = validator.check_sample(sample)
+            total_time[i] += timer() - start
+            n_calls[i] += 1
+
+            if err is not None and first_err is None:
+                first_err = err
+                if self._stop_on_failure:
+                    break
+
+        return first_err
+
+
+    #====================================================================================
+    #   Profiling
+    #====================================================================================
+
+    #-------------------------------------------------------------------------
+    def get_stats(self):
+        """
+        Get the number of calls to each validator and the time spent in these calls, since the last call to
+        :func:`~trajtracker.validators.ValidatorChain.reset_stats`
+
+        :return: A list with one (validator, n_calls, total_time) tuple per validator, in the chain's order.
+                 Time is in seconds.
+        """
+        return zip(self._validators, self._n_calls, self._total_time)
+
+
+    #-------------------------------------------------------------------------
+    def reset_stats(self):
+        """
+        Reset the call counts and times of all validators
+        """
+        self._n_calls = [0] * len(self._validators)
+        self._total_time = [0.0] * len(self._validators)
@@ -12,6 +12,7 @@ import numbers
 
 import trajtracker._utils as _u
 from trajtracker import _TTrkObject
+from trajtracker.data import EventLog
 
 ValidationAxis = enum.Enum('ValidationAxis', 'x y xy')
 
@@ -41,25 +42,51 @@ class _BaseValidator(_TTrkObject):
         self._enabled = value
 
 
+    #--------------------------------------------------------------------
+    def check_sample(self, sample):
+        """
+        Check a sample that was already preprocessed by a :class:`~trajtracker.movement.MotionState`.
+        This is equivalent to calling check_xyt() with the sample's coordinates and time, but some validators
+        can use the preprocessed sample to avoid repeating the validation and calculations.
+
+        :param sample: :class:`~trajtracker.movement.MotionSample`
+        :return: None if all OK, ValidationFailed if error
+        """
+        return self.check_xyt(sample.x, sample.y, sample.time)
+
+
     #--------------------------------------------------------------------
     def _check_xyt_validate_and_log(self, x_coord, y_coord, time, time_used=True):
 
-        _u.validate_func_arg_type(self, "check_xyt", "x_coord", x_coord, numbers.Number, type_name="numeric")
-        _u.validate_func_arg_type(self, "check_xyt", "y_coord", y_coord, numbers.Number, type_name="numeric")
+        if not self._trusted_input:
+            _u.validate_func_arg_type(self, "check_xyt", "x_coord", x_coord, numbers.Number, type_name="numeric")
+            _u.validate_func_arg_type(self, "check_xyt", "y_coord", y_coord, numbers.Number, type_name="numeric")
 
-        if time_used:
-            _u.validate_func_arg_type(self, "check_xyt", "time", time, numbers.Number, type_name="numeric")
+            if time_used:
+                _u.validate_func_arg_type(self, "check_xyt", "time", time, numbers.Number, type_name="numeric")
 
-        if self._should_log(self.log_trace):
-            msg = "{0}.check_xyt,{1},{2}".format(type(self).__name__, x_coord, y_coord)
+        if self._log_trace_on:
             if time_used:
-                msg += ",{0}".format(time)
-            self._log_write(msg)
+                self._log(self.log_trace, "{0}.check_xyt,{1},{2},{3}", type(self).__name__, x_coord, y_coord, time)
+            else:
+                self._log(self.log_trace, "{0}.check_xyt,{1},{2}", type(self).__name__, x_coord, y_coord)
+
+        if self._event_log is not None:
+            self._event_log.write(self._event_log_id, EventLog.ev_check_xyt, x_coord, y_coord, time if time_used else 0)
+
+    #--------------------------------------------------------------------
+    def _check_sample_log(self, sample):
+        if self._log_trace_on:
+            self._log(self.log_trace, "{0}.check_xyt,{1},{2},{3}", type(self).__name__, sample.x, sample.y, sample.time)
+        if self._event_log is not None:
+            self._event_log.write(self._event_log_id, EventLog.ev_check_xyt, sample.x, sample.y, sample.time)
 
     #--------------------------------------------------------------------
     def _create_validation_error(self, err_code, message, err_args=None):
-        if self._should_log(self.log_warn):
-            self._log_write("ValidationFailed,{0},{1},{2},{3}".format(type(self).__name__, err_code, message, err_args))
+        if self._log_warn_on:
+            self._log(self.log_warn, "ValidationFailed,{0},{1},{2},{3}", type(self).__name__, err_code, message, err_args)
+        if self._event_log is not None:
+            self._event_log.write(self._event_log_id, EventLog.ev_validation_failed)
 
         return ValidationFailed(err_code, message, self, err_args)
 
@@ -73,3 +100,4 @@ from _MovementAngleValidator import MovementAngleValidator
 from _MoveByGradientValidator import MoveByGradientValidator
 from _NCurvesValidator import NCurvesValidator
 
+from _ValidatorChain import ValidatorChain
@@ -0,0 +1,124 @@
+import threading
+import unittest
+
+import trajtracker
+from trajtracker.data import AsyncTrajectoryWriter, CsvTrajectoryWriter
+from trajtracker.movement import TrajectoryTracker
+from ttrk_testing import DummyFileHandle
+
+
+class DummyWriter(object):
+
+    def __init__(self):
+        self.trials = []
+        self.closed = False
+        self.fail = False
+        self.blocker = None
+
+    def write_trial(self, trial_num, x, y, time, x_is_int=False, y_is_int=False):
+        if self.blocker is not None:
+            self.blocker.wait()
+        if self.fail:
+            raise IOError("disk full")
+        self.trials.append((trial_num, list(x), list(y), list(time)))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class TrajectoryTrackerForTesting(TrajectoryTracker):
+
+    def _open_file(self, filename, mode):
+        if mode == 'w':
+            self._file_data = DummyFileHandle()
+        return self._file_data
+
+
+class AsyncTrajectoryWriterTests(unittest.TestCase):
+
+    #------------------------------------------------------------------
+    def test_write(self):
+        dw = DummyWriter()
+        writer = AsyncTrajectoryWriter(dw)
+        self.assertEqual(2, writer.write_trial(1, [1, 2], [3, 4], [0.1, 0.2]))
+        writer.write_trial(2, [5], [6], [0.3])
+        writer.flush()
+
+        self.assertEqual([(1, [1, 2], [3, 4], [0.1, 0.2]), (2, [5], [6], [0.3])], dw.trials)
+
+        writer.close()
+        self.assertTrue(dw.closed)
+
+
+    #------------------------------------------------------------------
+    def test_data_is_copied(self):
+        dw = DummyWriter()
+        dw.blocker = threading.Event()
+        writer = AsyncTrajectoryWriter(dw)
+
+        x = [1, 2]
+        writer.write_trial(1, x, [3, 4], [0.1, 0.2])
+        x[0] = 100
+        dw.blocker.set()
+        writer.close()
+
+        self.assertEqual([1, 2], dw.trials[0][1])
+
+
+    #------------------------------------------------------------------
+    def test_close_writes_queued_trials(self):
+        dw = DummyWriter()
+        dw.blocker = threading.Event()
+        writer = AsyncTrajectoryWriter(dw, queue_size=10)
+        for i in range(5):
+            writer.write_trial(i, [1], [2], [0.1])
+
+        dw.blocker.set()
+        writer.close()
+        self.assertEqual(5, len(dw.trials))
+
+
+    #------------------------------------------------------------------
+    def test_error_raised_on_next_call(self):
+        dw = DummyWriter()
+        dw.fail = True
+        writer = AsyncTrajectoryWriter(dw)
+        writer.write_trial(1, [1], [2], [0.1])
+
+        self.assertRaises(IOError, writer.flush)
+        self.assertRaises(IOError, lambda: writer.write_trial(2, [1], [2], [0.1]))
+        self.assertRaises(IOError, writer.close)
+        self.assertTrue(dw.closed)
+
+
+    #------------------------------------------------------------------
+    def test_write_after_close(self):
+        writer = AsyncTrajectoryWriter(DummyWriter())
+        writer.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: writer.write_trial(1, [1], [2], [0.1]))
+
+
+    #------------------------------------------------------------------
+    def test_tracker(self):
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_output_file("stam", xy_precision=1, time_precision=1, async_save=True)
+
+        ttrk.reset(True)
+        ttrk.update_xyt(1, 1.5, 0.1)
+        ttrk.update_xyt(2, 2.5, 0.2)
+        self.assertEqual(2, ttrk.save_to_file(0))
+
+        ttrk.reset(True)
+        ttrk.update_xyt(12, 2.5, 0.2)
+        ttrk.save_to_file(1)
+
+        ttrk.close_output_file()
+        self.assertEqual("trial,time,x,y\n0,0.1,1,1.5\n0,0.2,2,2.5\n1,0.2,12,2.5\n", ttrk._file_data.data)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
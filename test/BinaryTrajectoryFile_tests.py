@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.data import BinaryTrajectoryWriter, BinaryTrajectoryReader
+from trajtracker.movement import TrajectoryTracker
+
+
+class BinaryTrajectoryFileTests(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._filename = os.path.join(self._dir, "traj.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+
+    #------------------------------------------------------------------
+    def test_write_and_read(self):
+        writer = BinaryTrajectoryWriter(self._filename)
+        self.assertEqual(2, writer.write_trial(1, [1, 2], [1.5, 2.5], [0.1, 0.2], x_is_int=True))
+        self.assertEqual(3, writer.write_trial(2, [3, 4, 5], [6, 7, 8], [0.3, 0.4, 0.5], x_is_int=True, y_is_int=True))
+        writer.close()
+
+        reader = BinaryTrajectoryReader(self._filename)
+        self.assertEqual([1, 2], reader.trial_nums)
+        self.assertEqual(2, len(reader))
+        self.assertTrue(2 in reader)
+        self.assertFalse(3 in reader)
+
+        x, y, t = reader.get_trial(1)
+        self.assertEqual([1, 2], list(x))
+        self.assertEqual([1.5, 2.5], list(y))
+        self.assertEqual([0.1, 0.2], list(t))
+        self.assertEqual((True, False), reader.get_trial_int_flags(1))
+
+        trials = list(reader)
+        self.assertEqual(2, trials[1][0])
+        self.assertEqual([3, 4, 5], list(trials[1][1]))
+        self.assertEqual([0.3, 0.4, 0.5], list(trials[1][3]))
+
+
+    #------------------------------------------------------------------
+    def test_empty_trial(self):
+        writer = BinaryTrajectoryWriter(self._filename)
+        writer.write_trial(1, [], [], [])
+        writer.close()
+
+        x, y, t = BinaryTrajectoryReader(self._filename).get_trial(1)
+        self.assertEqual(0, len(t))
+
+
+    #------------------------------------------------------------------
+    def test_write_after_close(self):
+        writer = BinaryTrajectoryWriter(self._filename)
+        writer.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: writer.write_trial(1, [1], [1], [1]))
+
+
+    #------------------------------------------------------------------
+    def test_invalid_file(self):
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,time,x,y\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: BinaryTrajectoryReader(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_truncated_file(self):
+        writer = BinaryTrajectoryWriter(self._filename)
+        writer.write_trial(1, [1, 2], [1, 2], [0.1, 0.2])
+        writer.close()
+
+        with open(self._filename, 'ab') as fh:
+            fh.truncate(os.path.getsize(self._filename) - 8)
+
+        self.assertRaises(trajtracker.BadFormatError, lambda: BinaryTrajectoryReader(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_tracker(self):
+        ttrk = TrajectoryTracker()
+        ttrk.init_output_file(self._filename, file_format=TrajectoryTracker.FileFormat.Binary)
+
+        ttrk.reset(True)
+        ttrk.update_xyt(1, 1.5, 0.1)
+        ttrk.update_xyt(2, 2.5, 0.2)
+        self.assertEqual(2, ttrk.save_to_file(7))
+        ttrk.close_output_file()
+
+        reader = BinaryTrajectoryReader(self._filename)
+        x, y, t = reader.get_trial(7)
+        self.assertTrue(np.array_equal([1, 2], x))
+        self.assertTrue(np.array_equal([1.5, 2.5], y))
+        self.assertTrue(np.array_equal([0.1, 0.2], t))
+        self.assertEqual((True, False), reader.get_trial_int_flags(7))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
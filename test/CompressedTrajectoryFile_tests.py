@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.data import CompressedTrajectoryWriter, CompressedTrajectoryReader
+from trajtracker.movement import TrajectoryTracker
+
+
+class CompressedTrajectoryFileTests(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._filename = os.path.join(self._dir, "traj.ttz")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+
+    #------------------------------------------------------------------
+    def _check_write_and_read(self, compression):
+        writer = CompressedTrajectoryWriter(self._filename, xy_precision=2, time_precision=3, compression=compression)
+        self.assertEqual(2, writer.write_trial(1, [1, -200], [1.5, 2.25], [0.1, 0.2], x_is_int=True))
+        writer.write_trial(2, [], [], [])
+        writer.write_trial(3, [100000, 3, 4], [7, 8, 9], [1000.001, 1000.002, 1000.0035], x_is_int=True, y_is_int=True)
+        writer.close()
+
+        with CompressedTrajectoryReader(self._filename) as reader:
+            trials = list(reader)
+
+        self.assertEqual([1, 2, 3], [t[0] for t in trials])
+
+        trial_num, x, y, t = trials[0]
+        self.assertEqual([1, -200], list(x))
+        self.assertEqual([1.5, 2.25], list(y))
+        self.assertEqual([0.1, 0.2], list(t))
+
+        self.assertEqual(0, len(trials[1][3]))
+
+        trial_num, x, y, t = trials[2]
+        self.assertEqual([100000, 3, 4], list(x))
+        self.assertEqual(np.int64, x.dtype)
+        self.assertEqual([7, 8, 9], list(y))
+        self.assertEqual([1000.001, 1000.002, 1000.004], list(t))
+
+    def test_zlib(self):
+        self._check_write_and_read('zlib')
+
+    def test_bz2(self):
+        self._check_write_and_read('bz2')
+
+
+    #------------------------------------------------------------------
+    def test_invalid_compression(self):
+        self.assertRaises(ValueError, lambda: CompressedTrajectoryWriter(self._filename, compression='lzma'))
+
+
+    #------------------------------------------------------------------
+    def test_compresses(self):
+        n = 2000
+        writer = CompressedTrajectoryWriter(self._filename)
+        writer.write_trial(1, np.arange(n) // 5, np.arange(n) * 2, np.arange(n) / 1000.0, x_is_int=True, y_is_int=True)
+        writer.close()
+        self.assertLess(os.path.getsize(self._filename), n)
+
+
+    #------------------------------------------------------------------
+    def test_invalid_file(self):
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,time,x,y\n0,0.1,1,1\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: CompressedTrajectoryReader(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_truncated_file(self):
+        writer = CompressedTrajectoryWriter(self._filename)
+        writer.write_trial(1, [1, 2], [1, 2], [0.1, 0.2])
+        writer.close()
+
+        with open(self._filename, 'ab') as fh:
+            fh.truncate(os.path.getsize(self._filename) - 2)
+
+        reader = CompressedTrajectoryReader(self._filename)
+        self.assertRaises(trajtracker.BadFormatError, reader.read_trial)
+        reader.close()
+
+
+    #------------------------------------------------------------------
+    def test_tracker(self):
+        ttrk = TrajectoryTracker()
+        ttrk.init_output_file(self._filename, file_format=TrajectoryTracker.FileFormat.Compressed, compression='bz2')
+        ttrk.reset(True)
+        ttrk.update_xyt(1, 1.5, 0.1)
+        ttrk.update_xyt(2, 2.5, 0.2)
+        ttrk.save_to_file(4)
+        ttrk.close_output_file()
+
+        with CompressedTrajectoryReader(self._filename) as reader:
+            trial_num, x, y, t = reader.read_trial()
+            self.assertEqual(4, trial_num)
+            self.assertEqual([1, 2], list(x))
+            self.assertEqual([1.5, 2.5], list(y))
+            self.assertIsNone(reader.read_trial())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
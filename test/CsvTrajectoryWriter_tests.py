@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+import trajtracker
+from trajtracker.data import CsvTrajectoryWriter
+from ttrk_testing import DummyFileHandle
+
+
+class CsvTrajectoryWriterTests(unittest.TestCase):
+
+    def _open_file(self, filename, mode):
+        self.fh = DummyFileHandle()
+        return self.fh
+
+
+    #------------------------------------------------------------------
+    def test_write(self):
+        writer = CsvTrajectoryWriter("stam", xy_precision=2, time_precision=1, open_file=self._open_file)
+        self.assertEqual(2, writer.write_trial(3, [1, -2], [0.5, -1.25], [0.1, 0.2], x_is_int=True))
+        writer.write_trial(4, np.array([1.5]), np.array([2.0]), np.array([0.3]))
+        self.assertEqual("trial,time,x,y\n3,0.1,1,0.50\n3,0.2,-2,-1.25\n4,0.3,1.50,2.00\n", self.fh.data)
+
+
+    #------------------------------------------------------------------
+    def test_empty_trial(self):
+        writer = CsvTrajectoryWriter("stam", open_file=self._open_file)
+        self.assertEqual(0, writer.write_trial(1, [], [], []))
+        self.assertEqual("trial,time,x,y\n", self.fh.data)
+
+
+    #------------------------------------------------------------------
+    def test_flush_only_on_request(self):
+        writer = CsvTrajectoryWriter("stam", open_file=self._open_file)
+        n_flushes = self.fh.n_flushes
+        writer.write_trial(1, [1], [1], [1])
+        writer.write_trial(2, [1], [1], [1])
+        self.assertEqual(n_flushes, self.fh.n_flushes)
+        writer.flush()
+        self.assertEqual(n_flushes + 1, self.fh.n_flushes)
+
+
+    #------------------------------------------------------------------
+    def test_write_after_close(self):
+        writer = CsvTrajectoryWriter("stam", open_file=self._open_file)
+        writer.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: writer.write_trial(1, [1], [1], [1]))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
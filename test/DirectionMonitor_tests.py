@@ -1,7 +1,7 @@
 import unittest
 
 import numpy as np
-from trajtracker.movement import DirectionMonitor
+from trajtracker.movement import DirectionMonitor, MotionState
 
 
 class DirectionMonitorTests(unittest.TestCase):
@@ -67,6 +67,13 @@ class DirectionMonitorTests(unittest.TestCase):
         except:
             pass
 
+    #----------------------------------------------------
+    def test_set_max_recent_samples(self):
+        dm = DirectionMonitor(3)
+        dm.max_recent_samples = 10
+        self.assertRaises(TypeError, lambda: setattr(dm, "max_recent_samples", 1.5))
+        self.assertRaises(ValueError, lambda: setattr(dm, "max_recent_samples", 0))
+
     #----------------------------------------------------
     def test_set_angle_units(self):
         dm = DirectionMonitor(3)
@@ -341,6 +348,197 @@ class DirectionMonitorTests(unittest.TestCase):
         self.assertEqual(2, dm.n_curves)
 
 
+    #----------------------------------------------------
+    def test_same_sample_added_once(self):
+        dm = DirectionMonitor(1)
+        dm.update_xyt(0, 0, 0, 0)
+        dm.update_xyt(1, 1, 1, 1)
+        dm.update_xyt(1, 1, 1, 1)
+        self.assertEqual(45, dm.curr_angle)
+
+        motion = MotionState()
+        dm.reset()
+        for x, y, t in (0, 0, 0), (1, 1, 1):
+            sample = motion.update_xyt(x, y, t)
+            dm.update_sample(sample)
+            dm.update_sample(sample)
+        self.assertEqual(45, dm.curr_angle)
+
+
+    #===================================================================================
+    #   Pruning the recent coordinates
+    #===================================================================================
+
+    #----------------------------------------------------
+    def test_pruning_does_not_change_results(self):
+
+        np.random.seed(0)
+        for min_distance in 0, 1, 3, 10:
+            #-- random walk with pauses (repeated coordinates) and loops
+            steps = np.random.randint(-2, 3, (3000, 2))
+            steps[np.random.rand(3000) < 0.2] = 0
+            coords = np.cumsum(steps, axis=0)
+
+            dm = DirectionMonitor(1, min_distance=min_distance, min_angle_change_per_curve=10)
+            ref = _UnprunedDirectionMonitor(1, min_distance=min_distance, min_angle_change_per_curve=10)
+
+            for i, (x, y) in enumerate(coords.tolist()):
+                dm.update_xyt(x, y, i)
+                ref.update_xyt(x, y, i)
+                self.assertEqual(ref.curr_angle, dm.curr_angle)
+                self.assertEqual(ref.n_curves, dm.n_curves)
+                self.assertEqual(ref.curr_curve_start_xyt, dm.curr_curve_start_xyt)
+
+
+    #----------------------------------------------------
+    def test_pruning_bounds_memory(self):
+
+        dm = DirectionMonitor(1, min_distance=5)
+
+        #-- Moving
+        for i in range(1000):
+            dm.update_xyt(i * 0.5, np.sin(i / 10.0), i)
+        self.assertLessEqual(len(dm._recent_near_coords), 21)
+
+        #-- Not moving
+        for i in range(1000, 2000):
+            dm.update_xyt(-10, -10, i)
+        self.assertLessEqual(len(dm._recent_near_coords), 2)
+
+
+    #----------------------------------------------------
+    def test_pruning_bounds_memory_when_jittering(self):
+
+        dm = DirectionMonitor(1, min_distance=5)
+        ref = _UnprunedDirectionMonitor(1, min_distance=5)
+
+        #-- Jitter between 2 pixels
+        for i in range(2000):
+            dm.update_xyt(i % 2, 0, i)
+            ref.update_xyt(i % 2, 0, i)
+        self.assertLessEqual(len(dm._recent_near_coords), 2)
+        self.assertEqual(ref.curr_angle, dm.curr_angle)
+
+        #-- Jitter within a small area, after moving
+        np.random.seed(1)
+        for i, (dx, dy) in enumerate(np.random.randint(-1, 2, (2000, 2)).tolist()):
+            dm.update_xyt(50 + dx, 50 + dy, 2000 + i)
+            ref.update_xyt(50 + dx, 50 + dy, 2000 + i)
+            self.assertEqual(ref.curr_angle, dm.curr_angle)
+        #-- 9 locations + the last far point
+        self.assertLessEqual(len(dm._recent_near_coords), 10)
+
+
+    #----------------------------------------------------
+    def test_max_recent_samples_bounds_memory_when_hovering(self):
+
+        np.random.seed(2)
+        x = np.concatenate((np.arange(0, 100, 2.0), 100 + np.random.rand(3000))).tolist()
+        y = np.concatenate((np.zeros(50), np.random.rand(3000))).tolist()
+        t = range(len(x))
+
+        dm = DirectionMonitor(1, min_distance=5, max_recent_samples=200)
+        ref = _UnprunedDirectionMonitor(1, min_distance=5, max_recent_samples=200)
+        angles = dm.compute_profile(x, y, t)[0]
+
+        max_len = 0
+        for i in range(len(x)):
+            dm.update_xyt(x[i], y[i], t[i])
+            ref.update_xyt(x[i], y[i], t[i])
+            max_len = max(max_len, len(dm._recent_near_coords))
+            self.assertEqual(ref.curr_angle, dm.curr_angle)
+            if dm.curr_angle is None:
+                self.assertTrue(np.isnan(angles[i]))
+            else:
+                self.assertEqual(dm.curr_angle, angles[i])
+
+        #-- Every float location is distinct, so only max_recent_samples limits the history
+        self.assertLessEqual(max_len, 201)
+
+        #-- Hovering for more than max_recent_samples samples: the direction is unknown
+        self.assertFalse(np.isnan(angles[50 + 100]))
+        self.assertIsNone(dm.curr_angle)
+
+
+
+    #===================================================================================
+    #   compute_profile
+    #===================================================================================
+
+    #----------------------------------------------------
+    def test_profile_matches_online(self):
+
+        np.random.seed(3)
+        configs = [dict(min_distance=0), dict(min_distance=2, min_angle_change_per_curve=20),
+                   dict(min_distance=5, zero_angle=30), dict(min_distance=1.5, angle_units=DirectionMonitor.Units.Radians),
+                   dict(units_per_mm=2.5, min_distance=3, min_angle_change_per_curve=5)]
+
+        for config in configs:
+            config = dict(config)
+            units_per_mm = config.pop('units_per_mm', 1)
+
+            steps = np.random.randint(-2, 4, (1000, 2))
+            steps[np.random.rand(1000) < 0.2] = 0
+            coords = np.cumsum(steps, axis=0)
+            x = coords[:, 0].tolist()
+            y = (coords[:, 1] * 0.7).tolist()
+
+            dm = DirectionMonitor(units_per_mm, **config)
+            angles, directions, n_curves = dm.compute_profile(x, y, range(len(x)))
+
+            dm.reset()
+            for i in range(len(x)):
+                dm.update_xyt(x[i], y[i], i)
+                if dm.curr_angle is None:
+                    self.assertTrue(np.isnan(angles[i]))
+                else:
+                    self.assertEqual(dm.curr_angle, angles[i])
+                self.assertEqual(dm.curr_curve_direction or 0, directions[i])
+                self.assertEqual(dm.n_curves, n_curves[i])
+
+            self.assertTrue(n_curves[-1] > 0)
+
+
+    #----------------------------------------------------
+    def test_profile_matches_online_with_duplicates(self):
+
+        np.random.seed(4)
+        for config in dict(min_distance=0), dict(min_distance=2, min_angle_change_per_curve=20):
+            steps = np.random.randint(-2, 4, (1000, 2))
+            coords = np.cumsum(steps, axis=0)
+
+            #-- Repeat some of the samples exactly
+            repeat = np.random.rand(1000) < 0.2
+            x, y, t = [[v for v, r in zip(values, repeat) for i in range(2 if r else 1)]
+                       for values in (coords[:, 0].tolist(), coords[:, 1].tolist(), range(1000))]
+
+            dm = DirectionMonitor(1, **config)
+            angles, directions, n_curves = dm.compute_profile(x, y, t)
+
+            dm.reset()
+            for i in range(len(x)):
+                dm.update_xyt(x[i], y[i], t[i])
+                if dm.curr_angle is None:
+                    self.assertTrue(np.isnan(angles[i]))
+                else:
+                    self.assertEqual(dm.curr_angle, angles[i])
+                self.assertEqual(dm.curr_curve_direction or 0, directions[i])
+                self.assertEqual(dm.n_curves, n_curves[i])
+
+
+    #----------------------------------------------------
+    def test_profile_invalid_args(self):
+        dm = DirectionMonitor(1)
+        self.assertRaises(ValueError, lambda: dm.compute_profile([1, 2], [1, 2], [1]))
+        self.assertEqual(0, len(dm.compute_profile([], [], [])[0]))
+
+
+
+#-- A DirectionMonitor that keeps all coordinates
+class _UnprunedDirectionMonitor(DirectionMonitor):
+
+    def _prune_recent_coords(self, x_coord, y_coord):
+        pass
 
 
 
@@ -0,0 +1,163 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import trajtracker
+from trajtracker.data import EventLog, read_event_log, event_log_to_csv
+from trajtracker.movement import TrajectoryTracker
+from trajtracker.validators import MovementAngleValidator
+
+
+#-- A clock that returns 0, 1, 2, ...
+class VirtualClock(object):
+
+    def __init__(self):
+        self.now = -1
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+class EventLogTests(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._filename = os.path.join(self._dir, "events.log")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+
+    #------------------------------------------------------------------
+    def test_invalid_args(self):
+        self.assertRaises(TypeError, lambda: EventLog(self._filename, capacity=1.5))
+        self.assertRaises(ValueError, lambda: EventLog(self._filename, capacity=0))
+        self.assertRaises(ValueError, lambda: EventLog(self._filename, flush_interval=0))
+
+        log = EventLog(self._filename)
+        self.assertRaises(ValueError, lambda: log.define_event(5, "mine"))
+        log.close()
+
+
+    #------------------------------------------------------------------
+    def test_write_and_read(self):
+        log = EventLog(self._filename, clock=VirtualClock())
+        obj_id = log.register_object(self, "me")
+        log.define_event(EventLog.ev_user, "my_event")
+
+        log.write(obj_id, EventLog.ev_track_xyt, 1, 2.5, 0.1)
+        log.write(obj_id, EventLog.ev_user, 1, 2, 3, 4)
+        log.close()
+        self.assertEqual(2, log.n_records)
+
+        records, object_names, event_names = read_event_log(self._filename)
+        self.assertEqual([0, 1], list(records['time']))
+        self.assertEqual([obj_id, obj_id], list(records['object_id']))
+        self.assertEqual([EventLog.ev_track_xyt, EventLog.ev_user], list(records['event']))
+        self.assertEqual([1, 2.5, 0.1, 0], [records[0]['value%d' % i] for i in range(1, 5)])
+        self.assertEqual([1, 2, 3, 4], [records[1]['value%d' % i] for i in range(1, 5)])
+        self.assertEqual({obj_id: "me"}, object_names)
+        self.assertEqual("my_event", event_names[EventLog.ev_user])
+        self.assertEqual("track_xyt", event_names[EventLog.ev_track_xyt])
+
+
+    #------------------------------------------------------------------
+    def test_ring_buffer_wraps(self):
+        log = EventLog(self._filename, capacity=4, flush_interval=1000)
+        with log._flush_lock:      # stop the background thread from flushing
+            for i in range(3):
+                log.write(1, EventLog.ev_user, i)
+            log._flush_buffer()
+            for i in range(3, 7):
+                log.write(1, EventLog.ev_user, i)
+        log.close()
+
+        records = read_event_log(self._filename)[0]
+        self.assertEqual(range(7), list(records['value1']))
+
+
+    #------------------------------------------------------------------
+    def test_full_buffer_drops_records(self):
+        log = EventLog(self._filename, capacity=4, flush_interval=1000)
+        with log._flush_lock:
+            for i in range(6):
+                log.write(1, EventLog.ev_user, i)
+        self.assertEqual(4, log.n_records)
+        self.assertEqual(2, log.n_dropped)
+        log.close()
+
+        records = read_event_log(self._filename)[0]
+        self.assertEqual([EventLog.ev_user] * 4 + [EventLog.ev_dropped], list(records['event']))
+        self.assertEqual(2, records[-1]['value1'])
+
+
+    #------------------------------------------------------------------
+    def test_background_flush(self):
+        log = EventLog(self._filename, capacity=1000, flush_interval=0.01)
+        for i in range(2000):
+            log.write(1, EventLog.ev_user, i)
+        log.close()
+
+        records = read_event_log(self._filename)[0]
+        values = [v for v, e in zip(records['value1'], records['event']) if e == EventLog.ev_user]
+        self.assertEqual(log.n_records, len(values))
+        self.assertEqual(sorted(values), values)
+        self.assertEqual(2000, log.n_records + log.n_dropped)
+
+
+    #------------------------------------------------------------------
+    def test_closed(self):
+        log = EventLog(self._filename)
+        log.close()
+        log.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: log.flush())
+
+
+    #------------------------------------------------------------------
+    def test_bad_file(self):
+        with open(self._filename, 'wb') as fh:
+            fh.write(b'0123456789abcdef0123')
+        self.assertRaises(trajtracker.BadFormatError, lambda: read_event_log(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_objects_and_csv(self):
+        log = EventLog(self._filename, clock=VirtualClock())
+
+        tracker = TrajectoryTracker()
+        tracker.event_log = log
+        validator = MovementAngleValidator(1, min_angle=-90, max_angle=90, calc_angle_interval=1)
+        validator.event_log = log
+        self.assertRaises(TypeError, lambda: setattr(validator, "event_log", "file"))
+
+        tracker.reset(True)
+        tracker.update_xyt(0, 0, 0)
+        validator.check_xyt(0, 0, 0)
+        tracker.update_xyt(0, -10, 0.5)
+        self.assertIsNotNone(validator.check_xyt(0, -10, 0.5))
+
+        #-- Stop logging
+        tracker.event_log = None
+        tracker.update_xyt(0, -20, 1)
+        log.close()
+
+        csv_filename = os.path.join(self._dir, "events.csv")
+        self.assertEqual(6, event_log_to_csv(self._filename, csv_filename))
+        with open(csv_filename) as fh:
+            lines = fh.read().splitlines()
+
+        self.assertEqual("time,object_id,object,event,value1,value2,value3,value4", lines[0])
+        self.assertEqual([("TrajectoryTracker#1", "reset"),
+                          ("TrajectoryTracker#1", "track_xyt"),
+                          ("MovementAngleValidator#2", "check_xyt"),
+                          ("TrajectoryTracker#1", "track_xyt"),
+                          ("MovementAngleValidator#2", "check_xyt"),
+                          ("MovementAngleValidator#2", "validation_failed")],
+                         [tuple(line.split(",")[2:4]) for line in lines[1:]])
+        self.assertEqual(["0.0", "-10.0", "0.5", "0.0"], lines[4].split(",")[4:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import unittest
+
+import trajtracker
+from trajtracker.misc import FrameProfiler, LatencyRegistry
+
+
+#-- A clock whose time is advanced by the test
+class VirtualClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+#-- A component whose methods take a given (virtual) duration
+class Component(trajtracker._TTrkObject):
+
+    def __init__(self, clock, duration, nested=None):
+        super(Component, self).__init__()
+        self.clock = clock
+        self.duration = duration
+        self.nested = nested
+
+    def check_xyt(self, x_coord, y_coord, time):
+        self.clock.now += self.duration
+        if self.nested is not None:
+            self.nested.update_xy(x_coord, y_coord)
+        return x_coord
+
+    def update_xy(self, x_coord, y_coord):
+        self.clock.now += self.duration
+
+    def present(self):
+        self.clock.now += self.duration
+
+
+class FrameProfilerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.profiler = FrameProfiler(budget=0.01, clock=self.clock)
+
+
+    #------------------------------------------------------------
+    def test_invalid(self):
+        self.assertRaises(TypeError, lambda: FrameProfiler(budget="a"))
+        self.assertRaises(ValueError, lambda: FrameProfiler(budget=0))
+        self.assertRaises(TypeError, lambda: self.profiler.watch("obj"))
+        self.assertRaises(ValueError, lambda: self.profiler.watch(Component(self.clock, 0), ["no_such_method"]))
+
+        self.assertRaises(trajtracker.InvalidStateError, lambda: self.profiler.frame().__enter__())
+        self.assertRaises(trajtracker.InvalidStateError, lambda: self.profiler.end_trial())
+
+
+    #------------------------------------------------------------
+    def test_default_methods(self):
+        comp = Component(self.clock, 0)
+        self.profiler.watch(comp)
+        self.assertEqual({'check_xyt', 'update_xy', 'present'}, set(comp.__dict__) & set(FrameProfiler.default_methods))
+        self.assertRaises(trajtracker.InvalidStateError, lambda: self.profiler.watch(comp))
+
+        self.profiler.unwatch(comp)
+        self.assertEqual(set(), set(comp.__dict__) & set(FrameProfiler.default_methods))
+
+
+    #------------------------------------------------------------
+    def test_with_latency_registry(self):
+        comp = Component(self.clock, 0.002)
+        registry = LatencyRegistry(self.clock)
+        registry.instrument(comp, ["check_xyt"])
+        self.profiler.watch(comp, ["check_xyt", "present"], name="comp")
+
+        self.profiler.start_trial()
+        with self.profiler.frame():
+            comp.check_xyt(0, 0, 0)
+        self.assertAlmostEqual(0.002, self.profiler.end_trial().component_times["comp"])
+        self.assertEqual(1, registry.stats[0].n_calls)
+
+        #-- The profiler's wrapper is the outer one, so it must be removed first
+        self.assertRaises(trajtracker.InvalidStateError, lambda: registry.uninstrument(comp))
+        self.profiler.unwatch(comp)
+        self.assertNotIn("present", comp.__dict__)
+        comp.check_xyt(0, 0, 0)
+        self.assertEqual(2, registry.stats[0].n_calls)
+
+        registry.uninstrument(comp)
+        self.assertNotIn("check_xyt", comp.__dict__)
+
+        #-- In the opposite order
+        self.profiler.watch(comp, name="comp")
+        registry.instrument(comp)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: self.profiler.unwatch(comp))
+        registry.uninstrument(comp)
+        self.profiler.unwatch(comp)
+        self.assertEqual(set(), set(comp.__dict__) & set(FrameProfiler.default_methods))
+
+
+    #------------------------------------------------------------
+    def test_attribution(self):
+        validator = Component(self.clock, 0.002)
+        line = Component(self.clock, 0.003)
+        self.profiler.watch(validator, name="validator")
+        self.profiler.watch(line, name="line")
+
+        self.profiler.start_trial(1)
+        with self.profiler.frame():
+            self.assertEqual(5, validator.check_xyt(5, 0, 0))
+            line.update_xy(0, 0)
+            line.present()
+            self.clock.now += 0.001
+        report = self.profiler.end_trial()
+
+        self.assertEqual(1, report.trial_num)
+        self.assertEqual(1, report.n_frames)
+        self.assertEqual(0, report.n_late)
+        self.assertAlmostEqual(0.009, report.max_frame_time)
+        times = report.component_times
+        self.assertEqual(["validator", "line", "other"], times.keys())
+        self.assertAlmostEqual(0.002, times["validator"])
+        self.assertAlmostEqual(0.006, times["line"])
+        self.assertAlmostEqual(0.001, times["other"])
+
+
+    #------------------------------------------------------------
+    def test_nested_calls(self):
+        inner = Component(self.clock, 0.001)
+        outer = Component(self.clock, 0.004, nested=inner)
+        self.profiler.watch(outer, name="outer")
+        self.profiler.watch(inner, name="inner")
+
+        self.profiler.start_trial()
+        with self.profiler.frame():
+            outer.check_xyt(0, 0, 0)
+        times = self.profiler.end_trial().component_times
+
+        self.assertAlmostEqual(0.004, times["outer"])
+        self.assertAlmostEqual(0.001, times["inner"])
+        self.assertAlmostEqual(0, times["other"])
+
+
+    #------------------------------------------------------------
+    def test_not_measured_outside_frames(self):
+        comp = Component(self.clock, 0.005)
+        self.profiler.watch(comp, name="comp")
+
+        self.profiler.start_trial()
+        comp.present()
+        with self.profiler.frame():
+            pass
+        report = self.profiler.end_trial()
+        self.assertNotIn("comp", report.component_times)
+
+
+    #------------------------------------------------------------
+    def test_late_and_dropped_frames(self):
+        slow = Component(self.clock, 0.015)
+        fast = Component(self.clock, 0.001)
+        self.profiler.watch(slow, name="slow")
+        self.profiler.watch(fast, name="fast")
+
+        self.profiler.start_trial(7)
+        for i in range(5):
+            self.clock.now = i * 0.01 if i < 3 else (i + 2) * 0.01    # 2 frames dropped before frame #3
+            with self.profiler.frame():
+                fast.update_xy(0, 0)
+                if i == 1:
+                    slow.present()
+
+        report = self.profiler.end_trial()
+        self.assertEqual(5, report.n_frames)
+        self.assertEqual(1, report.n_late)
+        self.assertEqual(2, report.n_dropped)
+
+        frame_index, start_time, duration, times = report.late_frames[0]
+        self.assertEqual(1, frame_index)
+        self.assertAlmostEqual(0.01, start_time)
+        self.assertAlmostEqual(0.016, duration)
+        self.assertAlmostEqual(0.015, times["slow"])
+
+        summary = report.summary()
+        self.assertIn("Trial 7: 5 frames, 1 late, 2 dropped", summary)
+        self.assertIn("Late frame #1 (t=0.010): 16.00 ms, mostly slow (15.00 ms)", summary)
+
+
+    #------------------------------------------------------------
+    def test_reports(self):
+        for trial in range(3):
+            self.profiler.start_trial(trial)
+            with self.profiler.frame():
+                pass
+            self.profiler.end_trial()
+
+        self.assertEqual([0, 1, 2], [r.trial_num for r in self.profiler.reports])
+
+
+    #------------------------------------------------------------
+    def test_frame_ends_on_error(self):
+        comp = Component(self.clock, 0.001)
+        self.profiler.watch(comp, name="comp")
+        self.profiler.start_trial()
+
+        def failing_frame():
+            with self.profiler.frame():
+                comp.present()
+                raise ValueError()
+
+        self.assertRaises(ValueError, failing_frame)
+        report = self.profiler.end_trial()
+        self.assertEqual(1, report.n_frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
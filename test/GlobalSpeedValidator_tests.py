@@ -193,6 +193,48 @@ class GlobalSpeedValidatorTests(unittest.TestCase):
         self.assertEqual(50, v.get_expected_coord_at_time(4))
 
 
+    #--------------------------------------------------
+    def test_expected_coord_after_changing_config(self):
+        v = GlobalSpeedValidator(max_trial_duration=1, origin_coord=0, end_coord=100)
+        self.assertEqual(50, v.get_expected_coord_at_time(.5))
+
+        v.max_trial_duration = 2
+        self.assertEqual(25, v.get_expected_coord_at_time(.5))
+
+        v.origin_coord = 100
+        v.end_coord = 300
+        self.assertEqual(150, v.get_expected_coord_at_time(.5))
+
+        v.milestones = [(.5, .25), (.5, .75)]
+        self.assertEqual(150, v.get_expected_coord_at_time(1))
+        self.assertEqual(300, v.get_expected_coord_at_time(2))
+
+
+    #--------------------------------------------------
+    def test_expected_coord_uninitialized(self):
+        v = GlobalSpeedValidator(max_trial_duration=1, origin_coord=0)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: v.get_expected_coord_at_time(0))
+        self.assertRaises(trajtracker.InvalidStateError, lambda: v.get_expected_coords_at_times([0]))
+
+
+    #--------------------------------------------------
+    def test_expected_coords_at_times(self):
+        v = GlobalSpeedValidator(max_trial_duration=6, origin_coord=100, end_coord=0,
+                                 milestones=[(.2, .1), (.5, .3), (.3, .6)])
+
+        times = [-1, 0, .5, 1.2, 2, 3, 4.2, 5, 6, 7]
+        coords = v.get_expected_coords_at_times(times)
+        self.assertEqual(len(times), len(coords))
+        for t, c in zip(times, coords):
+            self.assertEqual(v.get_expected_coord_at_time(t), c)
+
+        self.assertEqual(100, coords[0])
+        self.assertEqual(100, coords[1])
+        self.assertTrue(np.abs(90 - coords[3]) < .00001)
+        self.assertTrue(np.abs(60 - coords[6]) < .00001)
+        self.assertEqual(0, coords[-1])
+
+
     #--------------------------------------------------
     def test_disabled(self):
         v = GlobalSpeedValidator(max_trial_duration=1, origin_coord=0, end_coord=100, enabled=False)
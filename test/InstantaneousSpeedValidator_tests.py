@@ -1,6 +1,7 @@
 import unittest
 
 
+from trajtracker.movement import MotionState, SpeedMonitor
 from trajtracker.validators import InstantaneousSpeedValidator, ValidationAxis, ValidationFailed
 
 
@@ -114,6 +115,62 @@ class InstantaneousSpeedValidatorTests(unittest.TestCase):
         self.assertIsNotNone(validator.check_xyt(2.99, 4, 1))
 
 
+    #------------------------------------------
+    def test_shared_monitor(self):
+        monitor = SpeedMonitor(1, 0)
+        x_validator = InstantaneousSpeedValidator(1, axis=ValidationAxis.x, min_speed=1, movement_monitor=monitor)
+        y_validator = InstantaneousSpeedValidator(1, axis=ValidationAxis.y, max_speed=3, movement_monitor=monitor)
+
+        for validator in x_validator, y_validator:
+            self.assertIsNone(validator.check_xyt(0, 0, 0))
+        for validator in x_validator, y_validator:
+            self.assertIsNone(validator.check_xyt(1, 2, 1))
+
+        e = x_validator.check_xyt(1.5, 5.5, 2)
+        self.assertEqual(.5, e.arg(InstantaneousSpeedValidator.arg_speed))
+        e = y_validator.check_xyt(1.5, 5.5, 2)
+        self.assertEqual(3.5, e.arg(InstantaneousSpeedValidator.arg_speed))
+
+        #-- The same, with preprocessed samples
+        motion = MotionState()
+        x_validator.reset()
+        y_validator.reset()
+        for x, y, t in (0, 0, 0), (1, 2, 1):
+            sample = motion.update_xyt(x, y, t)
+            self.assertIsNone(x_validator.check_sample(sample))
+            self.assertIsNone(y_validator.check_sample(sample))
+
+        sample = motion.update_xyt(1.5, 5.5, 2)
+        self.assertEqual(.5, x_validator.check_sample(sample).arg(InstantaneousSpeedValidator.arg_speed))
+        self.assertEqual(3.5, y_validator.check_sample(sample).arg(InstantaneousSpeedValidator.arg_speed))
+        self.assertEqual(1, monitor.last_calculation_interval)
+
+
+    #------------------------------------------
+    def test_shared_monitor_intervals(self):
+        monitor = SpeedMonitor(1, 0)
+        fast_validator = InstantaneousSpeedValidator(1, max_speed=3, calculation_interval=1, movement_monitor=monitor)
+        slow_validator = InstantaneousSpeedValidator(1, min_speed=1, calculation_interval=4, movement_monitor=monitor)
+        self.assertEqual((0, 1, 4), monitor.calculation_intervals)
+        self.assertEqual(4, slow_validator.calculation_interval)
+
+        for y, t in (0, 0), (1, 1), (2, 2), (3, 3):
+            self.assertIsNone(fast_validator.check_xyt(0, y, t))
+            self.assertIsNone(slow_validator.check_xyt(0, y, t))
+
+        #-- A burst: fast over 1 sec, but not over 4 sec
+        self.assertIsNotNone(fast_validator.check_xyt(0, 7, 4))
+        self.assertIsNone(slow_validator.check_xyt(0, 7, 4))
+
+        #-- A stall
+        for t in 5, 6, 7:
+            self.assertIsNone(fast_validator.check_xyt(0, 7, t))
+            self.assertIsNone(slow_validator.check_xyt(0, 7, t))
+        self.assertIsNone(fast_validator.check_xyt(0, 7, 8))
+        e = slow_validator.check_xyt(0, 7, 8)
+        self.assertEqual(InstantaneousSpeedValidator.err_too_slow, e.err_code)
+
+
 
 if __name__ == '__main__':
     unittest.main()
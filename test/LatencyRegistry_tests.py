@@ -0,0 +1,173 @@
+import StringIO
+import unittest
+
+import trajtracker
+from trajtracker.misc import LatencyRegistry, MethodLatency
+from trajtracker.movement import SpeedMonitor
+from trajtracker.validators import NCurvesValidator
+
+
+#-- A timer whose time is advanced by the test
+class VirtualTimer(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+#-- An object whose check_xyt() takes a given (virtual) duration
+class SlowObject(trajtracker._TTrkObject):
+
+    def __init__(self, timer):
+        super(SlowObject, self).__init__()
+        self.timer = timer
+
+    def check_xyt(self, x_coord, y_coord, time):
+        self.timer.now += x_coord
+        if y_coord < 0:
+            raise ValueError()
+        return y_coord
+
+
+class LatencyRegistryTests(unittest.TestCase):
+
+    #------------------------------------------------------------
+    def test_default_methods(self):
+        registry = LatencyRegistry()
+        stats = registry.instrument(NCurvesValidator())
+        self.assertEqual(['check_xyt', 'check_sample'], [s.method_name for s in stats])
+        self.assertEqual('NCurvesValidator#1', stats[0].object_name)
+
+        stats = registry.instrument(SpeedMonitor(1, 0), name="monitor")
+        self.assertEqual(['update_xyt', 'update_sample'], [s.method_name for s in stats])
+        self.assertEqual('monitor', stats[0].object_name)
+        self.assertEqual(4, len(registry.stats))
+
+
+    #------------------------------------------------------------
+    def test_invalid(self):
+        registry = LatencyRegistry()
+        self.assertRaises(TypeError, lambda: registry.instrument("validator"))
+        monitor = SpeedMonitor(1, 0)
+        self.assertRaises(ValueError, lambda: registry.instrument(monitor, ["no_such_method"]))
+        self.assertRaises(trajtracker.InvalidStateError, lambda: registry.uninstrument(monitor))
+        registry.instrument(monitor)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: registry.instrument(monitor))
+
+
+    #------------------------------------------------------------
+    def test_measure(self):
+        timer = VirtualTimer()
+        registry = LatencyRegistry(timer)
+        obj = SlowObject(timer)
+        stats = registry.instrument(obj)[0]
+
+        self.assertIsNone(stats.p50)
+        self.assertIsNone(stats.max_time)
+
+        for i in range(98):
+            self.assertEqual(5, obj.check_xyt(0.001, 5, 0))
+        obj.check_xyt(0.01, 0, 0)
+        self.assertRaises(ValueError, lambda: obj.check_xyt(0.1, -1, 0))
+
+        self.assertEqual(100, stats.n_calls)
+        self.assertAlmostEqual(0.208, stats.total_time)
+        self.assertAlmostEqual(0.00208, stats.mean_time)
+        self.assertAlmostEqual(0.1, stats.max_time)
+        self.assertTrue(0.001 <= stats.p50 <= 0.001 * 1.26)
+        self.assertTrue(0.01 <= stats.p99 <= 0.01 * 1.26)
+        self.assertAlmostEqual(0.1, stats.percentile(100))
+
+        registry.reset()
+        self.assertEqual(0, stats.n_calls)
+        obj.check_xyt(0.002, 0, 0)
+        self.assertEqual(1, stats.n_calls)
+        self.assertAlmostEqual(0.002, stats.p50)
+
+
+    #------------------------------------------------------------
+    def test_uninstrument(self):
+        timer = VirtualTimer()
+        registry = LatencyRegistry(timer)
+        obj = SlowObject(timer)
+        registry.instrument(obj)
+        self.assertIn('check_xyt', obj.__dict__)
+        obj.check_xyt(0, 0, 0)
+
+        registry.uninstrument(obj)
+        self.assertNotIn('check_xyt', obj.__dict__)
+        obj.check_xyt(0, 0, 0)
+        self.assertEqual(1, registry.stats[0].n_calls)
+
+
+    #------------------------------------------------------------
+    def test_uninstrument_restores_previous_attribute(self):
+        timer = VirtualTimer()
+        obj = SlowObject(timer)
+        override = lambda x, y, t: "override"
+        obj.check_xyt = override
+
+        registry = LatencyRegistry(timer)
+        registry.instrument(obj)
+        self.assertEqual("override", obj.check_xyt(0, 0, 0))
+        registry.uninstrument(obj)
+        self.assertIs(override, obj.check_xyt)
+
+
+    #------------------------------------------------------------
+    def test_two_registries(self):
+        timer = VirtualTimer()
+        obj = SlowObject(timer)
+        registry1 = LatencyRegistry(timer)
+        registry2 = LatencyRegistry(timer)
+        registry1.instrument(obj)
+        registry2.instrument(obj)
+        obj.check_xyt(0, 0, 0)
+        self.assertEqual(1, registry1.stats[0].n_calls)
+        self.assertEqual(1, registry2.stats[0].n_calls)
+
+        #-- The outer wrapper must be removed first
+        self.assertRaises(trajtracker.InvalidStateError, lambda: registry1.uninstrument(obj))
+        obj.check_xyt(0, 0, 0)
+        self.assertEqual(2, registry1.stats[0].n_calls)
+
+        registry2.uninstrument(obj)
+        obj.check_xyt(0, 0, 0)
+        self.assertEqual(3, registry1.stats[0].n_calls)
+        self.assertEqual(2, registry2.stats[0].n_calls)
+
+        registry1.uninstrument(obj)
+        self.assertNotIn('check_xyt', obj.__dict__)
+
+
+    #------------------------------------------------------------
+    def test_long_call(self):
+        stats = MethodLatency("obj", "method")
+        stats.add(5)
+        stats.add(1e-9)
+        self.assertEqual(5, stats.percentile(99))
+        self.assertAlmostEqual(10 ** -6.5, stats.percentile(10))   # the upper edge of the first bucket
+
+
+    #------------------------------------------------------------
+    def test_dump(self):
+        timer = VirtualTimer()
+        registry = LatencyRegistry(timer)
+        obj = SlowObject(timer)
+        registry.instrument(obj, name="slow")
+        obj.check_xyt(0.001, 0, 0)
+        registry.instrument(SpeedMonitor(1, 0))
+
+        out = StringIO.StringIO()
+        registry.dump(out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual("object,method,n_calls,total_time,mean_time,p50,p99,max_time", lines[0])
+        self.assertEqual("slow,check_xyt,1,1000.0,1000.0,1000.0,1000.0,1000.0", lines[1])
+        self.assertEqual("SpeedMonitor#2,update_xyt,0,0.0,,,,", lines[2])
+        self.assertEqual(4, len(lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
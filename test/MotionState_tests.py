@@ -0,0 +1,131 @@
+import unittest
+
+import numpy as np
+
+import trajtracker
+import trajtracker.utils as u
+from trajtracker.movement import DirectionMonitor, MotionState, SpeedMonitor
+from trajtracker.validators import InstantaneousSpeedValidator, MovementAngleValidator, ValidationAxis
+
+
+class MotionStateTests(unittest.TestCase):
+
+    #------------------------------------------------------------
+    def _random_trajectory(self, n=500, seed=0):
+        np.random.seed(seed)
+        x = np.cumsum(np.random.randint(-3, 4, n)).tolist()
+        y = np.cumsum(np.random.randint(-1, 5, n)).tolist()
+        t = np.cumsum(np.random.randint(1, 20, n) / 1000.0).tolist()
+        return x, y, t
+
+
+    #------------------------------------------------------------
+    def test_sample(self):
+        motion = MotionState(2)
+
+        s0 = motion.update_xyt(1, 2, 0.5)
+        self.assertEqual(0, s0.index)
+        self.assertEqual((1, 2, 0.5), (s0.x, s0.y, s0.time))
+        self.assertEqual((0.5, 1), (s0.x_mm, s0.y_mm))
+        self.assertIsNone(s0.dt)
+        self.assertEqual(0, s0.distance)
+        self.assertIsNone(s0.heading)
+
+        s1 = motion.update_xyt(7, 10, 1.5)
+        self.assertEqual(1, s1.index)
+        self.assertEqual(1, s1.dt)
+        self.assertEqual(5, s1.distance)
+        self.assertEqual(u.get_angle((1, 2), (7, 10)), s1.heading)
+        self.assertTrue(s1.follows(s0))
+        self.assertFalse(s0.follows(s1))
+        self.assertIs(s1, motion.last_sample)
+
+        motion.reset()
+        self.assertIsNone(motion.last_sample)
+        self.assertEqual(0, motion.update_xyt(1, 2, 0).index)
+
+
+    #------------------------------------------------------------
+    def test_invalid_sample(self):
+        motion = MotionState()
+        self.assertRaises(TypeError, lambda: motion.update_xyt("1", 2, 0))
+        self.assertRaises(TypeError, lambda: motion.update_xyt(1, None, 0))
+        motion.update_xyt(1, 2, 3)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: motion.update_xyt(1, 2, 2))
+        self.assertRaises(ValueError, lambda: setattr(motion, "units_per_mm", 0))
+
+
+    #------------------------------------------------------------
+    def test_speed_monitor(self):
+        x, y, t = self._random_trajectory()
+        for units_per_mm in 1.5, 3:
+            motion = MotionState(1.5)
+            m1 = SpeedMonitor(units_per_mm, 0.05)
+            m2 = SpeedMonitor(units_per_mm, 0.05)
+
+            for i in range(len(x)):
+                sample = motion.update_xyt(x[i], y[i], t[i])
+                m1.update_xyt(x[i], y[i], t[i])
+                if i % 50 != 7:   # skip some samples
+                    m2.update_sample(sample)
+                else:
+                    m2.update_xyt(x[i], y[i], t[i])
+
+                self.assertEqual(m1.xspeed, m2.xspeed)
+                self.assertEqual(m1.yspeed, m2.yspeed)
+                self.assertEqual(m1.xyspeed, m2.xyspeed)
+
+
+    #------------------------------------------------------------
+    def test_direction_monitor(self):
+        x, y, t = self._random_trajectory()
+        for min_distance in 0, 3:
+            motion = MotionState()
+            m1 = DirectionMonitor(1, min_distance=min_distance, min_angle_change_per_curve=10)
+            m2 = DirectionMonitor(1, min_distance=min_distance, min_angle_change_per_curve=10)
+
+            for i in range(len(x)):
+                sample = motion.update_xyt(x[i], y[i], t[i])
+                m1.update_xyt(x[i], y[i], t[i])
+                if i % 50 != 7:
+                    m2.update_sample(sample)
+
+                    self.assertEqual(m1.curr_angle, m2.curr_angle)
+                    self.assertEqual(m1.n_curves, m2.n_curves)
+
+                else:
+                    m2.update_xyt(x[i], y[i], t[i])
+
+
+    #------------------------------------------------------------
+    def test_validators(self):
+        x, y, t = self._random_trajectory()
+        motion = MotionState(2)
+
+        def create_validators():
+            return [InstantaneousSpeedValidator(2, axis=ValidationAxis.xy, min_speed=50, max_speed=200, calculation_interval=0.02),
+                    MovementAngleValidator(2, min_angle=-60, max_angle=60, calc_angle_interval=2),
+                    MovementAngleValidator(4, min_angle=-30, max_angle=30, calc_angle_interval=1)]
+
+        validators1 = create_validators()
+        validators2 = create_validators()
+        n_errors = 0
+
+        for i in range(len(x)):
+            sample = motion.update_xyt(x[i], y[i], t[i])
+            for v1, v2 in zip(validators1, validators2):
+                err1 = v1.check_xyt(x[i], y[i], t[i])
+                err2 = v2.check_sample(sample)
+                self.assertEqual(err1 is None, err2 is None)
+                if err1 is not None:
+                    self.assertEqual(err1.err_code, err2.err_code)
+                    arg_name = v1.arg_speed if isinstance(v1, InstantaneousSpeedValidator) else v1.arg_angle
+                    self.assertEqual(err1.arg(arg_name), err2.arg(arg_name))
+                    n_errors += 1
+
+        self.assertTrue(n_errors > 0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -48,7 +48,7 @@ class DirectionMonitorDbg(object):
     def reset(self):
         pass
 
-    def update_xyt(self, x_coord, y_coord, time):
+    def update_xyt(self, x_coord, y_coord, time, sample_num=None):
         pass
 
     @property
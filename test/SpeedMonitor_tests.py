@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 
 import trajtracker
-from trajtracker.movement import SpeedMonitor
+from trajtracker.movement import MotionState, SpeedMonitor
 
 
 class SpeedMonitorTests(unittest.TestCase):
@@ -138,6 +138,182 @@ class SpeedMonitorTests(unittest.TestCase):
         self.assertIsNotNone(m.xyspeed)
 
 
+    #---------------------------------------------------------
+    # Many points in the window (the ring buffer grows), compared with a straightforward calculation
+    #
+    def test_long_window(self):
+        m = SpeedMonitor(2, 0.3)
+        np.random.seed(1)
+        x = np.cumsum(np.random.randint(-5, 6, 2000))
+        y = np.cumsum(np.random.randint(-5, 6, 2000))
+        t = np.cumsum(np.random.randint(1, 4, 2000)) / 1000.0
+
+        for i in range(len(t)):
+            m.update_xyt(int(x[i]), int(y[i]), float(t[i]))
+
+            pre = np.flatnonzero(t[:i] <= t[i] - 0.3)
+            if len(pre) == 0:
+                self.assertIsNone(m.xyspeed)
+                continue
+
+            pre = pre[-1]
+            interval = t[i] - t[pre]
+            distance = np.sum(np.sqrt(np.diff(x[pre:i+1]) ** 2 + np.diff(y[pre:i+1]) ** 2)) / 2.0
+            self.assertAlmostEqual(interval, m.last_calculation_interval)
+            self.assertAlmostEqual((x[i] - x[pre]) / 2.0 / interval, m.xspeed)
+            self.assertAlmostEqual((y[i] - y[pre]) / 2.0 / interval, m.yspeed)
+            self.assertAlmostEqual(distance / interval, m.xyspeed)
+
+
+    #---------------------------------------------------------
+    def test_same_sample_added_once(self):
+        m = SpeedMonitor(1, 0)
+        m.update_xyt(0, 0, 1, 0)
+        m.update_xyt(0, 0, 1, 0)
+        m.update_xyt(3, 4, 2, 1)
+        m.update_xyt(3, 4, 2, 1)
+        self.assertEqual(1, m.last_calculation_interval)
+        self.assertEqual(5, m.xyspeed)
+        self.assertEqual(1, m.time_in_trial)
+
+        #-- Without a sequence number, a repeated reading is a new sample
+        m.update_xyt(3, 4, 2)
+        self.assertEqual(0, m.last_calculation_interval)
+
+        #-- The same MotionSample is added once
+        motion = MotionState()
+        m.reset()
+        for x, y, t in (0, 0, 1), (3, 4, 2), (3, 4, 2):
+            sample = motion.update_xyt(x, y, t)
+            m.update_sample(sample)
+            m.update_sample(sample)
+        self.assertEqual(0, m.last_calculation_interval)
+        self.assertEqual(1, m.time_in_trial)
+
+
+    #=====================================================================================
+    #           Several calculation intervals
+    #=====================================================================================
+
+    #---------------------------------------------------------
+    def test_multi_interval_matches_single(self):
+        np.random.seed(5)
+        intervals = (0.05, 0.2, 0, 0.01)
+        multi = SpeedMonitor(2, intervals)
+        singles = [SpeedMonitor(2, interval) for interval in intervals]
+        self.assertEqual(intervals, multi.calculation_intervals)
+        self.assertEqual(0.05, multi.calculation_interval)
+
+        x = np.cumsum(np.random.randint(-5, 6, 1000)).tolist()
+        y = np.cumsum(np.random.randint(-5, 6, 1000)).tolist()
+        t = np.cumsum(np.random.randint(1, 10, 1000) / 1000.0).tolist()
+
+        for i in range(len(t)):
+            multi.update_xyt(x[i], y[i], t[i])
+            for interval, single in zip(intervals, singles):
+                single.update_xyt(x[i], y[i], t[i])
+                self.assertEqual(single.xspeed, multi.get_xspeed(interval))
+                self.assertEqual(single.yspeed, multi.get_yspeed(interval))
+                self.assertEqual(single.xyspeed, multi.get_xyspeed(interval))
+                self.assertEqual(single.last_calculation_interval, multi.get_last_calculation_interval(interval))
+
+            self.assertEqual(singles[0].xyspeed, multi.xyspeed)
+
+        profile = multi.compute_profile(x, y, t, interval=0.2)
+        self.assertEqual(singles[1].xyspeed, profile[2][-1])
+
+
+    #---------------------------------------------------------
+    def test_set_calc_intervals(self):
+        m = SpeedMonitor(1, [1, 2])
+        m.calculation_interval = 3
+        self.assertEqual((3, 2), m.calculation_intervals)
+        m.calculation_intervals = [0.5]
+        self.assertEqual(0.5, m.calculation_interval)
+
+        self.assertRaises(TypeError, lambda: setattr(m, "calculation_intervals", []))
+        self.assertRaises(TypeError, lambda: setattr(m, "calculation_intervals", [1, "a"]))
+        self.assertRaises(ValueError, lambda: setattr(m, "calculation_intervals", [1, -1]))
+        self.assertRaises(ValueError, lambda: m.get_xspeed(2))
+
+
+    #=====================================================================================
+    #           compute_profile
+    #=====================================================================================
+
+    #---------------------------------------------------------
+    def test_profile_matches_online(self):
+        np.random.seed(2)
+
+        for calc_interval in 0.05, 0.2:
+            for i_traj in range(5):
+                n = np.random.randint(1, 300)
+                x = np.cumsum(np.random.randint(-5, 6, n)).tolist()
+                y = (np.cumsum(np.random.rand(n)) * 3).tolist()
+                t = (1 + np.cumsum(np.random.randint(1, 30, n)) / 1000.0).tolist()
+
+                m = SpeedMonitor(1.5, calc_interval)
+                xspeed, yspeed, xyspeed, interval = m.compute_profile(x, y, t)
+
+                m.reset()
+                for i in range(n):
+                    m.update_xyt(x[i], y[i], t[i])
+                    for online, profile in (m.xspeed, xspeed[i]), (m.yspeed, yspeed[i]), \
+                                           (m.xyspeed, xyspeed[i]), (m.last_calculation_interval, interval[i]):
+                        if online is None:
+                            self.assertTrue(np.isnan(profile))
+                        else:
+                            self.assertEqual(online, profile)
+
+
+    #---------------------------------------------------------
+    def test_profile_matches_online_with_duplicates(self):
+        np.random.seed(5)
+
+        #-- (not with calculation_interval=0: the speed between two samples with the same time is undefined)
+        for calc_interval in 0.01, 0.05:
+            n = 300
+            x = np.cumsum(np.random.randint(-5, 6, n)).tolist()
+            y = (np.cumsum(np.random.rand(n)) * 3).tolist()
+            t = (1 + np.cumsum(np.random.randint(1, 30, n)) / 1000.0).tolist()
+
+            #-- Repeat some of the samples exactly
+            repeat = np.random.rand(n) < 0.2
+            x, y, t = [[v for v, r in zip(values, repeat) for i in range(2 if r else 1)] for values in (x, y, t)]
+
+            m = SpeedMonitor(1, calc_interval)
+            xspeed, yspeed, xyspeed, interval = m.compute_profile(x, y, t)
+
+            m.reset()
+            for i in range(len(t)):
+                m.update_xyt(x[i], y[i], t[i])
+                for online, profile in (m.xspeed, xspeed[i]), (m.yspeed, yspeed[i]), \
+                                       (m.xyspeed, xyspeed[i]), (m.last_calculation_interval, interval[i]):
+                    if online is None or np.isnan(profile):
+                        self.assertTrue(online is None or np.isnan(online))
+                        self.assertTrue(np.isnan(profile))
+                    else:
+                        self.assertEqual(online, profile)
+
+
+    #---------------------------------------------------------
+    def test_profile_zero_interval(self):
+        m = SpeedMonitor(1, 0)
+        xspeed, yspeed, xyspeed, interval = m.compute_profile([0, 3, 3], [0, 4, 4], [1, 2, 2.5])
+        self.assertTrue(np.isnan(xspeed[0]))
+        self.assertEqual([3, 0], list(xspeed[1:]))
+        self.assertEqual([5, 0], list(xyspeed[1:]))
+        self.assertEqual([1, 0.5], list(interval[1:]))
+
+
+    #---------------------------------------------------------
+    def test_profile_invalid_args(self):
+        m = SpeedMonitor(1, 0.1)
+        self.assertRaises(ValueError, lambda: m.compute_profile([1, 2], [1, 2], [1]))
+        self.assertRaises(ValueError, lambda: m.compute_profile([1, 2], [1, 2], [2, 1]))
+        self.assertEqual(0, len(m.compute_profile([], [], [])[0]))
+
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,218 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import trajtracker
+from trajtracker.data import TrajectoryJournal
+from trajtracker.movement import TrajectoryTracker
+from ttrk_testing import DummyFileHandle
+
+
+class TrajectoryTrackerForTesting(TrajectoryTracker):
+
+    def _open_file(self, filename, mode):
+        if mode == 'w':
+            self._file_data = DummyFileHandle()
+        return self._file_data
+
+
+class TrajectoryJournalTests(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._filename = os.path.join(self._dir, "traj.journal")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+
+    #------------------------------------------------------------------
+    def test_write_and_recover(self):
+        journal = TrajectoryJournal(self._filename)
+        journal.write_samples([1, 2], [1.5, 2.5], [0.1, 0.2], x_is_int=True)
+        journal.write_samples([3], [3.5], [0.3], x_is_int=True)
+        self.assertEqual(3, journal.n_samples)
+
+        data = TrajectoryJournal.recover(self._filename)
+        self.assertEqual([1, 2, 3], list(data['x']))
+        self.assertEqual([1.5, 2.5, 3.5], list(data['y']))
+        self.assertEqual([0.1, 0.2, 0.3], list(data['time']))
+        self.assertEqual([True, True, True], list(data['x_is_int']))
+        self.assertEqual([False, False, False], list(data['y_is_int']))
+        self.assertEqual(1, data['trial_seq'])
+        journal.close()
+
+
+    #------------------------------------------------------------------
+    def test_clear(self):
+        journal = TrajectoryJournal(self._filename)
+        journal.write_samples([1, 2], [1, 2], [0.1, 0.2])
+        journal.clear()
+        journal.write_samples([5], [6], [0.7])
+
+        data = TrajectoryJournal.recover(self._filename)
+        self.assertEqual([5], list(data['x']))
+        self.assertEqual(2, data['trial_seq'])
+        journal.close()
+
+
+    #------------------------------------------------------------------
+    def test_grow(self):
+        journal = TrajectoryJournal(self._filename, capacity=4)
+        for i in range(10):
+            journal.write_samples([i], [i * 2], [i / 10.0])
+        journal.close()
+
+        data = TrajectoryJournal.recover(self._filename)
+        self.assertEqual(range(10), list(data['x']))
+        self.assertEqual(18, data['y'][-1])
+
+
+    #------------------------------------------------------------------
+    def test_write_after_close(self):
+        journal = TrajectoryJournal(self._filename)
+        journal.close()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: journal.write_samples([1], [1], [1]))
+
+
+    #------------------------------------------------------------------
+    def test_invalid_file(self):
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,time,x,y\n0,0.1,1,1\n0,0.1,1,1\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: TrajectoryJournal.recover(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_tracker_writes_in_chunks(self):
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_journal(self._filename, chunk_size=3, chunk_interval=10)
+        ttrk.reset(True)
+
+        ttrk.update_xyt(1, 1, 0.1)
+        ttrk.update_xyt(2, 2, 0.2)
+        self.assertEqual(0, len(TrajectoryJournal.recover(self._filename)['x']))
+
+        ttrk.update_xyt(3, 3, 0.3)
+        ttrk.update_xyt(4, 4, 0.4)
+        self.assertEqual([1, 2, 3], list(TrajectoryJournal.recover(self._filename)['x']))
+
+        ttrk.close_journal()
+        self.assertEqual([1, 2, 3, 4], list(TrajectoryJournal.recover(self._filename)['x']))
+
+
+    #------------------------------------------------------------------
+    def test_tracker_writes_by_time(self):
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_journal(self._filename, chunk_size=100, chunk_interval=0.25)
+        ttrk.reset(True)
+
+        ttrk.update_xyt(1, 1, 0.1)
+        ttrk.update_xyt(2, 2, 0.2)
+        self.assertEqual(0, len(TrajectoryJournal.recover(self._filename)['x']))
+        ttrk.update_xyt(3, 3, 0.4)
+        self.assertEqual([1, 2, 3], list(TrajectoryJournal.recover(self._filename)['x']))
+
+        ttrk.reset(True)
+        self.assertEqual(0, len(TrajectoryJournal.recover(self._filename)['x']))
+        ttrk.close_journal()
+
+
+    #------------------------------------------------------------------
+    def test_tracker_recover(self):
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_journal(self._filename, chunk_size=1)
+        ttrk.reset(True)
+        ttrk.update_xyt(1, 1.5, 0.1)
+        ttrk.update_xyt(2, 2.5, 0.2)
+
+        #-- simulate a crash: a new tracker reads the journal
+        ttrk2 = TrajectoryTrackerForTesting()
+        ttrk2.init_output_file("stam", xy_precision=1, time_precision=1)
+        self.assertEqual(2, ttrk2.recover_journal(self._filename))
+        ttrk2.save_to_file(5)
+        self.assertEqual("trial,time,x,y\n5,0.1,1,1.5\n5,0.2,2,2.5\n", ttrk2._file_data.data)
+
+        ttrk.close_journal()
+
+
+    #------------------------------------------------------------------
+    def test_tracker_recover_mixed_int_and_float(self):
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_journal(self._filename, chunk_size=2)
+        ttrk.reset(True)
+        points = [(1, 1.5, 0.1), (2.5, 2, 0.2), (3, 3, 0.3), (4.0, 4.25, 0.4), (5, 5.75, 0.5)]
+        for x, y, t in points:
+            ttrk.update_xyt(x, y, t)
+        ttrk.close_journal()
+
+        ttrk2 = TrajectoryTrackerForTesting()
+        self.assertEqual(5, ttrk2.recover_journal(self._filename))
+        recovered = ttrk2.get_xyt()
+        self.assertEqual(points, recovered)
+        self.assertEqual([type(x) for x, y, t in points], [type(x) for x, y, t in recovered])
+        self.assertEqual([type(y) for x, y, t in points], [type(y) for x, y, t in recovered])
+
+
+    #------------------------------------------------------------------
+    def test_tracking_after_recover(self):
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_journal(self._filename, chunk_size=1)
+        ttrk.reset(True)
+        ttrk.update_xyt(1, 1, 0.1)
+        ttrk.update_xyt(2, 2, 0.2)
+
+        #-- A tracker with an active journal and some tracked points recovers the journal
+        journal2 = os.path.join(self._dir, "traj2.journal")
+        ttrk2 = TrajectoryTrackerForTesting()
+        ttrk2.min_distance = 5
+        ttrk2.init_journal(journal2, chunk_size=1)
+        ttrk2.reset(True)
+        ttrk2.update_xyt(100, 100, 0.1)
+        ttrk2.update_xyt(200, 200, 0.2)
+        self.assertEqual(2, ttrk2.recover_journal(self._filename))
+        self.assertEqual([1, 2], list(TrajectoryJournal.recover(journal2)['x']))
+
+        #-- Filtering continues from the recovered points, not from the discarded ones
+        ttrk2.update_xyt(102, 102, 0.3)
+        self.assertEqual([(1, 1, 0.1), (2, 2, 0.2), (102, 102, 0.3)], ttrk2.get_xyt())
+        self.assertEqual([1, 2, 102], list(TrajectoryJournal.recover(journal2)['x']))
+
+        ttrk2.close_journal()
+        ttrk.close_journal()
+
+
+    #------------------------------------------------------------------
+    def test_existing_journal_is_not_overwritten(self):
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_journal(self._filename, chunk_size=1)
+        ttrk.reset(True)
+        ttrk.update_xyt(1, 1, 0.1)
+        ttrk.update_xyt(2, 2, 0.2)
+
+        #-- simulate a crash, and a restart that initializes the journal before recovering it
+        ttrk2 = TrajectoryTrackerForTesting()
+        self.assertRaises(trajtracker.InvalidStateError, lambda: ttrk2.init_journal(self._filename))
+        self.assertEqual(2, ttrk2.recover_journal(self._filename))
+        self.assertEqual([1, 2], list(TrajectoryJournal.recover(self._filename)['x']))
+
+        #-- The new journal starts with the recovered points
+        ttrk2.init_journal(self._filename, overwrite=True)
+        self.assertEqual([1, 2], list(TrajectoryJournal.recover(self._filename)['x']))
+        ttrk2.close_journal()
+        ttrk.close_journal()
+
+
+    #------------------------------------------------------------------
+    def test_empty_journal_can_be_reused(self):
+        TrajectoryJournal(self._filename).close()
+        TrajectoryJournal(self._filename).close()
+
+        with open(self._filename, 'w') as fh:
+            fh.write("some other file")
+        self.assertRaises(trajtracker.InvalidStateError, lambda: TrajectoryJournal(self._filename))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
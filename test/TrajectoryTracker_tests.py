@@ -95,6 +95,141 @@ class TrajectoryTrackerTestCase(unittest.TestCase):
 
         self.assertEqual("trial,time,x,y\n0,0.100,0.20,0.30\n", ttrk._file_data.data)
 
+    #------------------------------------------------------------------
+    def test_mixed_int_and_float_coords(self):
+
+        points = [(1, 1.5, 0.1), (2.0, 2, 0.2), (3, 3, 0.3), (4.25, 4.0, 0.4), (5L, 5, 0.5)]
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_output_file("stam", xy_precision=2, time_precision=3)
+        ttrk.tracking_active = True
+        for x, y, t in points:
+            ttrk.update_xyt(x, y, t)
+        ttrk.save_to_file(7)
+
+        #-- Each coordinate is formatted according to its own type (int and long as integers)
+        expected = "trial,time,x,y\n"
+        for x, y, t in points:
+            x = ('%d' % x) if isinstance(x, (int, long)) else '%.*f' % (2, x)
+            y = ('%d' % y) if isinstance(y, (int, long)) else '%.*f' % (2, y)
+            expected += "%d,%.*f,%s,%s\n" % (7, 3, t, x, y)
+
+        self.assertEqual(expected, ttrk._file_data.data)
+        self.assertTrue(expected.startswith("trial,time,x,y\n7,0.100,1,1.50\n7,0.200,2.00,2\n"))
+
+        xyt = ttrk.get_xyt()
+        self.assertEqual([int, float, int, float, int], [type(p[0]) for p in xyt])
+        self.assertEqual([float, int, int, float, int], [type(p[1]) for p in xyt])
+
+    #------------------------------------------------------------------
+    def test_long_coords(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.init_output_file("stam", xy_precision=2, time_precision=1)
+        ttrk.tracking_active = True
+        ttrk.update_xyt(5L, -7L, 0.1)
+        ttrk.update_xyt(2L ** 40, 3L, 0.2)
+        ttrk.save_to_file(1)
+
+        #-- long values are integers (versions before the column buffer formatted them as floats: "5.00")
+        self.assertEqual("trial,time,x,y\n1,0.1,5,-7\n1,0.2,1099511627776,3\n", ttrk._file_data.data)
+        self.assertEqual([(5, -7, 0.1), (2 ** 40, 3, 0.2)], ttrk.get_xyt())
+
+    #------------------------------------------------------------------
+    def test_get_arrays(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.tracking_active = True
+        ttrk.update_xyt(1, 1.5, 0.1)
+        ttrk.update_xyt(2, 2.5, 0.2)
+
+        x, y, t = ttrk.get_arrays()
+        self.assertEqual([1, 2], list(x))
+        self.assertEqual([1.5, 2.5], list(y))
+        self.assertEqual([0.1, 0.2], list(t))
+
+        ttrk.reset()
+        x, y, t = ttrk.get_arrays()
+        self.assertEqual(0, len(x))
+
+    #------------------------------------------------------------------
+    def test_many_points(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.tracking_active = True
+        for i in range(5000):
+            ttrk.update_xyt(i, i * 2, i / 1000.0)
+
+        xyt = ttrk.get_xyt()
+        self.assertEqual(5000, len(xyt))
+        self.assertEqual((4999, 9998, 4.999), xyt[-1])
+        self.assertIsInstance(xyt[-1][0], int)
+
+        x, y, t = ttrk.get_arrays()
+        self.assertEqual(5000, len(t))
+        self.assertEqual(2500, x[2500])
+
+    #------------------------------------------------------------------
+    def test_resample(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.resampling_interval = 0.1
+        ttrk.reset(True)
+        ttrk.update_xyt(0, 0, 1.0)
+        ttrk.update_xyt(1, 2, 1.04)
+        ttrk.update_xyt(4, 8, 1.16)
+        ttrk.update_xyt(4, 8, 1.16)
+        ttrk.update_xyt(10, 20, 1.41)
+
+        xyt = ttrk.get_xyt()
+        self.assertEqual(5, len(xyt))
+        expected = [(0, 0, 1.0), (2.5, 5, 1.1), (4.96, 9.92, 1.2), (7.36, 14.72, 1.3), (9.76, 19.52, 1.4)]
+        for exp, actual in zip(expected, xyt):
+            for e, a in zip(exp, actual):
+                self.assertAlmostEqual(e, a)
+
+        ttrk.reset()
+        ttrk.update_xyt(3, 3, 5.0)
+        self.assertEqual([(3, 3, 5.0)], ttrk.get_xyt())
+
+    #------------------------------------------------------------------
+    def test_min_distance(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.min_distance = 2
+        ttrk.reset(True)
+        ttrk.update_xyt(0, 0, 0.1)
+        ttrk.update_xyt(1, 1, 0.2)
+        ttrk.update_xyt(2, 0, 0.3)
+        ttrk.update_xyt(3, 1, 0.4)
+        ttrk.update_xyt(4, 0, 0.5)
+        self.assertEqual([(0, 0, 0.1), (2, 0, 0.3), (4, 0, 0.5)], ttrk.get_xyt())
+
+    #------------------------------------------------------------------
+    def test_drop_duplicates(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.drop_duplicates = True
+        ttrk.reset(True)
+        ttrk.update_xyt(0, 0, 0.1)
+        ttrk.update_xyt(0, 0, 0.2)
+        ttrk.update_xyt(1, 0, 0.3)
+        ttrk.update_xyt(1, 0, 0.4)
+        ttrk.update_xyt(0, 0, 0.5)
+        self.assertEqual([(0, 0, 0.1), (1, 0, 0.3), (0, 0, 0.5)], ttrk.get_xyt())
+
+    #------------------------------------------------------------------
+    def test_set_sampling_policies(self):
+
+        ttrk = TrajectoryTrackerForTesting()
+        ttrk.resampling_interval = None
+        ttrk.min_distance = 0
+        self.assertRaises(ValueError, lambda: setattr(ttrk, "resampling_interval", 0))
+        self.assertRaises(TypeError, lambda: setattr(ttrk, "resampling_interval", ""))
+        self.assertRaises(ValueError, lambda: setattr(ttrk, "min_distance", -1))
+        self.assertRaises(TypeError, lambda: setattr(ttrk, "min_distance", None))
+        self.assertRaises(TypeError, lambda: setattr(ttrk, "drop_duplicates", 1))
+
     #------------------------------------------------------------------
     def test_non_numeric_time(self):
         ttrk = TrajectoryTrackerForTesting()
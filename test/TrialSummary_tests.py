@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+
+from trajtracker.movement import SpeedMonitor, TrajectoryTracker, TrialSummary
+
+
+class TrialSummaryTests(unittest.TestCase):
+
+    #------------------------------------------------------------
+    def test_simple(self):
+        summary = TrialSummary(units_per_mm=2)
+        self.assertIsNone(summary.max_deviation)
+        self.assertIsNone(summary.onset_time)
+
+        for x, y, t in (0, 0, 0), (0, 0, 1), (6, 8, 2), (0, 16, 2.5), (0, 20, 3):
+            summary.update_xyt(x, y, t)
+
+        self.assertEqual(5, summary.n_samples)
+        self.assertEqual(12, summary.path_length)
+        self.assertEqual(2, summary.onset_time)
+        self.assertEqual(10, summary.peak_speed)
+        self.assertEqual(2.5, summary.peak_speed_time)
+        self.assertEqual(3, summary.max_deviation)
+        self.assertEqual(['n_samples', 'path_length', 'peak_speed', 'peak_speed_time', 'max_deviation', 'onset_time'],
+                         list(summary.get_summary().keys()))
+
+        summary.reset()
+        self.assertEqual(0, summary.n_samples)
+        self.assertEqual(0, summary.path_length)
+        self.assertIsNone(summary.peak_speed)
+
+
+    #------------------------------------------------------------
+    def test_shared_monitor_not_reset(self):
+        monitor = SpeedMonitor(1, 0)
+        monitor.update_xyt(0, 0, 0)
+        monitor.update_xyt(0, 10, 1)
+
+        summary = TrialSummary(speed_monitor=monitor)
+        summary.reset()
+        self.assertEqual(1, monitor.time_in_trial)
+        self.assertEqual(10, monitor.xyspeed)
+
+
+    #------------------------------------------------------------
+    def test_onset_distance(self):
+        summary = TrialSummary(onset_distance=2)
+        for x, y, t in (0, 0, 0), (1, 1, 1), (0, 2, 2), (0, 3, 3):
+            summary.update_xyt(x, y, t)
+        self.assertEqual(3, summary.onset_time)
+
+
+    #------------------------------------------------------------
+    def test_return_to_start(self):
+        summary = TrialSummary()
+        for x, y, t in (0, 0, 0), (3, 4, 1), (0, 0, 2):
+            summary.update_xyt(x, y, t)
+        self.assertEqual(5, summary.max_deviation)
+
+
+    #------------------------------------------------------------
+    def test_compare_with_full_calculation(self):
+        np.random.seed(0)
+        n = 1000
+        x = np.cumsum(np.random.randn(n))
+        y = np.cumsum(np.random.rand(n))
+        t = np.cumsum(np.random.randint(1, 20, n) / 1000.0)
+
+        summary = TrialSummary(units_per_mm=1.5, calculation_interval=0.05, onset_distance=3)
+        for i in range(n):
+            summary.update_xyt(float(x[i]), float(y[i]), float(t[i]))
+
+        x_mm = x / 1.5
+        y_mm = y / 1.5
+        self.assertAlmostEqual(np.sum(np.sqrt(np.diff(x_mm) ** 2 + np.diff(y_mm) ** 2)), summary.path_length)
+
+        dx, dy = x_mm[-1] - x_mm[0], y_mm[-1] - y_mm[0]
+        deviation = np.abs(dx * (y_mm - y_mm[0]) - dy * (x_mm - x_mm[0])) / np.sqrt(dx ** 2 + dy ** 2)
+        self.assertAlmostEqual(deviation.max(), summary.max_deviation)
+
+        onset = np.flatnonzero((x_mm - x_mm[0]) ** 2 + (y_mm - y_mm[0]) ** 2 > 9)[0]
+        self.assertEqual(t[onset], summary.onset_time)
+
+        speed = SpeedMonitor(1.5, 0.05).compute_profile(x, y, t)[2]
+        self.assertAlmostEqual(np.nanmax(speed), summary.peak_speed)
+        self.assertEqual(t[np.nanargmax(speed)], summary.peak_speed_time)
+
+
+    #------------------------------------------------------------
+    def test_tracker(self):
+        tracker = TrajectoryTracker()
+        tracker.trial_summary = TrialSummary()
+        tracker.drop_duplicates = True
+        tracker.reset(True)
+
+        for x, y, t in (0, 0, 0), (0, 0, 1), (0, 2, 2), (0, 2, 3):
+            tracker.update_xyt(x, y, t)
+
+        self.assertEqual(2, tracker.trial_summary.n_samples)
+        self.assertEqual(2, tracker.trial_summary.path_length)
+
+        tracker.reset()
+        self.assertEqual(0, tracker.trial_summary.n_samples)
+
+        self.assertRaises(TypeError, lambda: setattr(tracker, "trial_summary", "x"))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+import unittest
+
+from trajtracker.movement import MotionState, DirectionMonitor
+from trajtracker.validators import ValidatorChain, LocationsValidator, NCurvesValidator, ValidationFailed
+from trajtracker.validators import _BaseValidator
+
+z = (0, 0, 0)
+w = (255, 255, 255)
+
+testimage = [
+    [z, z, z, z, z],
+    [z, w, w, w, w],
+    [z, w, w, w, w],
+    [z, w, w, w, w],
+    [z, z, z, z, z],
+]
+
+
+#-- A validator that records the samples it checked
+class RecordingValidator(_BaseValidator):
+
+    def __init__(self, fail_at=None, enabled=True):
+        super(RecordingValidator, self).__init__(enabled=enabled)
+        self.fail_at = fail_at
+        self.samples = []
+        self.time0 = "none"
+
+    def reset(self, time0=None):
+        self.samples = []
+        self.time0 = time0
+
+    def check_xyt(self, x_coord, y_coord, time=None):
+        if not self._enabled:
+            return None
+        self.samples.append((x_coord, y_coord, time))
+        if time == self.fail_at:
+            return ValidationFailed("failed", "failed", self)
+        return None
+
+
+class ValidatorChainTests(unittest.TestCase):
+
+    #------------------------------------------------------------
+    def test_create(self):
+        chain = ValidatorChain()
+        self.assertEqual([], chain.validators)
+        ValidatorChain([RecordingValidator()], units_per_mm=2)
+
+    def test_set_bad_validators(self):
+        self.assertRaises(TypeError, lambda: ValidatorChain(None))
+        self.assertRaises(TypeError, lambda: ValidatorChain([RecordingValidator(), 3]))
+        chain = ValidatorChain()
+        self.assertRaises(TypeError, lambda: chain.add("validator"))
+
+    def test_add(self):
+        v1 = RecordingValidator()
+        v2 = RecordingValidator()
+        chain = ValidatorChain([v1])
+        chain.add(v2)
+        self.assertEqual([v1, v2], chain.validators)
+
+
+    #------------------------------------------------------------
+    def test_all_called_in_order(self):
+        order = []
+        v1 = RecordingValidator()
+        v2 = RecordingValidator()
+        v1.check_sample = lambda sample: order.append(1)
+        v2.check_sample = lambda sample: order.append(2)
+
+        chain = ValidatorChain([v2, v1])
+        self.assertIsNone(chain.check_xyt(0, 0, 0))
+        self.assertEqual([2, 1], order)
+
+
+    #------------------------------------------------------------
+    def test_first_failure_returned(self):
+        v1 = RecordingValidator(fail_at=1)
+        v2 = RecordingValidator(fail_at=1)
+        v3 = RecordingValidator()
+        chain = ValidatorChain([v1, v2, v3])
+        self.assertRaises(TypeError, lambda: setattr(chain, "stop_on_failure", None))
+
+        self.assertIsNone(chain.check_xyt(0, 0, 0))
+        err = chain.check_xyt(1, 1, 1)
+        self.assertIsNotNone(err)
+        self.assertIs(v1, err.validator)
+
+        #-- The later validators got the sample too
+        self.assertEqual([(0, 0, 0), (1, 1, 1)], v2.samples)
+        self.assertEqual([(0, 0, 0), (1, 1, 1)], v3.samples)
+
+
+    #------------------------------------------------------------
+    def test_stop_on_failure(self):
+        v1 = RecordingValidator(fail_at=1)
+        v2 = RecordingValidator()
+        chain = ValidatorChain([v1, v2], stop_on_failure=True)
+
+        self.assertIsNone(chain.check_xyt(0, 0, 0))
+        err = chain.check_xyt(1, 1, 1)
+        self.assertIsNotNone(err)
+        self.assertIs(v1, err.validator)
+        self.assertEqual([(0, 0, 0), (1, 1, 1)], v1.samples)
+        self.assertEqual([(0, 0, 0)], v2.samples)
+
+
+    #------------------------------------------------------------
+    def test_stateful_validator_after_failure(self):
+        #-- The first validator fails on the sample of the detour (time=2)
+        points = [(0, 0, 0), (0, 10, 1), (10, 20, 2), (0, 30, 3), (0, 40, 4)]
+
+        def n_curves(check_xyt, validator):
+            validator.reset()
+            for x, y, t in points:
+                check_xyt(x, y, t)
+            return validator._direction_monitor.n_curves
+
+        direct = NCurvesValidator(DirectionMonitor(1, min_distance=0), max_curves_per_trial=5)
+        expected = n_curves(direct.check_xyt, direct)
+
+        #-- By default, NCurvesValidator sees all samples, as when called directly
+        validator = NCurvesValidator(DirectionMonitor(1, min_distance=0), max_curves_per_trial=5)
+        chain = ValidatorChain([RecordingValidator(fail_at=2), validator])
+        self.assertEqual(expected, n_curves(chain.check_xyt, validator))
+        self.assertEqual([5, 5], [s[1] for s in chain.get_stats()])
+
+        #-- With stop_on_failure, it misses the detour
+        validator = NCurvesValidator(DirectionMonitor(1, min_distance=0), max_curves_per_trial=5)
+        chain = ValidatorChain([RecordingValidator(fail_at=2), validator], stop_on_failure=True)
+        self.assertNotEqual(expected, n_curves(chain.check_xyt, validator))
+        self.assertEqual([5, 4], [s[1] for s in chain.get_stats()])
+
+
+    #------------------------------------------------------------
+    def test_disabled_validator_called(self):
+        v1 = RecordingValidator(fail_at=0, enabled=False)
+        v2 = RecordingValidator()
+        chain = ValidatorChain([v1, v2])
+
+        self.assertIsNone(chain.check_xyt(0, 0, 0))
+        self.assertEqual([], v1.samples)
+        self.assertEqual([(0, 0, 0)], v2.samples)
+        self.assertEqual(1, chain.get_stats()[0][1])
+
+
+    #------------------------------------------------------------
+    def test_validate_sample_once(self):
+        chain = ValidatorChain([RecordingValidator()])
+        self.assertRaises(TypeError, lambda: chain.check_xyt("a", 0, 0))
+        self.assertRaises(TypeError, lambda: chain.check_xyt(0, 0, None))
+        chain.check_xyt(0, 0, 1)
+        self.assertRaises(Exception, lambda: chain.check_xyt(0, 0, 0))
+
+
+    #------------------------------------------------------------
+    def test_reset(self):
+        v = RecordingValidator()
+        chain = ValidatorChain([v])
+        chain.check_xyt(0, 0, 5)
+
+        chain.reset()
+        self.assertIsNone(v.time0)
+        self.assertEqual([], v.samples)
+
+        chain.reset(3)
+        self.assertEqual(3, v.time0)
+
+        #-- Time can start again after a reset
+        self.assertIsNone(chain.check_xyt(0, 0, 0))
+
+
+    #------------------------------------------------------------
+    def test_stats(self):
+        v1 = RecordingValidator(fail_at=2)
+        v2 = RecordingValidator()
+        chain = ValidatorChain([v1, v2])
+
+        for t in range(4):
+            chain.check_xyt(0, 0, t)
+
+        stats = chain.get_stats()
+        self.assertEqual([v1, v2], [s[0] for s in stats])
+        self.assertEqual([4, 4], [s[1] for s in stats])
+        self.assertTrue(all(s[2] >= 0 for s in stats))
+
+        chain.reset_stats()
+        self.assertEqual([0, 0], [s[1] for s in chain.get_stats()])
+
+
+    #------------------------------------------------------------
+    def test_same_result_as_validators(self):
+        loc = LocationsValidator(testimage)
+        loc.valid_colors = w
+
+        chain = ValidatorChain([LocationsValidator(testimage)])
+        chain.validators[0].valid_colors = w
+
+        for x, y in [(0, -2), (0, 2), (-2, 0), (2, 0), (10, 10)]:
+            self.assertEqual(loc.check_xyt(x, y) is None, chain.check_xyt(x, y, 0) is None)
+
+
+    #------------------------------------------------------------
+    def test_shared_motion_state(self):
+        monitor = DirectionMonitor(1, min_distance=0)
+        chain = ValidatorChain([NCurvesValidator(direction_monitor=monitor, max_curves_per_trial=0)])
+
+        motion = MotionState()
+        self.assertIsNone(chain.check_sample(motion.update_xyt(0, 0, 0)))
+        self.assertIsNone(chain.check_sample(motion.update_xyt(0, 10, 1)))
+        self.assertIsNone(chain.check_sample(motion.update_xyt(0, 20, 2)))
+        self.assertIsNone(chain.check_sample(motion.update_xyt(0, 30, 3)))
+        self.assertEqual(0, monitor.n_curves)
+        self.assertIsNotNone(monitor.curr_angle)
+
+
+if __name__ == '__main__':
+    unittest.main()
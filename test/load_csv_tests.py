@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import trajtracker
+import trajtracker.data._csv_loaders as _csv_loaders
+from trajtracker.data import CsvTrajectoryWriter, TrajectorySet, load_csv
+
+
+class LoadCsvTests(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._filename = os.path.join(self._dir, "traj.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+
+    #------------------------------------------------------------------
+    def test_load(self):
+        writer = CsvTrajectoryWriter(self._filename, xy_precision=2, time_precision=3)
+        writer.write_trial(1, [1, 2], [1.5, 2.5], [0.1, 0.2], x_is_int=True)
+        writer.write_trial(2, [], [], [])
+        writer.write_trial(3, [3, 4, 5], [-6, 7, 8], [0.3, 0.4, 0.5])
+        writer.close()
+
+        trajs = load_csv(self._filename)
+        self.assertEqual(2, trajs.n_trials)
+        self.assertEqual(5, trajs.n_samples)
+        self.assertEqual([1, 3], list(trajs.trial_nums))
+        self.assertEqual([0, 2, 5], list(trajs.offsets))
+        self.assertEqual([1, 2, 3, 4, 5], list(trajs.x))
+        self.assertEqual([1, 1, 3, 3, 3], list(trajs.sample_trial_nums()))
+        self.assertIsNone(trajs.session_ids)
+
+        x, y, t = trajs.get_trial(1)
+        self.assertEqual([3, 4, 5], list(x))
+        self.assertEqual([-6, 7, 8], list(y))
+        self.assertEqual([0.3, 0.4, 0.5], list(t))
+
+
+    #------------------------------------------------------------------
+    def test_load_in_chunks(self):
+        writer = CsvTrajectoryWriter(self._filename, xy_precision=2, time_precision=3)
+        for trial_num in range(1, 6):
+            writer.write_trial(trial_num, range(trial_num), [trial_num / 4.0] * trial_num, [0.1] * trial_num)
+        writer.close()
+
+        expected = load_csv(self._filename)
+
+        #-- Chunks that end in the middle of rows, of trials, or exactly at the end of a row
+        chunk_size = _csv_loaders._parse_chunk_size
+        try:
+            for _csv_loaders._parse_chunk_size in 1, 7, 16, 100:
+                trajs = load_csv(self._filename)
+                self.assertEqual(list(expected.trial_nums), list(trajs.trial_nums))
+                self.assertEqual(list(expected.offsets), list(trajs.offsets))
+                self.assertEqual(list(expected.x), list(trajs.x))
+                self.assertEqual(list(expected.y), list(trajs.y))
+                self.assertEqual(list(expected.time), list(trajs.time))
+        finally:
+            _csv_loaders._parse_chunk_size = chunk_size
+
+
+    #------------------------------------------------------------------
+    def test_rows_longer_than_estimated(self):
+        #-- The number of rows is estimated from the first chunk, where the rows are long here
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,time,x,y\n" + "1,0.123,123.45678,-987.65432\n" * 50 + "2,0,0,0\n" * 100 + "3,0,0,0\n")
+
+        chunk_size = _csv_loaders._parse_chunk_size
+        try:
+            _csv_loaders._parse_chunk_size = 8
+            trajs = load_csv(self._filename)
+        finally:
+            _csv_loaders._parse_chunk_size = chunk_size
+
+        self.assertEqual([1, 2, 3], list(trajs.trial_nums))
+        self.assertEqual([0, 50, 150, 151], list(trajs.offsets))
+        self.assertEqual(-987.65432, trajs.y[49])
+        self.assertEqual(0, trajs.y[50])
+
+
+    #------------------------------------------------------------------
+    def test_empty_file(self):
+        CsvTrajectoryWriter(self._filename).close()
+        trajs = load_csv(self._filename)
+        self.assertEqual(0, trajs.n_trials)
+        self.assertEqual(0, trajs.n_samples)
+
+
+    #------------------------------------------------------------------
+    def test_no_trailing_newline(self):
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,time,x,y\n1,0.1,1,2\n1,0.2,3,4")
+        self.assertEqual([2, 4], list(load_csv(self._filename).y))
+
+
+    #------------------------------------------------------------------
+    def test_invalid_header(self):
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,x,y\n1,1,2\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: load_csv(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_invalid_data(self):
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,time,x,y\n1,0.1,1,2\n1,0.2,a,4\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: load_csv(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_trajectory_set_validation(self):
+        self.assertRaises(ValueError, lambda: TrajectorySet([1, 2], [0, 2], [1, 2], [1, 2], [1, 2]))
+        self.assertRaises(ValueError, lambda: TrajectorySet([1], [0, 2], [1, 2], [1], [1, 2]))
+        self.assertRaises(ValueError, lambda: TrajectorySet([1], [0, 2], [1, 2], [1, 2], [1, 2], session_ids=[1, 2]))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
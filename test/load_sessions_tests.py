@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from trajtracker.data import CsvTrajectoryWriter, load_sessions
+
+
+class LoadSessionsTests(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+        #-- session name -> list of (trial_num, n_samples)
+        sessions = dict(s2=[(1, 3), (2, 2)], s1=[(1, 1)], s3=[(5, 4)])
+        for name, trials in sessions.items():
+            writer = CsvTrajectoryWriter(os.path.join(self._dir, name + ".csv"))
+            for trial_num, n in trials:
+                writer.write_trial(trial_num, range(n), range(n), [0.01 * i for i in range(n)])
+            writer.close()
+
+        with open(os.path.join(self._dir, "readme.txt"), 'w') as fh:
+            fh.write("not a trajectory file")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+
+    #------------------------------------------------------------------
+    def _check_all_sessions(self, trajs):
+        self.assertEqual(['s1', 's2', 's2', 's3'], list(trajs.session_ids))
+        self.assertEqual([1, 1, 2, 5], list(trajs.trial_nums))
+        self.assertEqual([0, 1, 4, 6, 10], list(trajs.offsets))
+        self.assertEqual([0, 0, 1, 2, 0, 1, 0, 1, 2, 3], list(trajs.x))
+        self.assertEqual(['s1'] + ['s2'] * 5 + ['s3'] * 4, list(trajs.sample_session_ids()))
+
+
+    #------------------------------------------------------------------
+    def test_directory(self):
+        self._check_all_sessions(load_sessions(self._dir, n_workers=1))
+
+    def test_parallel(self):
+        self._check_all_sessions(load_sessions(self._dir, n_workers=2))
+        self._check_all_sessions(load_sessions(self._dir, n_workers=3, chunk_size=2))
+
+    def test_glob(self):
+        trajs = load_sessions(os.path.join(self._dir, "s[23].csv"), n_workers=2)
+        self.assertEqual(['s2', 's2', 's3'], list(trajs.session_ids))
+        self.assertEqual([0, 3, 5, 9], list(trajs.offsets))
+
+    def test_no_files(self):
+        trajs = load_sessions(os.path.join(self._dir, "*.none"))
+        self.assertEqual(0, trajs.n_trials)
+        self.assertEqual(0, trajs.n_samples)
+
+    def test_invalid_args(self):
+        self.assertRaises(ValueError, lambda: load_sessions(self._dir, n_workers=0))
+        self.assertRaises(ValueError, lambda: load_sessions(self._dir, chunk_size=0))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import trajtracker
+from trajtracker.data import CsvTrajectoryWriter, load_trials
+from trajtracker.movement import TrajectoryTracker
+
+
+class LoadTrialsTests(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._filename = os.path.join(self._dir, "traj.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+
+    #------------------------------------------------------------------
+    def _create_file(self):
+        writer = CsvTrajectoryWriter(self._filename, xy_precision=2, time_precision=3, save_index=True)
+        writer.write_trial(1, [1, 2], [1.5, 2.5], [0.1, 0.2], x_is_int=True)
+        writer.write_trial(2, [], [], [])
+        writer.write_trial(3, [3, 4, 5], [-6, 7, 8], [0.3, 0.4, 0.5])
+        writer.close()
+
+
+    #------------------------------------------------------------------
+    def test_index_file(self):
+        self._create_file()
+        with open(self._filename + ".idx") as fh:
+            self.assertEqual("trial,offset,n_bytes,n_rows\n1,15,30,2\n2,45,0,0\n3,45,55,3\n", fh.read())
+
+
+    #------------------------------------------------------------------
+    def test_load_some_trials(self):
+        self._create_file()
+
+        trials = load_trials(self._filename, [3, 1])
+        self.assertEqual([3, 1], list(trials.keys()))
+
+        x, y, t = trials[3]
+        self.assertEqual([3, 4, 5], list(x))
+        self.assertEqual([-6, 7, 8], list(y))
+        self.assertEqual([0.3, 0.4, 0.5], list(t))
+
+        x, y, t = trials[1]
+        self.assertEqual([1, 2], list(x))
+        self.assertEqual([1.5, 2.5], list(y))
+
+
+    #------------------------------------------------------------------
+    def test_load_all_trials(self):
+        self._create_file()
+        trials = load_trials(self._filename)
+        self.assertEqual([1, 2, 3], list(trials.keys()))
+        self.assertEqual(0, len(trials[2][0]))
+
+
+    #------------------------------------------------------------------
+    def test_missing_trial(self):
+        self._create_file()
+        self.assertRaises(ValueError, lambda: load_trials(self._filename, [4]))
+
+
+    #------------------------------------------------------------------
+    def test_missing_index(self):
+        CsvTrajectoryWriter(self._filename).close()
+        self.assertRaises(ValueError, lambda: load_trials(self._filename))
+
+
+    #------------------------------------------------------------------
+    def test_csv_does_not_match_index(self):
+        self._create_file()
+        with open(self._filename, 'w') as fh:
+            fh.write("trial,time,x,y\n")
+        self.assertRaises(trajtracker.BadFormatError, lambda: load_trials(self._filename, [3]))
+
+
+    #------------------------------------------------------------------
+    def test_tracker(self):
+        ttrk = TrajectoryTracker()
+        ttrk.init_output_file(self._filename, save_index=True, async_save=True)
+        for trial_num in range(10):
+            ttrk.reset(True)
+            for i in range(trial_num):
+                ttrk.update_xyt(trial_num, i, i / 10.0)
+            ttrk.save_to_file(trial_num)
+        ttrk.close_output_file()
+
+        x, y, t = load_trials(self._filename, [7])[7]
+        self.assertEqual([7] * 7, list(x))
+        self.assertEqual(range(7), list(y))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+import trajtracker
+from trajtracker.movement import TrajectoryTracker, SpeedMonitor
+from trajtracker.validators import MovementAngleValidator
+
+
+#-- Collect the logged messages instead of writing them to the experiment's event file
+class LogRecorder(object):
+
+    def __init__(self, obj):
+        self.messages = []
+        obj._log_write = self.messages.append
+
+
+#-- An object whose formatting is counted
+class CountFormat(object):
+
+    def __init__(self):
+        self.n_formatted = 0
+
+    def __format__(self, format_spec):
+        self.n_formatted += 1
+        return "x"
+
+
+class LoggingTests(unittest.TestCase):
+
+    #------------------------------------------------------------
+    def test_gates(self):
+        obj = trajtracker._TTrkObject()
+        self.assertEqual(obj.log_none, obj.log_level)
+        self.assertFalse(obj._log_trace_on or obj._log_debug_on or obj._log_info_on or obj._log_warn_on or obj._log_error_on)
+
+        obj.log_level = obj.log_info
+        self.assertFalse(obj._log_trace_on)
+        self.assertFalse(obj._log_debug_on)
+        self.assertTrue(obj._log_info_on)
+        self.assertTrue(obj._log_warn_on)
+        self.assertTrue(obj._log_error_on)
+
+        obj.log_level = obj.log_trace
+        self.assertTrue(obj._log_trace_on)
+
+        self.assertRaises(TypeError, lambda: setattr(obj, "log_level", "trace"))
+
+
+    #------------------------------------------------------------
+    def test_deferred_formatting(self):
+        obj = trajtracker._TTrkObject()
+        log = LogRecorder(obj)
+        arg = CountFormat()
+
+        obj.log_level = obj.log_warn
+        obj._log(obj.log_info, "msg,{0}", arg)
+        self.assertEqual([], log.messages)
+        self.assertEqual(0, arg.n_formatted)
+
+        obj._log(obj.log_warn, "msg,{0}", arg)
+        self.assertEqual(["msg,x"], log.messages)
+        self.assertEqual(1, arg.n_formatted)
+
+
+    #------------------------------------------------------------
+    def test_lazy_setter_log(self):
+        monitor = SpeedMonitor(1, 0)
+        log = LogRecorder(monitor)
+        monitor.calculation_interval = 0.1
+        self.assertEqual([], log.messages)
+
+        monitor.log_level = monitor.log_trace
+        monitor.calculation_interval = 0.2
+        self.assertEqual(1, len(log.messages))
+        self.assertTrue(log.messages[0].startswith("set_obj_attr,SpeedMonitor.calculation_interval,"))
+
+
+    #------------------------------------------------------------
+    def test_tracker_not_logging_by_default(self):
+        tracker = TrajectoryTracker()
+        log = LogRecorder(tracker)
+        tracker.reset(True)
+        tracker.update_xyt(1, 2, 0.5)
+        self.assertEqual([], log.messages)
+
+
+    #------------------------------------------------------------
+    def test_tracker_log_levels(self):
+        tracker = TrajectoryTracker()
+        log = LogRecorder(tracker)
+
+        tracker.log_level = tracker.log_debug
+        tracker.reset(True)
+        tracker.update_xyt(1, 2, 0.5)
+        self.assertEqual(["Trajectory,Reset"], log.messages)
+
+        tracker.log_level = tracker.log_trace
+        tracker.update_xyt(1, 2, 0.75)
+        self.assertEqual("Trajectory,Track_xyt,1,2,0.75", log.messages[-1])
+
+
+    #------------------------------------------------------------
+    def test_validator_logs_error(self):
+        validator = MovementAngleValidator(1, min_angle=-90, max_angle=90, calc_angle_interval=1)
+        log = LogRecorder(validator)
+
+        validator.reset()
+        validator.check_xyt(0, 0, 0)
+        self.assertIsNotNone(validator.check_xyt(0, -10, 0.1))
+        self.assertEqual([], log.messages)
+
+        validator.log_level = validator.log_info
+        validator.reset()
+        validator.check_xyt(0, 0, 0)
+        self.assertIsNotNone(validator.check_xyt(0, -10, 0.1))
+        self.assertEqual(2, len(log.messages))
+        self.assertEqual("MovementAngleValidator,InvalidAngle,180.0", log.messages[0])
+        self.assertTrue(log.messages[1].startswith("ValidationFailed,MovementAngleValidator,{0},".format(validator.err_invalid_angle)))
+
+
+if __name__ == '__main__':
+    unittest.main()
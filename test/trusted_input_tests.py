@@ -0,0 +1,111 @@
+import unittest
+
+import trajtracker
+from trajtracker.misc import LocationColorMap
+from trajtracker.movement import SpeedMonitor, MotionState, StartPoint, TrialSummary
+from trajtracker.misc import shapes
+from trajtracker.validators import InstantaneousSpeedValidator, LocationsValidator, ValidationAxis
+
+w = (255, 255, 255)
+testimage = [[w, w], [w, w]]
+
+
+class TrustedInputTests(unittest.TestCase):
+
+    def tearDown(self):
+        trajtracker.set_trusted_input(False)
+
+
+    #------------------------------------------------------------
+    def test_default(self):
+        self.assertFalse(SpeedMonitor(1, 0).trusted_input)
+        self.assertRaises(TypeError, lambda: SpeedMonitor(1, 0).update_xyt("a", 0, 0))
+
+    #------------------------------------------------------------
+    def test_set_bad_value(self):
+        monitor = SpeedMonitor(1, 0)
+        self.assertRaises(TypeError, lambda: setattr(monitor, "trusted_input", 1))
+        self.assertRaises(TypeError, lambda: trajtracker.set_trusted_input(None))
+
+
+    #------------------------------------------------------------
+    def test_per_object(self):
+        trusted = MotionState()
+        trusted.trusted_input = True
+        self.assertIsNotNone(trusted.update_xyt(0, 0, 0.0))
+        self.assertRaises(TypeError, lambda: MotionState().update_xyt(0, 0, None))
+
+        #-- only the arguments are not validated; the object's state is still checked
+        trusted.update_xyt(0, 0, 1)
+        self.assertRaises(trajtracker.InvalidStateError, lambda: trusted.update_xyt(0, 0, 0))
+
+
+    #------------------------------------------------------------
+    def test_skip_validation(self):
+        sp = StartPoint(shapes.Rectangle(0, 0, 100, 50))
+        self.assertRaises(TypeError, lambda: sp.check_xy("0", 0))
+        sp.trusted_input = True
+        self.assertEqual(sp.State.init, sp.check_xy(0, 0))
+
+        lcm = LocationColorMap(testimage)
+        self.assertRaises(TypeError, lambda: lcm.get_color_at(0, 0, use_mapping=""))
+        lcm.trusted_input = True
+        self.assertIsNotNone(lcm.get_color_at(0, 0, use_mapping=""))
+
+
+    #------------------------------------------------------------
+    def test_setters_still_validated(self):
+        monitor = SpeedMonitor(1, 0)
+        monitor.trusted_input = True
+        self.assertRaises(TypeError, lambda: setattr(monitor, "calculation_interval", "a"))
+
+        trajtracker.set_trusted_input(True)
+        self.assertRaises(TypeError, lambda: setattr(monitor, "calculation_interval", "a"))
+
+
+    #------------------------------------------------------------
+    def test_package_wide(self):
+        trajtracker.set_trusted_input(True)
+        monitor = SpeedMonitor(1, 0)
+        self.assertTrue(monitor.trusted_input)
+
+        validator = InstantaneousSpeedValidator(1, axis=ValidationAxis.y)
+        self.assertTrue(validator.trusted_input)
+
+        #-- An explicit per-object setting overrides the package-wide setting
+        monitor.trusted_input = False
+        self.assertFalse(monitor.trusted_input)
+        trajtracker.set_trusted_input(True)
+        self.assertFalse(monitor.trusted_input)
+
+        #-- Back to the package-wide setting
+        monitor.trusted_input = None
+        self.assertTrue(monitor.trusted_input)
+        trajtracker.set_trusted_input(False)
+        self.assertFalse(monitor.trusted_input)
+
+
+    #------------------------------------------------------------
+    def test_internal_objects(self):
+        validator = InstantaneousSpeedValidator(1, axis=ValidationAxis.y)
+        validator.trusted_input = True
+        self.assertTrue(validator._speed_monitor.trusted_input)
+
+        shared = SpeedMonitor(1, 0)
+        validator = InstantaneousSpeedValidator(1, axis=ValidationAxis.y, movement_monitor=shared)
+        validator.trusted_input = True
+        self.assertFalse(shared.trusted_input)
+
+        summary = TrialSummary()
+        summary.trusted_input = True
+        self.assertTrue(summary._speed_monitor.trusted_input)
+
+        validator = LocationsValidator(testimage)
+        validator.trusted_input = True
+        self.assertTrue(validator._lcm.trusted_input)
+        validator.trusted_input = None
+        self.assertFalse(validator._lcm.trusted_input)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,12 +4,21 @@ class DummyFileHandle(object):
 
     def __init__(self):
         self._data = ""
+        self.n_flushes = 0
 
 
     def write(self, data):
         self._data += data
 
 
+    def flush(self):
+        self.n_flushes += 1
+
+
+    def tell(self):
+        return len(self._data)
+
+
     def close(self):
         pass
 